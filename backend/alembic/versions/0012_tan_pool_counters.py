@@ -0,0 +1,41 @@
+"""Add tan_pool_counters with per-device availability counts.
+
+Revision ID: 0012_tan_pool_counters
+Revises: 0011_last_login
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0012_tan_pool_counters'
+down_revision = '0011_last_login'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'tan_pool_counters',
+        sa.Column('family_id', sa.Integer(), nullable=False),
+        sa.Column('target_device', sa.String(length=50), nullable=False),
+        sa.Column('available', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('used', sa.Integer(), nullable=False, server_default='0'),
+        sa.ForeignKeyConstraint(['family_id'], ['families.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('family_id', 'target_device'),
+    )
+
+    # Backfill from the existing pool
+    op.execute("""
+        INSERT INTO tan_pool_counters (family_id, target_device, available, used)
+        SELECT family_id, target_device,
+               SUM(CASE WHEN used THEN 0 ELSE 1 END),
+               SUM(CASE WHEN used THEN 1 ELSE 0 END)
+        FROM tan_pool
+        WHERE family_id IS NOT NULL
+        GROUP BY family_id, target_device
+    """)
+
+
+def downgrade():
+    op.drop_table('tan_pool_counters')
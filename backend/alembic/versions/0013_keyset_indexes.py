@@ -0,0 +1,23 @@
+"""Add (created_at, id) indexes for keyset-paginated history.
+
+Revision ID: 0013_keyset_indexes
+Revises: 0012_tan_pool_counters
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+revision = '0013_keyset_indexes'
+down_revision = '0012_tan_pool_counters'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_submissions_family_created', 'submissions', ['family_id', 'created_at', 'id'])
+    op.create_index('ix_tan_ledger_child_created', 'tan_ledger', ['child_id', 'created_at', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_tan_ledger_child_created', 'tan_ledger')
+    op.drop_index('ix_submissions_family_created', 'submissions')
@@ -0,0 +1,69 @@
+"""Add recurrence bitmask and task_children for due-today queries.
+
+Revision ID: 0014_task_schedule
+Revises: 0013_keyset_indexes
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0014_task_schedule'
+down_revision = '0013_keyset_indexes'
+branch_labels = None
+depends_on = None
+
+WEEKDAY_KEYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+
+def _recurrence_mask(recurrence):
+    # Frozen copy of app.services.tasks.recurrence_mask
+    if not recurrence:
+        return 127
+    if isinstance(recurrence, dict):
+        days = [key for key, value in recurrence.items() if value]
+    elif isinstance(recurrence, list):
+        days = recurrence
+    else:
+        return 127
+    return sum(1 << i for i, key in enumerate(WEEKDAY_KEYS) if key in days)
+
+
+def upgrade():
+    op.add_column('tasks', sa.Column('recurrence_mask', sa.Integer(), nullable=False, server_default='127'))
+    task_children = op.create_table(
+        'task_children',
+        sa.Column('task_id', sa.Integer(), sa.ForeignKey('tasks.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('child_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+    )
+    op.create_index('ix_task_children_child_id', 'task_children', ['child_id'])
+
+    # Backfill from the JSON columns
+    tasks = sa.table(
+        'tasks',
+        sa.column('id', sa.Integer),
+        sa.column('recurrence', sa.JSON),
+        sa.column('assigned_children', sa.JSON),
+        sa.column('recurrence_mask', sa.Integer),
+    )
+    users = sa.table('users', sa.column('id', sa.Integer))
+    conn = op.get_bind()
+    user_ids = set(conn.execute(sa.select(users.c.id)).scalars())
+    links = []
+    for task_id, recurrence, assigned in conn.execute(
+        sa.select(tasks.c.id, tasks.c.recurrence, tasks.c.assigned_children)
+    ):
+        mask = _recurrence_mask(recurrence)
+        if mask != 127:
+            conn.execute(tasks.update().where(tasks.c.id == task_id).values(recurrence_mask=mask))
+        for child_id in set(assigned or []):
+            if child_id in user_ids:
+                links.append({'task_id': task_id, 'child_id': child_id})
+    if links:
+        op.bulk_insert(task_children, links)
+
+
+def downgrade():
+    op.drop_index('ix_task_children_child_id', 'task_children')
+    op.drop_table('task_children')
+    op.drop_column('tasks', 'recurrence_mask')
@@ -0,0 +1,34 @@
+"""Add per-family change versions for ETag and delta sync.
+
+Revision ID: 0015_change_versions
+Revises: 0014_task_schedule
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0015_change_versions'
+down_revision = '0014_task_schedule'
+branch_labels = None
+depends_on = None
+
+VERSIONED = [
+    ('tasks', 'ix_tasks_family_version'),
+    ('submissions', 'ix_submissions_family_version'),
+    ('tan_ledger', 'ix_tan_ledger_family_version'),
+]
+
+
+def upgrade():
+    op.add_column('families', sa.Column('change_version', sa.Integer(), nullable=False, server_default='0'))
+    for table, index in VERSIONED:
+        op.add_column(table, sa.Column('change_version', sa.Integer(), nullable=False, server_default='0'))
+        op.create_index(index, table, ['family_id', 'change_version'])
+
+
+def downgrade():
+    for table, index in reversed(VERSIONED):
+        op.drop_index(index, table)
+        op.drop_column(table, 'change_version')
+    op.drop_column('families', 'change_version')
@@ -0,0 +1,29 @@
+"""Add rate_limit_buckets for the shared auth rate limiter.
+
+Revision ID: 0016_rate_limit_buckets
+Revises: 0015_change_versions
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0016_rate_limit_buckets'
+down_revision = '0015_change_versions'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'rate_limit_buckets',
+        sa.Column('key', sa.String(length=255), primary_key=True),
+        sa.Column('tokens', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.Float(), nullable=False),
+    )
+    op.create_index('ix_rate_limit_buckets_updated_at', 'rate_limit_buckets', ['updated_at'])
+
+
+def downgrade():
+    op.drop_index('ix_rate_limit_buckets_updated_at', 'rate_limit_buckets')
+    op.drop_table('rate_limit_buckets')
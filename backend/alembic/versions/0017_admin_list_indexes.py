@@ -0,0 +1,55 @@
+"""Add users.search_text and keyset index for the admin user list.
+
+Revision ID: 0017_admin_list_indexes
+Revises: 0016_rate_limit_buckets
+Create Date: 2026-10-19
+"""
+
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0017_admin_list_indexes'
+down_revision = '0016_rate_limit_buckets'
+branch_labels = None
+depends_on = None
+
+_TRANSLITERATE = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+
+
+def _normalize_search(*parts):
+    # Frozen copy of app.core.search.normalize_search
+    text = " ".join(part for part in parts if part).casefold().translate(_TRANSLITERATE)
+    text = unicodedata.normalize("NFKD", text)
+    return " ".join("".join(ch for ch in text if not unicodedata.combining(ch)).split())
+
+
+def upgrade():
+    op.add_column('users', sa.Column('search_text', sa.String(length=400), nullable=True))
+    op.create_index('ix_users_created', 'users', ['created_at', 'id'])
+
+    users = sa.table(
+        'users',
+        sa.column('id', sa.Integer),
+        sa.column('name', sa.String),
+        sa.column('email', sa.String),
+        sa.column('search_text', sa.String),
+    )
+    conn = op.get_bind()
+    for user_id, name, email in conn.execute(sa.select(users.c.id, users.c.name, users.c.email)).all():
+        conn.execute(
+            users.update().where(users.c.id == user_id).values(search_text=_normalize_search(name, email))
+        )
+
+    if conn.dialect.name == 'postgresql':
+        # Trigram index so "%term%" searches don't scan the table
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.execute('CREATE INDEX ix_users_search_text_trgm ON users USING gin (search_text gin_trgm_ops)')
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_users_search_text_trgm')
+    op.drop_index('ix_users_created', 'users')
+    op.drop_column('users', 'search_text')
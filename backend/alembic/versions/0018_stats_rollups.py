@@ -0,0 +1,50 @@
+"""Add family_daily_stats rollups and the admin stats_snapshot.
+
+Revision ID: 0018_stats_rollups
+Revises: 0017_admin_list_indexes
+Create Date: 2026-10-19
+
+Both tables start empty: the stats-refresh job fills the snapshot and the
+last two days; run scripts/rebuild_stats.py --days N for older history.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0018_stats_rollups'
+down_revision = '0017_admin_list_indexes'
+branch_labels = None
+depends_on = None
+
+SNAPSHOT_COUNTERS = [
+    'users_total', 'users_parents', 'users_children', 'users_pending_verification',
+    'families_total', 'tasks_total', 'tasks_active', 'submissions_total',
+    'submissions_pending', 'submissions_approved', 'tan_pool_available',
+    'tan_pool_used', 'minutes_earned_total',
+]
+DAILY_COUNTERS = [
+    'submissions_created', 'submissions_approved', 'submissions_rejected',
+    'minutes_earned', 'tans_used', 'active_children',
+]
+
+
+def upgrade():
+    op.create_table(
+        'family_daily_stats',
+        sa.Column('day', sa.Date(), primary_key=True),
+        sa.Column('family_id', sa.Integer(), primary_key=True),
+        *(sa.Column(name, sa.Integer(), nullable=False, server_default='0') for name in DAILY_COUNTERS),
+    )
+    op.create_index('ix_family_daily_stats_family_day', 'family_daily_stats', ['family_id', 'day'])
+    op.create_table(
+        'stats_snapshot',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        *(sa.Column(name, sa.Integer(), nullable=False, server_default='0') for name in SNAPSHOT_COUNTERS),
+        sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table('stats_snapshot')
+    op.drop_index('ix_family_daily_stats_family_day', 'family_daily_stats')
+    op.drop_table('family_daily_stats')
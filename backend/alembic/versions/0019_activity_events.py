@@ -0,0 +1,37 @@
+"""Add activity_events for the admin activity log.
+
+Revision ID: 0019_activity_events
+Revises: 0018_stats_rollups
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0019_activity_events'
+down_revision = '0018_stats_rollups'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'activity_events',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('ts', sa.DateTime(), nullable=False),
+        sa.Column('family_id', sa.Integer(), nullable=True),
+        sa.Column('actor_id', sa.Integer(), nullable=True),
+        sa.Column('type', sa.String(length=40), nullable=False),
+        sa.Column('subject_id', sa.Integer(), nullable=True),
+        sa.Column('payload', sa.JSON(), nullable=True),
+    )
+    op.create_index('ix_activity_events_ts', 'activity_events', ['ts', 'id'])
+    op.create_index('ix_activity_events_family_ts', 'activity_events', ['family_id', 'ts', 'id'])
+    op.create_index('ix_activity_events_type_ts', 'activity_events', ['type', 'ts', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_activity_events_type_ts', 'activity_events')
+    op.drop_index('ix_activity_events_family_ts', 'activity_events')
+    op.drop_index('ix_activity_events_ts', 'activity_events')
+    op.drop_table('activity_events')
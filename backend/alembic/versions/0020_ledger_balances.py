@@ -0,0 +1,49 @@
+"""Add ledger_balances with running totals per family/child/device/provider.
+
+Revision ID: 0020_ledger_balances
+Revises: 0019_activity_events
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0020_ledger_balances'
+down_revision = '0019_activity_events'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'ledger_balances',
+        sa.Column('family_id', sa.Integer(), primary_key=True),
+        sa.Column('child_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('target_device', sa.String(length=50), primary_key=True),
+        sa.Column('provider_type', sa.String(length=30), primary_key=True),
+        sa.Column('unpaid_minutes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('unpaid_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('lifetime_minutes', sa.Integer(), nullable=False, server_default='0'),
+    )
+    op.create_index('ix_ledger_balances_child', 'ledger_balances', ['child_id'])
+
+    # Backfill from the existing ledger
+    op.execute("""
+        INSERT INTO ledger_balances
+            (family_id, child_id, target_device, provider_type, unpaid_minutes, unpaid_count, lifetime_minutes)
+        SELECT
+            COALESCE(family_id, 0),
+            child_id,
+            COALESCE(target_device, ''),
+            COALESCE(provider_type, ''),
+            SUM(CASE WHEN paid_out THEN 0 ELSE minutes END),
+            SUM(CASE WHEN paid_out THEN 0 ELSE 1 END),
+            SUM(minutes)
+        FROM tan_ledger
+        GROUP BY COALESCE(family_id, 0), child_id, COALESCE(target_device, ''), COALESCE(provider_type, '')
+    """)
+
+
+def downgrade():
+    op.drop_index('ix_ledger_balances_child', 'ledger_balances')
+    op.drop_table('ledger_balances')
@@ -0,0 +1,33 @@
+"""Add idempotency_keys for replay-safe bulk ledger requests.
+
+Revision ID: 0021_idempotency_keys
+Revises: 0020_ledger_balances
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0021_idempotency_keys'
+down_revision = '0020_ledger_balances'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'idempotency_keys',
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('key', sa.String(length=100), primary_key=True),
+        sa.Column('endpoint', sa.String(length=100), nullable=False),
+        sa.Column('fingerprint', sa.String(length=64), nullable=False),
+        sa.Column('status_code', sa.Integer(), nullable=False),
+        sa.Column('response', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+    )
+    op.create_index('ix_idempotency_keys_created_at', 'idempotency_keys', ['created_at'])
+
+
+def downgrade():
+    op.drop_index('ix_idempotency_keys_created_at', 'idempotency_keys')
+    op.drop_table('idempotency_keys')
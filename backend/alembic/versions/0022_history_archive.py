@@ -0,0 +1,81 @@
+"""Add archive tables for settled ledger rows and closed submissions.
+
+Revision ID: 0022_history_archive
+Revises: 0021_idempotency_keys
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0022_history_archive'
+down_revision = '0021_idempotency_keys'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Same columns as tan_ledger / submissions, without foreign keys
+    op.create_table(
+        'tan_ledger_archive',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('child_id', sa.Integer(), nullable=False),
+        sa.Column('submission_id', sa.Integer(), nullable=True),
+        sa.Column('minutes', sa.Integer(), nullable=False),
+        sa.Column('target_device', sa.String(length=50), nullable=True),
+        sa.Column('tan_code', sa.String(length=12), nullable=True),
+        sa.Column('valid_until', sa.DateTime(), nullable=True),
+        sa.Column('reason', sa.String(length=255), nullable=True),
+        sa.Column('paid_out', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('family_id', sa.Integer(), nullable=True),
+        sa.Column('provider_type', sa.String(length=30), nullable=True),
+        sa.Column('change_version', sa.Integer(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(), nullable=False),
+    )
+    op.create_index('ix_tan_ledger_archive_child_created', 'tan_ledger_archive', ['child_id', 'created_at', 'id'])
+    op.create_index('ix_tan_ledger_archive_family_created', 'tan_ledger_archive', ['family_id', 'created_at', 'id'])
+
+    op.create_table(
+        'submissions_archive',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('child_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('selected_device', sa.String(length=50), nullable=True),
+        sa.Column('comment', sa.Text(), nullable=True),
+        sa.Column('photo_path', sa.String(length=255), nullable=True),
+        sa.Column('photo_expires_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('family_id', sa.Integer(), nullable=True),
+        sa.Column('change_version', sa.Integer(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(), nullable=False),
+    )
+    op.create_index('ix_submissions_archive_family_created', 'submissions_archive', ['family_id', 'created_at', 'id'])
+    op.create_index('ix_submissions_archive_child_created', 'submissions_archive', ['child_id', 'created_at', 'id'])
+
+    op.create_table(
+        'archive_rollups',
+        sa.Column('family_id', sa.Integer(), primary_key=True),
+        sa.Column('child_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('month', sa.Date(), primary_key=True),
+        sa.Column('target_device', sa.String(length=50), primary_key=True),
+        sa.Column('submissions', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('submissions_approved', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('ledger_entries', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('ledger_minutes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+    )
+    op.create_index('ix_archive_rollups_child', 'archive_rollups', ['child_id'])
+
+
+def downgrade():
+    op.drop_index('ix_archive_rollups_child', 'archive_rollups')
+    op.drop_table('archive_rollups')
+    op.drop_index('ix_submissions_archive_child_created', 'submissions_archive')
+    op.drop_index('ix_submissions_archive_family_created', 'submissions_archive')
+    op.drop_table('submissions_archive')
+    op.drop_index('ix_tan_ledger_archive_family_created', 'tan_ledger_archive')
+    op.drop_index('ix_tan_ledger_archive_child_created', 'tan_ledger_archive')
+    op.drop_table('tan_ledger_archive')
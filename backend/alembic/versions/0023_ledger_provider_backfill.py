@@ -0,0 +1,60 @@
+"""Backfill tan_ledger.provider_type and rebuild ledger_balances.
+
+Ledger rows written by submission approvals and payouts had no provider,
+so the providers' pending payouts missed them. Rows without provider get
+the provider configured for their family and device (default manual),
+then the balances are rebuilt from hot and archived rows.
+
+Revision ID: 0023_ledger_provider_backfill
+Revises: 0022_history_archive
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+revision = '0023_ledger_provider_backfill'
+down_revision = '0022_history_archive'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    for table in ('tan_ledger', 'tan_ledger_archive'):
+        op.execute(f"""
+            UPDATE {table}
+            SET provider_type = COALESCE(
+                (
+                    SELECT device_providers.provider_type
+                    FROM device_providers
+                    WHERE device_providers.family_id = {table}.family_id
+                      AND device_providers.device_type = {table}.target_device
+                ),
+                'manual'
+            )
+            WHERE provider_type IS NULL
+        """)
+
+    op.execute("DELETE FROM ledger_balances")
+    op.execute("""
+        INSERT INTO ledger_balances
+            (family_id, child_id, target_device, provider_type, unpaid_minutes, unpaid_count, lifetime_minutes)
+        SELECT
+            COALESCE(family_id, 0),
+            child_id,
+            COALESCE(target_device, ''),
+            COALESCE(provider_type, ''),
+            SUM(CASE WHEN paid_out THEN 0 ELSE minutes END),
+            SUM(CASE WHEN paid_out THEN 0 ELSE 1 END),
+            SUM(minutes)
+        FROM (
+            SELECT family_id, child_id, target_device, provider_type, paid_out, minutes FROM tan_ledger
+            UNION ALL
+            SELECT family_id, child_id, target_device, provider_type, paid_out, minutes FROM tan_ledger_archive
+        ) AS ledger
+        GROUP BY COALESCE(family_id, 0), child_id, COALESCE(target_device, ''), COALESCE(provider_type, '')
+    """)
+
+
+def downgrade():
+    # The backfilled providers are correct data; nothing to undo
+    pass
@@ -0,0 +1,450 @@
+let token = localStorage.getItem('adminToken');
+const API = window.location.origin;
+let families = [];
+let users = [];
+let currentEditUser = null;
+
+if (token) showDashboard();
+
+async function login() {
+    const email = document.getElementById('email').value;
+    const password = document.getElementById('password').value;
+    const errorDiv = document.getElementById('loginError');
+    try {
+        const res = await fetch(`${API}/auth/login/email`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ email, password })
+        });
+        if (!res.ok) {
+            const err = await res.json();
+            throw new Error(err.detail || 'Login fehlgeschlagen');
+        }
+        const data = await res.json();
+        token = data.access_token;
+        localStorage.setItem('adminToken', token);
+        showDashboard();
+    } catch (e) {
+        errorDiv.textContent = e.message;
+        errorDiv.classList.remove('hidden');
+    }
+}
+
+function logout() {
+    localStorage.removeItem('adminToken');
+    location.reload();
+}
+
+function showDashboard() {
+    document.getElementById('loginSection').classList.add('hidden');
+    document.getElementById('dashboard').classList.remove('hidden');
+    loadAll();
+}
+
+async function api(endpoint, options = {}) {
+    const res = await fetch(`${API}${endpoint}`, {
+        ...options,
+        headers: { 'Authorization': `Bearer ${token}`, 'Content-Type': 'application/json', ...options.headers }
+    });
+    if (res.status === 401) { logout(); return null; }
+    const data = await res.json();
+    data._ok = res.ok;
+    data._status = res.status;
+    return data;
+}
+
+// Paginated lists: first page now, further pages via "Mehr laden" (X-Next-Cursor)
+const pages = {};
+
+async function fetchPage(endpoint, cursor) {
+    const sep = endpoint.includes('?') ? '&' : '?';
+    const url = `${API}${endpoint}${sep}limit=100${cursor ? `&cursor=${encodeURIComponent(cursor)}` : ''}`;
+    const res = await fetch(url, { headers: { 'Authorization': `Bearer ${token}` } });
+    if (res.status === 401) { logout(); return null; }
+    if (!res.ok) return null;
+    return { items: await res.json(), next: res.headers.get('X-Next-Cursor'), total: res.headers.get('X-Total-Count') };
+}
+
+async function loadPage(key, endpoint, render, more = false) {
+    const state = more ? pages[key] : { endpoint, render, items: [], next: null };
+    const page = await fetchPage(state.endpoint, state.next);
+    if (!page) return [];
+    state.items = state.items.concat(page.items);
+    state.next = page.next;
+    pages[key] = state;
+    render(state.items);
+    const btn = document.getElementById(`${key}More`);
+    if (btn) {
+        btn.classList.toggle('hidden', !state.next);
+        btn.textContent = `Mehr laden (${state.items.length} von ${page.total})`;
+    }
+    return state.items;
+}
+
+function loadMore(key) {
+    const state = pages[key];
+    if (state) loadPage(key, state.endpoint, state.render, true);
+}
+
+async function loadAll() {
+    await loadFamilies();
+    await Promise.all([loadStats(), loadUsers(), loadTasks(), loadSubmissions(), loadTanPool(), loadLogs()]);
+    populateFamilyFilters();
+}
+
+async function loadFamilies() {
+    // All pages: the family filters need every family
+    let all = [], cursor = null;
+    do {
+        const page = await fetchPage('/admin/families', cursor);
+        if (!page) break;
+        all = all.concat(page.items);
+        cursor = page.next;
+    } while (cursor);
+    families = all;
+    renderFamilies();
+}
+
+function populateFamilyFilters() {
+    const selects = ['userFamilyFilter', 'taskFamilyFilter', 'tanFamilyFilter', 'logsFamilyFilter', 'addToFamilySelect', 'newTanFamily'];
+    selects.forEach(id => {
+        const el = document.getElementById(id);
+        if (!el) return;
+        const firstOpt = el.options[0]?.outerHTML || '';
+        el.innerHTML = firstOpt + families.map(f => `<option value="${f.id}">${f.name}</option>`).join('');
+    });
+}
+
+async function loadStats() {
+    const stats = await api('/admin/stats');
+    if (!stats) return;
+    document.getElementById('statsGrid').innerHTML = `
+        <div class="stat-card"><div class="stat-value">${stats.users_total}</div><div class="stat-label">Benutzer</div></div>
+        <div class="stat-card"><div class="stat-value">${stats.users_parents}</div><div class="stat-label">Eltern</div></div>
+        <div class="stat-card"><div class="stat-value">${stats.users_children}</div><div class="stat-label">Kinder</div></div>
+        <div class="stat-card"><div class="stat-value">${stats.families_total}</div><div class="stat-label">Familien</div></div>
+        <div class="stat-card"><div class="stat-value">${stats.tasks_active}</div><div class="stat-label">Aktive Aufgaben</div></div>
+        <div class="stat-card"><div class="stat-value">${stats.submissions_pending}</div><div class="stat-label">Offene Einreichungen</div></div>
+        <div class="stat-card"><div class="stat-value">${stats.tan_pool_available}</div><div class="stat-label">Verf. TANs</div></div>
+        <div class="stat-card"><div class="stat-value">${stats.minutes_earned_total}</div><div class="stat-label">Minuten verdient</div></div>
+    `;
+}
+
+async function loadUsers() {
+    const search = document.getElementById('userSearch')?.value || '';
+    const role = document.getElementById('userRoleFilter')?.value || '';
+    const family = document.getElementById('userFamilyFilter')?.value || '';
+    let url = '/admin/users?';
+    if (search) url += `search=${encodeURIComponent(search)}&`;
+    if (role) url += `role=${role}&`;
+    if (family) url += `family_id=${family}&`;
+    await loadPage('users', url, renderUsers);
+}
+
+function renderUsers(items) {
+    users = items;
+    document.getElementById('usersTable').innerHTML = users.map(u => `
+        <tr>
+            <td>${u.id}</td>
+            <td>${u.name}</td>
+            <td>${u.email || '<span class="text-muted">-</span>'}</td>
+            <td><span class="badge ${u.role === 'parent' ? 'badge-info' : 'badge-success'}">${u.role}</span></td>
+            <td>${u.login_code ? `<code style="font-size:0.9em;">${u.login_code}</code>` : '<span class="text-muted">-</span>'}</td>
+            <td>${u.families.map(f => `<span class="family-chip">${f.name}</span>`).join('') || '<span class="text-muted">-</span>'}</td>
+            <td>
+                ${u.email_verified ? '<span class="badge badge-success">Verifiziert</span>' : u.email ? '<span class="badge badge-warning">Ausstehend</span>' : ''}
+                ${!u.is_active ? '<span class="badge badge-danger">Inaktiv</span>' : ''}
+            </td>
+            <td>
+                <button class="btn btn-primary btn-sm" onclick="editUser(${u.id})">Bearbeiten</button>
+                ${!u.email_verified && u.email ? `<button class="btn btn-success btn-sm" onclick="verifyUser(${u.id})">Verifizieren</button>` : ''}
+                <button class="btn btn-warning btn-sm" onclick="toggleUser(${u.id})">${u.is_active ? 'Deaktiv.' : 'Aktivieren'}</button>
+                <button class="btn btn-danger btn-sm" onclick="deleteUser(${u.id}, '${u.name}')">Loeschen</button>
+            </td>
+        </tr>
+    `).join('');
+}
+
+function renderFamilies() {
+    document.getElementById('familiesList').innerHTML = families.map(f => `
+        <div class="card">
+            <div class="card-header">
+                <div>
+                    <strong style="font-size:1.1em;">${f.name}</strong>
+                    <span class="text-muted text-small" style="margin-left:10px;">ID: ${f.id}</span>
+                    ${!f.is_active ? '<span class="badge badge-danger" style="margin-left:10px;">Inaktiv</span>' : ''}
+                </div>
+                <div class="flex gap-5">
+                    <span class="text-muted">Code: <strong>${f.invite_code || '-'}</strong></span>
+                    <button class="btn btn-secondary btn-sm" onclick="regenerateCode(${f.id})">Neuer Code</button>
+                </div>
+            </div>
+            <h3>Mitglieder (${f.member_count})</h3>
+            ${f.members.length ? f.members.map(m => `
+                <div class="list-item">
+                    <span>${m.name} <span class="badge ${m.role === 'parent' ? 'badge-info' : 'badge-success'}">${m.role}</span> <span class="text-muted text-small">(${m.role_in_family})</span></span>
+                    <button class="btn btn-danger btn-sm" onclick="removeMember(${f.id}, ${m.user_id})">Entfernen</button>
+                </div>
+            `).join('') : '<p class="text-muted" style="padding:10px;">Keine Mitglieder</p>'}
+        </div>
+    `).join('');
+}
+
+async function loadTasks() {
+    const family = document.getElementById('taskFamilyFilter')?.value || '';
+    const active = document.getElementById('taskActiveFilter')?.checked;
+    let url = '/admin/tasks?';
+    if (family) url += `family_id=${family}&`;
+    if (active) url += 'active_only=true&';
+    await loadPage('tasks', url, renderTasks);
+}
+
+function renderTasks(tasks) {
+    document.getElementById('tasksTable').innerHTML = tasks.map(t => `
+        <tr>
+            <td>${t.id}</td>
+            <td>${t.title}</td>
+            <td>${t.tan_reward} Min</td>
+            <td>${t.target_devices ? t.target_devices.join(', ') : '-'}</td>
+            <td>${t.family_name || '<span class="text-muted">-</span>'}</td>
+            <td><span class="badge ${t.is_active ? 'badge-success' : 'badge-secondary'}">${t.is_active ? 'Aktiv' : 'Inaktiv'}</span></td>
+            <td><button class="btn btn-warning btn-sm" onclick="toggleTask(${t.id})">${t.is_active ? 'Deaktiv.' : 'Aktivieren'}</button></td>
+        </tr>
+    `).join('');
+}
+
+async function loadSubmissions() {
+    const status = document.getElementById('submissionStatusFilter')?.value || '';
+    let url = '/admin/submissions?';
+    if (status) url += `status=${status}&`;
+    await loadPage('submissions', url, renderSubmissions);
+}
+
+function renderSubmissions(subs) {
+    document.getElementById('submissionsTable').innerHTML = subs.map(s => `
+        <tr>
+            <td>${s.id}</td>
+            <td>${s.task_title}</td>
+            <td>${s.child_name}</td>
+            <td><span class="badge ${s.status === 'approved' ? 'badge-success' : s.status === 'rejected' ? 'badge-danger' : 'badge-warning'}">${s.status}</span></td>
+            <td>${new Date(s.created_at).toLocaleString('de-DE')}</td>
+            <td>${s.note || '-'}</td>
+        </tr>
+    `).join('');
+}
+
+async function loadTanPool() {
+    const family = document.getElementById('tanFamilyFilter')?.value || '';
+    const available = document.getElementById('tanAvailableFilter')?.checked;
+    let url = '/admin/tan-pool?';
+    if (family) url += `family_id=${family}&`;
+    if (available) url += 'available_only=true&';
+    await loadPage('tanPool', url, renderTanPool);
+}
+
+function renderTanPool(tans) {
+    document.getElementById('tanPoolTable').innerHTML = tans.map(t => `
+        <tr>
+            <td><code>${t.tan_code}</code></td>
+            <td>${t.minutes}</td>
+            <td>${t.target_device}</td>
+            <td>${t.family_name || '-'}</td>
+            <td><span class="badge ${t.used ? 'badge-secondary' : 'badge-success'}">${t.used ? 'Verwendet' : 'Verfuegbar'}</span></td>
+            <td>${t.used_at ? new Date(t.used_at).toLocaleString('de-DE') : '-'}</td>
+            <td>${!t.used ? `<button class="btn btn-danger btn-sm" onclick="deleteTan(${t.id})">Loeschen</button>` : ''}</td>
+        </tr>
+    `).join('');
+}
+
+async function loadLogs() {
+    const type = document.getElementById('logsTypeFilter').value;
+    const familyId = document.getElementById('logsFamilyFilter').value;
+    const params = new URLSearchParams();
+    if (type) params.set('type', type);
+    if (familyId) params.set('family_id', familyId);
+    await loadPage('logs', `/admin/logs?${params}`, renderLogs);
+}
+
+function renderLogs(logs) {
+    document.getElementById('logsList').innerHTML = logs.map(log => {
+        const cls = log.type.includes('approved') ? 'badge-success' : log.type.includes('rejected') ? 'badge-danger' : log.type.includes('registration') ? 'badge-info' : 'badge-warning';
+        return `<div class="log-entry"><span class="log-time">${new Date(log.timestamp).toLocaleString('de-DE')}</span><span class="badge ${cls}">${log.type}</span> ${log.message}</div>`;
+    }).join('');
+}
+
+// Actions
+async function verifyUser(id) { await api(`/admin/users/${id}/verify`, { method: 'POST' }); loadUsers(); }
+async function toggleUser(id) { await api(`/admin/users/${id}/toggle-active`, { method: 'POST' }); loadUsers(); }
+async function deleteUser(id, name) {
+    if (!confirm(`ACHTUNG: User "${name}" wird DAUERHAFT geloescht inkl. aller Daten (Submissions, Ledger, Familien-Mitgliedschaften).\n\nDies kann NICHT rueckgaengig gemacht werden!\n\nWirklich loeschen?`)) return;
+    const r = await api(`/admin/users/${id}`, { method: 'DELETE' });
+    if (r && r._ok) {
+        alert(r.message || 'User wurde geloescht');
+        loadUsers();
+        loadFamilies();
+        loadStats();
+    } else {
+        alert(r?.detail || 'Fehler beim Loeschen');
+    }
+}
+async function toggleTask(id) { await api(`/admin/tasks/${id}/toggle-active`, { method: 'POST' }); loadTasks(); }
+async function regenerateCode(id) { const r = await api(`/admin/families/${id}/regenerate-code`, { method: 'POST' }); if (r) alert(r.message); loadFamilies(); }
+async function removeMember(fid, uid) { if (confirm('Wirklich entfernen?')) { await api(`/admin/families/${fid}/members/${uid}`, { method: 'DELETE' }); loadFamilies(); } }
+async function deleteTan(id) { if (confirm('TAN loeschen?')) { await api(`/admin/tan-pool/${id}`, { method: 'DELETE' }); loadTanPool(); } }
+
+async function editUser(id) {
+    currentEditUser = users.find(u => u.id === id);
+    if (!currentEditUser) return;
+    document.getElementById('editUserId').value = id;
+    document.getElementById('editUserName').value = currentEditUser.name;
+    document.getElementById('editUserEmail').value = currentEditUser.email || '';
+    document.getElementById('editUserRole').value = currentEditUser.role;
+    document.getElementById('editUserLoginCode').textContent = currentEditUser.login_code || '-';
+    document.getElementById('editUserPassword').value = '';
+    document.getElementById('userModalMessage').innerHTML = '';
+    renderUserFamilies();
+    showModal('userModal');
+}
+
+async function generateLoginCode() {
+    const userId = document.getElementById('editUserId').value;
+    const r = await api(`/admin/users/${userId}/generate-login-code`, { method: 'POST' });
+    if (r && r._ok) {
+        const code = r.message.replace('Login-Code: ', '');
+        document.getElementById('editUserLoginCode').textContent = code;
+        currentEditUser.login_code = code;
+        document.getElementById('userModalMessage').innerHTML = '<div class="success">Neuer Login-Code generiert!</div>';
+        loadUsers();
+    } else {
+        document.getElementById('userModalMessage').innerHTML = `<div class="error">${r?.detail || 'Fehler'}</div>`;
+    }
+}
+
+function renderUserFamilies() {
+    if (!currentEditUser) return;
+    const container = document.getElementById('userFamilies');
+    container.innerHTML = currentEditUser.families.length ? currentEditUser.families.map(f => `
+        <div class="list-item">
+            <span>${f.name} <span class="text-muted">(${f.role})</span></span>
+            <button class="btn btn-danger btn-sm" onclick="removeUserFromFamily(${f.id})">Entfernen</button>
+        </div>
+    `).join('') : '<p class="text-muted">Keine Familien zugeordnet</p>';
+}
+
+async function saveUser() {
+    const id = document.getElementById('editUserId').value;
+    const data = {
+        name: document.getElementById('editUserName').value,
+        email: document.getElementById('editUserEmail').value || null,
+        role: document.getElementById('editUserRole').value
+    };
+    await api(`/admin/users/${id}`, { method: 'PATCH', body: JSON.stringify(data) });
+
+    const newPw = document.getElementById('editUserPassword').value;
+    if (newPw) {
+        await api(`/admin/users/${id}/set-password`, { method: 'POST', body: JSON.stringify({ new_password: newPw }) });
+    }
+
+    closeModal('userModal');
+    loadUsers();
+}
+
+async function addUserToFamily() {
+    const familyId = document.getElementById('addToFamilySelect').value;
+    const userId = document.getElementById('editUserId').value;
+    if (!familyId) {
+        document.getElementById('userModalMessage').innerHTML = '<div class="error">Bitte Familie auswaehlen</div>';
+        return;
+    }
+    const r = await api(`/admin/families/${familyId}/members`, { method: 'POST', body: JSON.stringify({ user_id: parseInt(userId), role_in_family: currentEditUser.role === 'parent' ? 'parent' : 'child' }) });
+    if (r && r._ok) {
+        currentEditUser.families.push({ id: parseInt(familyId), name: families.find(f => f.id == familyId)?.name, role: currentEditUser.role === 'parent' ? 'parent' : 'child' });
+        renderUserFamilies();
+        document.getElementById('userModalMessage').innerHTML = '<div class="success">Hinzugefuegt!</div>';
+    } else {
+        document.getElementById('userModalMessage').innerHTML = `<div class="error">${r?.detail || r?.message || 'Fehler'}</div>`;
+    }
+}
+
+async function removeUserFromFamily(familyId) {
+    const userId = document.getElementById('editUserId').value;
+    await api(`/admin/families/${familyId}/members/${userId}`, { method: 'DELETE' });
+    currentEditUser.families = currentEditUser.families.filter(f => f.id !== familyId);
+    renderUserFamilies();
+}
+
+async function createFamily() {
+    const name = document.getElementById('newFamilyName').value.trim();
+    if (!name) {
+        document.getElementById('createFamilyMessage').innerHTML = '<div class="error">Bitte Namen eingeben</div>';
+        return;
+    }
+    const r = await api('/admin/families', { method: 'POST', body: JSON.stringify({ name }) });
+    if (r && r._ok) {
+        document.getElementById('createFamilyMessage').innerHTML = `<div class="success">Familie erstellt! Code: ${r.invite_code}</div>`;
+        document.getElementById('newFamilyName').value = '';
+        loadFamilies();
+        setTimeout(() => closeModal('createFamilyModal'), 2000);
+    } else {
+        document.getElementById('createFamilyMessage').innerHTML = `<div class="error">${r?.detail || 'Fehler'}</div>`;
+    }
+}
+
+async function addTan() {
+    const tanCode = document.getElementById('newTanCode').value.trim();
+    if (!tanCode) {
+        document.getElementById('addTanMessage').innerHTML = '<div class="error">Bitte TAN Code eingeben</div>';
+        return;
+    }
+    const data = {
+        tan_code: tanCode,
+        minutes: parseInt(document.getElementById('newTanMinutes').value),
+        target_device: document.getElementById('newTanDevice').value,
+        family_id: document.getElementById('newTanFamily').value ? parseInt(document.getElementById('newTanFamily').value) : null
+    };
+    const r = await api('/admin/tan-pool', { method: 'POST', body: JSON.stringify(data) });
+    if (r && r._ok) {
+        document.getElementById('addTanMessage').innerHTML = '<div class="success">TAN hinzugefuegt!</div>';
+        document.getElementById('newTanCode').value = '';
+        loadTanPool();
+        setTimeout(() => closeModal('addTanModal'), 1500);
+    } else {
+        document.getElementById('addTanMessage').innerHTML = `<div class="error">${r?.detail || r?.message || 'Fehler'}</div>`;
+    }
+}
+
+async function changeOwnPassword() {
+    const current = document.getElementById('currentPassword').value;
+    const newPw = document.getElementById('newPassword').value;
+    const confirm = document.getElementById('confirmPassword').value;
+    const msgDiv = document.getElementById('settingsMessage');
+
+    if (newPw !== confirm) { msgDiv.innerHTML = '<div class="error">Passwoerter stimmen nicht ueberein</div>'; return; }
+    if (newPw.length < 8) { msgDiv.innerHTML = '<div class="error">Passwort muss mind. 8 Zeichen haben</div>'; return; }
+
+    const r = await api('/admin/change-password', { method: 'POST', body: JSON.stringify({ current_password: current, new_password: newPw }) });
+    if (r && r._ok) {
+        msgDiv.innerHTML = '<div class="success">Passwort geaendert!</div>';
+        document.getElementById('currentPassword').value = '';
+        document.getElementById('newPassword').value = '';
+        document.getElementById('confirmPassword').value = '';
+    } else {
+        msgDiv.innerHTML = `<div class="error">${r?.detail || 'Fehler'}</div>`;
+    }
+}
+
+// UI Helpers
+function showTab(name) {
+    document.querySelectorAll('.tab').forEach(t => t.classList.remove('active'));
+    document.querySelectorAll('.tab-content').forEach(t => t.classList.remove('active'));
+    document.querySelector(`.tab[onclick="showTab('${name}')"]`)?.classList.add('active');
+    document.getElementById(`${name}Tab`)?.classList.add('active');
+}
+
+function showModal(id) { document.getElementById(id)?.classList.add('active'); }
+function closeModal(id) { document.getElementById(id)?.classList.remove('active'); }
+
+// Close modal on outside click
+document.querySelectorAll('.modal').forEach(m => {
+    m.addEventListener('click', e => { if (e.target === m) m.classList.remove('active'); });
+});
@@ -1,9 +1,10 @@
 """Achievement API routes."""
 from typing import List
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response, status
 from sqlalchemy.orm import Session
 
-from app.core.dependencies import get_db_session
+from app.core.delta import is_not_modified, version_headers
+from app.core.dependencies import get_db_session, get_user_family_ids
 from app.core.security import get_current_user, require_role
 from app.models.user import User
 from app.services.achievements import (
@@ -12,6 +13,7 @@ from app.services.achievements import (
     get_new_unlocked_achievements,
     seed_achievements,
 )
+from app.services.change_tracking import get_family_versions
 
 router = APIRouter()
 
@@ -49,11 +51,25 @@ def check_achievements(
 
 @router.get("/new")
 def get_new_achievements(
+    request: Request,
+    response: Response,
     user: User = Depends(get_current_user),
     db: Session = Depends(get_db_session),
 ):
-    """Get achievements that were just unlocked (for notifications)."""
-    return get_new_unlocked_achievements(db, user.id)
+    """Get achievements that were just unlocked (for notifications).
+
+    The result is a delta by itself (each achievement is returned once), so
+    there is no ``?since=``. Only an empty result gets an ETag: a 304 then
+    means "still nothing new" and never replays an old notification.
+    """
+    headers = version_headers(request, get_family_versions(db, get_user_family_ids(db, user.id)), user.id)
+    if is_not_modified(request, headers):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    result = get_new_unlocked_achievements(db, user.id)
+    if not result:
+        response.headers.update(headers)
+    return result
 
 
 @router.get("/child/{child_id}")
@@ -4,6 +4,7 @@ from datetime import datetime, timedelta, timezone
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from jose import JWTError
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.core.dependencies import get_db_session
 from app.core.security import (
@@ -12,11 +13,15 @@ from app.core.security import (
     decode_token,
     get_current_user,
     hash_password,
-    verify_password,
-    verify_pin,
+    hash_password_async,
+    hash_pin_async,
+    verify_password_async,
+    verify_pin_async,
 )
+from app.core.hashing import needs_rehash
 from app.models.user import User
 from app.models.family import Family, FamilyMember
+from app.services.activity import log_event
 from app.schemas.auth import (
     CodeLoginRequest,
     EmailLoginRequest,
@@ -43,6 +48,44 @@ def generate_token(length: int = 32) -> str:
     return secrets.token_urlsafe(length)
 
 
+# The password/PIN logins are async so they can await the hashing pool; their
+# DB work runs in the threadpool through these helpers to keep the loop free.
+
+
+def _email_login_user(db: Session, email: str) -> tuple[User | None, list[int]]:
+    """User with this email and the ids of their families."""
+    user = db.query(User).filter(User.email == email).first()
+    if not user:
+        return None, []
+    memberships = db.query(FamilyMember).filter(FamilyMember.user_id == user.id).all()
+    return user, [m.family_id for m in memberships]
+
+
+def _pin_login_candidates(
+    db: Session, family_code: str, user_id: int | None
+) -> tuple[Family | None, list[tuple[FamilyMember, User]]]:
+    """Active family with this invite code and its members (or only ``user_id``) with their users."""
+    family = db.query(Family).filter(
+        Family.invite_code == family_code,
+        Family.is_active == True,
+    ).first()
+    if not family:
+        return None, []
+    query = db.query(FamilyMember, User).join(User, User.id == FamilyMember.user_id).filter(
+        FamilyMember.family_id == family.id,
+    )
+    if user_id:
+        query = query.filter(FamilyMember.user_id == user_id)
+    return family, query.order_by(FamilyMember.id).all()
+
+
+def _record_login(db: Session, user: User, family_id: int | None, method: str) -> None:
+    """Store the login time (and an upgraded hash set on ``user``) and log the login."""
+    user.last_login = datetime.utcnow()
+    log_event(db, "login", family_id=family_id, actor_id=user.id, method=method)
+    db.commit()
+
+
 @router.post("/register", response_model=MessageResponse)
 @limiter.limit("3/minute")
 def register(request: Request, payload: RegisterRequest, db: Session = Depends(get_db_session)):
@@ -72,6 +115,8 @@ def register(request: Request, payload: RegisterRequest, db: Session = Depends(g
         is_active=True,
     )
     db.add(user)
+    db.flush()
+    log_event(db, "registration", actor_id=user.id, subject_id=user.id, name=user.name, role=user.role)
     db.commit()
     db.refresh(user)
 
@@ -117,14 +162,14 @@ def verify_email(payload: VerifyEmailRequest, db: Session = Depends(get_db_sessi
 
 
 @router.post("/login/email", response_model=TokenResponse)
-@limiter.limit("5/minute")
-def login_email(request: Request, payload: EmailLoginRequest, db: Session = Depends(get_db_session)):
+@limiter.limit("5/minute", body_keys=("email",), rate_per_value="10/minute")
+async def login_email(request: Request, payload: EmailLoginRequest, db: Session = Depends(get_db_session)):
     """Login with email and password (for parents)."""
-    user = db.query(User).filter(User.email == payload.email).first()
+    user, family_ids = await run_in_threadpool(_email_login_user, db, payload.email)
     if not user or not user.password_hash:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Ungültige Anmeldedaten")
 
-    if not verify_password(payload.password, user.password_hash):
+    if not await verify_password_async(payload.password, user.password_hash):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Ungültige Anmeldedaten")
 
     if not user.is_active:
@@ -136,77 +181,53 @@ def login_email(request: Request, payload: EmailLoginRequest, db: Session = Depe
             detail="Bitte bestätige zuerst deine Email-Adresse",
         )
 
-    # Update last login timestamp
-    user.last_login = datetime.utcnow()
-    db.commit()
-
-    # Get user's families for token
-    memberships = db.query(FamilyMember).filter(FamilyMember.user_id == user.id).all()
-    family_ids = [m.family_id for m in memberships]
+    # Upgrade hashes written under an older cost policy
+    if needs_rehash(user.password_hash):
+        user.password_hash = await hash_password_async(payload.password)
 
     token_data = {"sub": user.id, "role": user.role}
     if family_ids:
         token_data["families"] = family_ids
 
+    # Update last login timestamp
+    await run_in_threadpool(_record_login, db, user, family_ids[0] if family_ids else None, "email")
+
     access_token = create_access_token(token_data)
     refresh_token = create_refresh_token(token_data)
     return TokenResponse(access_token=access_token, refresh_token=refresh_token)
 
 
 @router.post("/login/pin", response_model=TokenResponse)
-@limiter.limit("5/minute")
-def login_pin(request: Request, payload: PinLoginRequest, db: Session = Depends(get_db_session)):
+@limiter.limit("5/minute", body_keys=("family_code",), rate_per_value="30/minute")
+async def login_pin(request: Request, payload: PinLoginRequest, db: Session = Depends(get_db_session)):
     """Login with PIN within a family context (for children).
 
     If user_id is provided, verifies that specific user.
     If user_id is not provided, looks up child by PIN within the family.
     """
-    # Find family by invite code
-    family = db.query(Family).filter(
-        Family.invite_code == payload.family_code,
-        Family.is_active == True,
-    ).first()
+    # Find family by invite code; with user_id only that member is a candidate,
+    # otherwise the child is looked up by PIN within the family
+    family, candidates = await run_in_threadpool(_pin_login_candidates, db, payload.family_code, payload.user_id)
     if not family:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Ungültiger Familiencode")
 
     user = None
     membership = None
-
-    if payload.user_id:
-        # Specific user_id provided - verify that user
-        membership = db.query(FamilyMember).filter(
-            FamilyMember.family_id == family.id,
-            FamilyMember.user_id == payload.user_id,
-        ).first()
-        if membership:
-            user = db.get(User, payload.user_id)
-    else:
-        # No user_id - find child by PIN within the family
-        # Get all family members (children)
-        memberships = db.query(FamilyMember).filter(
-            FamilyMember.family_id == family.id,
-        ).all()
-
-        for m in memberships:
-            candidate = db.get(User, m.user_id)
-            if candidate and candidate.pin_hash and verify_pin(payload.pin, candidate.pin_hash):
-                user = candidate
-                membership = m
-                break
+    for m, candidate in candidates:
+        if candidate.pin_hash and await verify_pin_async(payload.pin, candidate.pin_hash):
+            user = candidate
+            membership = m
+            break
 
     if not membership or not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Ungültige Anmeldedaten")
 
-    # Verify PIN (if user_id was provided, we still need to check PIN)
-    if payload.user_id and (not user.pin_hash or not verify_pin(payload.pin, user.pin_hash)):
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Ungültige Anmeldedaten")
-
     if not user.is_active:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Konto deaktiviert")
 
-    # Update last login timestamp
-    user.last_login = datetime.utcnow()
-    db.commit()
+    # Upgrade hashes written under an older cost policy
+    if needs_rehash(user.pin_hash):
+        user.pin_hash = await hash_pin_async(payload.pin)
 
     access_token = create_access_token({
         "sub": user.id,
@@ -219,28 +240,33 @@ def login_pin(request: Request, payload: PinLoginRequest, db: Session = Depends(
         "role": user.role,
         "family_id": family.id,
     })
+
+    # Update last login timestamp
+    await run_in_threadpool(_record_login, db, user, family.id, "pin")
     return TokenResponse(access_token=access_token, refresh_token=refresh_token)
 
 
 @router.post("/login", response_model=TokenResponse)
-@limiter.limit("5/minute")
-def login(request: Request, payload: LoginRequest, db: Session = Depends(get_db_session)):
+@limiter.limit("5/minute", body_keys=("user_id",), rate_per_value="10/minute")
+async def login(request: Request, payload: LoginRequest, db: Session = Depends(get_db_session)):
     """Legacy PIN-based login (for backward compatibility)."""
-    user = db.get(User, payload.user_id)
-    if not user or not user.pin_hash or not verify_pin(payload.pin, user.pin_hash):
+    user = await run_in_threadpool(db.get, User, payload.user_id)
+    if not user or not user.pin_hash or not await verify_pin_async(payload.pin, user.pin_hash):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
-    # Update last login timestamp
-    user.last_login = datetime.utcnow()
-    db.commit()
+    if needs_rehash(user.pin_hash):
+        user.pin_hash = await hash_pin_async(payload.pin)
 
     access_token = create_access_token({"sub": user.id, "role": user.role})
     refresh_token = create_refresh_token({"sub": user.id, "role": user.role})
+
+    # Update last login timestamp
+    await run_in_threadpool(_record_login, db, user, None, "pin")
     return TokenResponse(access_token=access_token, refresh_token=refresh_token)
 
 
 @router.post("/login/code", response_model=TokenResponse)
-@limiter.limit("5/minute")
+@limiter.limit("5/minute", body_keys=("code",), rate_per_value="10/minute")
 def login_code(request: Request, payload: CodeLoginRequest, db: Session = Depends(get_db_session)):
     """Simple code-based login for children.
 
@@ -257,13 +283,14 @@ def login_code(request: Request, payload: CodeLoginRequest, db: Session = Depend
     if not user.is_active:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Konto deaktiviert")
 
+    # Get user's family membership for token context
+    membership = db.query(FamilyMember).filter(FamilyMember.user_id == user.id).first()
+
     # Update last login timestamp
     user.last_login = datetime.utcnow()
+    log_event(db, "login", family_id=membership.family_id if membership else None, actor_id=user.id, method="code")
     db.commit()
 
-    # Get user's family membership for token context
-    membership = db.query(FamilyMember).filter(FamilyMember.user_id == user.id).first()
-
     token_data = {"sub": user.id, "role": user.role}
     if membership:
         token_data["family_id"] = membership.family_id
@@ -275,7 +302,7 @@ def login_code(request: Request, payload: CodeLoginRequest, db: Session = Depend
 
 
 @router.post("/forgot-password", response_model=MessageResponse)
-@limiter.limit("3/minute")
+@limiter.limit("3/minute", body_keys=("email",), rate_per_value="10/hour")
 def forgot_password(request: Request, payload: ForgotPasswordRequest, db: Session = Depends(get_db_session)):
     """Request password reset email."""
     user = db.query(User).filter(User.email == payload.email).first()
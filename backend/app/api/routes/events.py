@@ -0,0 +1,59 @@
+"""Live event stream per family (Server-Sent Events)."""
+
+import asyncio
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.dependencies import get_db_session, verify_family_access
+from app.core.security import get_current_user
+from app.models.user import User
+from app.services.events import Subscription, event_bus
+
+router = APIRouter()
+
+HEARTBEAT_SECONDS = 15
+
+
+async def _event_stream(request: Request, subscription: Subscription, child_id: int | None):
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), timeout=HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": ping\n\n"
+                continue
+            # Children only see events about themselves
+            if child_id is not None and event.get("child_id") not in (None, child_id):
+                continue
+            yield f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+    finally:
+        event_bus.unsubscribe(subscription)
+
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    family_id: int = Query(..., description="Familie"),
+    db: Session = Depends(get_db_session),
+    user: User = Depends(get_current_user),
+):
+    """Server-Sent Events für neue, genehmigte und zurückgegebene Aufgaben sowie Erfolge."""
+    if not await run_in_threadpool(verify_family_access, db, user.id, family_id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Kein Zugriff auf diese Familie")
+    # Do not hold a DB connection for the lifetime of the stream
+    await run_in_threadpool(db.close)
+
+    subscription = event_bus.subscribe(family_id, user.id)
+    child_id = user.id if user.role == "child" else None
+    return StreamingResponse(
+        _event_stream(request, subscription, child_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
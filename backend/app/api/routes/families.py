@@ -1,11 +1,13 @@
 """Family management API routes."""
 
+import asyncio
 import secrets
 from datetime import datetime, timedelta, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import func
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import get_settings
 from app.core.dependencies import get_db_session
@@ -23,9 +25,12 @@ from app.schemas.family import (
     FamilyUpdate,
     InviteCodeResponse,
     JoinFamilyRequest,
+    PendingPayoutRead,
     ProviderInfo,
 )
+from app.services.activity import log_event
 from app.services.email import get_email_service
+from app.services.providers import ProviderRegistry, provider_pipeline
 
 router = APIRouter()
 settings = get_settings()
@@ -112,6 +117,7 @@ def create_family(
 
     db.commit()
     db.refresh(family)
+    ProviderRegistry.invalidate()
 
     return FamilyRead(
         id=family.id,
@@ -291,6 +297,7 @@ def add_child(
         role_in_family="child",
     )
     db.add(child_membership)
+    log_event(db, "user_created", family_id=family_id, actor_id=user.id, subject_id=child.id, name=child.name, role="child")
     db.commit()
     db.refresh(child_membership)
 
@@ -387,6 +394,7 @@ def join_family(
         role_in_family="parent",
     )
     db.add(membership)
+    log_event(db, "family_joined", family_id=family.id, actor_id=user.id)
     db.commit()
 
     member_count = db.query(func.count(FamilyMember.id)).filter(
@@ -467,6 +475,7 @@ def update_device_provider(
 
     db.commit()
     db.refresh(config)
+    ProviderRegistry.invalidate()
 
     return DeviceProviderRead(
         id=config.id,
@@ -476,15 +485,28 @@ def update_device_provider(
     )
 
 
+@router.get("/{family_id}/payouts/pending", response_model=list[PendingPayoutRead], dependencies=[Depends(require_role("parent"))])
+async def list_pending_payouts(
+    family_id: int,
+    db: Session = Depends(get_db_session),
+    user: User = Depends(get_current_user),
+):
+    """Unpaid rewards per provider, with the provider's hints; providers are queried concurrently."""
+    await run_in_threadpool(get_family_or_404, db, family_id, user)
+
+    codes = ProviderRegistry.get_all_codes()
+    results = await asyncio.gather(
+        *(provider_pipeline.get_pending_payouts(code, family_id=family_id) for code in codes)
+    )
+    return [
+        PendingPayoutRead(provider_type=code, **row)
+        for code, rows in zip(codes, results)
+        for row in rows
+    ]
+
+
 # Providers Registry
 @router.get("/providers/available", response_model=list[ProviderInfo])
 def list_available_providers(db: Session = Depends(get_db_session)):
     """List all available reward providers."""
-    providers = db.query(RewardProvider).filter(RewardProvider.is_active == True).order_by(RewardProvider.sort_order).all()
-
-    return [ProviderInfo(
-        code=p.code,
-        name=p.name,
-        description=p.description,
-        requires_tan_pool=p.requires_tan_pool,
-    ) for p in providers]
+    return [ProviderInfo(**p) for p in ProviderRegistry.list_available(db)]
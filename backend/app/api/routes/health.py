@@ -1,8 +1,13 @@
 from fastapi import APIRouter
 
+from app.core.hashing import hashing_pool
+
 router = APIRouter()
 
 
 @router.get("")
 async def healthcheck():
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "hashing": {"in_flight": hashing_pool.in_flight, "queue_depth": hashing_pool.queue_depth},
+    }
@@ -1,60 +1,95 @@
+from datetime import datetime
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func, select
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.core.delta import DeltaParams, changed_since, not_modified
 from app.core.dependencies import get_db_session, get_user_family_ids, verify_family_access
+from app.core.pagination import PageParams, iter_ndjson, paginate
 from app.core.security import get_current_user, require_role
 from app.models.ledger import TanLedger
 from app.models.user import User
-from app.schemas.ledger import LedgerAggregateRead, LedgerEntryRead, PayoutRequest
+from app.schemas.ledger import (
+    BulkMarkPaidRequest,
+    BulkMarkPaidResult,
+    BulkPayoutRequest,
+    BulkPayoutResult,
+    LedgerAggregateRead,
+    LedgerEntryRead,
+    PayoutRequest,
+)
+from app.services.activity import log_event
+from app.services.archive import history
+from app.services.change_tracking import get_family_versions
+from app.services.idempotency import IDEMPOTENCY_HEADER, run_idempotent
+from app.services.ledger_balances import balance_rows, mark_paid_until
+from app.services.providers import ProviderRegistry
+from app.services.tasks import family_child_ids
 
 router = APIRouter()
 
+IdempotencyKeyHeader = Header(
+    default=None,
+    alias=IDEMPOTENCY_HEADER,
+    max_length=100,
+    description="Vom Client gewaehlter Schluessel; Wiederholungen liefern das erste Ergebnis",
+)
+
+
+def _require_family_children(db: Session, family_id: int, child_ids: set[int]) -> None:
+    """400 unless all ids are children of the family (one query)."""
+    foreign = sorted(child_ids - family_child_ids(db, family_id))
+    if foreign:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Kinder gehoeren nicht zu dieser Familie: {', '.join(map(str, foreign))}",
+        )
+
 
 @router.get("/my", response_model=List[LedgerAggregateRead])
 def my_ledger(
+    request: Request,
+    response: Response,
     family_id: int | None = Query(default=None, description="Filter auf Familie"),
+    delta: DeltaParams = Depends(),
     db: Session = Depends(get_db_session),
     user: User = Depends(get_current_user),
 ):
-    """Kinder können ihren eigenen Ledger sehen."""
-    stmt = (
-        select(
-            TanLedger.child_id,
-            TanLedger.target_device,
-            func.sum(TanLedger.minutes).label("total_minutes"),
-            func.count(TanLedger.id).label("entry_count"),
-        )
-        .where(TanLedger.child_id == user.id)
-        .where(TanLedger.paid_out.is_(False))
-    )
+    """Kinder können ihren eigenen Ledger sehen.
 
+    Unterstützt ETag/If-None-Match. Mit ``?since=`` kommen nur die Geräte,
+    deren Einträge sich geändert haben (auch mit 0 Minuten, wenn alles
+    ausgezahlt wurde).
+    """
     # Family filtering
     if family_id is not None:
         if not verify_family_access(db, user.id, family_id):
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Kein Zugriff auf diese Familie")
-        stmt = stmt.where(TanLedger.family_id == family_id)
+        scope_ids = [family_id]
     else:
-        user_family_ids = get_user_family_ids(db, user.id)
-        if user_family_ids:
-            stmt = stmt.where(TanLedger.family_id.in_(user_family_ids))
+        scope_ids = get_user_family_ids(db, user.id)
+
+    cached = not_modified(request, response, get_family_versions(db, scope_ids), user.id)
+    if cached:
+        return cached
+
+    family_scope = scope_ids or None
+    devices = None
+    if delta.since is not None:
+        # Devices whose entries changed, reported even when nothing is unpaid anymore
+        stmt = select(TanLedger.target_device).distinct().where(TanLedger.child_id == user.id)
+        if scope_ids:
+            stmt = stmt.where(TanLedger.family_id.in_(scope_ids))
         else:
             stmt = stmt.where(TanLedger.family_id.is_(None))
+        devices = db.execute(changed_since(stmt, TanLedger, delta.since)).scalars().all()
 
-    stmt = stmt.group_by(TanLedger.child_id, TanLedger.target_device).order_by(TanLedger.target_device)
-    rows = db.execute(stmt).all()
-    return [
-        LedgerAggregateRead(
-            child_id=row.child_id,
-            target_device=row.target_device,
-            total_minutes=row.total_minutes or 0,
-            entry_count=row.entry_count or 0,
-        )
-        for row in rows
-    ]
+    rows = balance_rows(db, family_scope, child_id=user.id, devices=devices, unpaid_only=devices is None)
+    return [LedgerAggregateRead(**row) for row in rows]
 
 
 @router.get("/aggregate", response_model=List[LedgerAggregateRead], dependencies=[Depends(require_role("parent"))])
@@ -64,67 +99,48 @@ def aggregate_unpaid(
     db: Session = Depends(get_db_session),
     user: User = Depends(get_current_user),
 ):
-    stmt = (
-        select(
-            TanLedger.child_id,
-            TanLedger.target_device,
-            func.sum(TanLedger.minutes).label("total_minutes"),
-            func.count(TanLedger.id).label("entry_count"),
-        )
-        .where(TanLedger.paid_out.is_(False))
-    )
-
     # Family filtering
     if family_id is not None:
         if not verify_family_access(db, user.id, family_id):
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Kein Zugriff auf diese Familie")
-        stmt = stmt.where(TanLedger.family_id == family_id)
+        family_scope = [family_id]
     else:
-        user_family_ids = get_user_family_ids(db, user.id)
-        if user_family_ids:
-            stmt = stmt.where(TanLedger.family_id.in_(user_family_ids))
-        else:
-            stmt = stmt.where(TanLedger.family_id.is_(None))
+        family_scope = get_user_family_ids(db, user.id) or None
 
-    stmt = stmt.group_by(TanLedger.child_id, TanLedger.target_device).order_by(TanLedger.child_id, TanLedger.target_device)
-
-    if child_id is not None:
-        stmt = stmt.where(TanLedger.child_id == child_id)
-    rows = db.execute(stmt).all()
-    return [
-        LedgerAggregateRead(
-            child_id=row.child_id,
-            target_device=row.target_device,
-            total_minutes=row.total_minutes or 0,
-            entry_count=row.entry_count or 0,
-        )
-        for row in rows
-    ]
+    rows = balance_rows(db, family_scope, child_id=child_id)
+    return [LedgerAggregateRead(**row) for row in rows]
 
 
 @router.get("/{child_id}", response_model=List[LedgerEntryRead], dependencies=[Depends(require_role("parent"))])
 def list_ledger(
     child_id: int,
+    response: Response,
     family_id: int | None = Query(default=None, description="Filter auf Familie"),
+    page: PageParams = Depends(),
+    format: str = Query(default="json", pattern="^(json|ndjson)$", description="ndjson = kompletter Export als Stream"),
+    include_archived: bool = Query(default=False, description="Auch archivierte Eintraege"),
     db: Session = Depends(get_db_session),
     user: User = Depends(get_current_user),
 ):
-    stmt = select(TanLedger).where(TanLedger.child_id == child_id)
+    """Ledger entries of a child, newest first, paginated via the X-Next-Cursor header."""
+    ledger = history(TanLedger, include_archived)
+    stmt = select(ledger).where(ledger.child_id == child_id)
 
     # Family filtering
     if family_id is not None:
         if not verify_family_access(db, user.id, family_id):
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Kein Zugriff auf diese Familie")
-        stmt = stmt.where(TanLedger.family_id == family_id)
+        stmt = stmt.where(ledger.family_id == family_id)
     else:
         user_family_ids = get_user_family_ids(db, user.id)
         if user_family_ids:
-            stmt = stmt.where(TanLedger.family_id.in_(user_family_ids))
+            stmt = stmt.where(ledger.family_id.in_(user_family_ids))
         else:
-            stmt = stmt.where(TanLedger.family_id.is_(None))
+            stmt = stmt.where(ledger.family_id.is_(None))
 
-    stmt = stmt.order_by(TanLedger.created_at.desc())
-    return db.execute(stmt).scalars().all()
+    if format == "ndjson":
+        return StreamingResponse(iter_ndjson(stmt, ledger, LedgerEntryRead), media_type="application/x-ndjson")
+    return paginate(db, stmt, ledger, page, response)
 
 
 @router.post("/payout", response_model=LedgerEntryRead, status_code=status.HTTP_201_CREATED, dependencies=[Depends(require_role("parent"))])
@@ -144,6 +160,7 @@ def payout_entry(
         submission_id=None,
         minutes=request.minutes,
         target_device=request.target_device,
+        provider_type=ProviderRegistry.get_for_device(db, family_id, request.target_device).code,
         tan_code=request.tan_code,
         valid_until=request.valid_until,
         reason=request.reason or "manual payout",
@@ -151,6 +168,16 @@ def payout_entry(
     )
     db.add(entry)
     try:
+        db.flush()
+        log_event(
+            db,
+            "payout",
+            family_id=family_id,
+            actor_id=user.id,
+            subject_id=entry.id,
+            child_id=entry.child_id,
+            minutes=entry.minutes,
+        )
         db.commit()
     except IntegrityError:
         db.rollback()
@@ -178,6 +205,129 @@ def mark_paid(
 
     entry.paid_out = True
     db.add(entry)
+    log_event(
+        db,
+        "ledger_paid",
+        family_id=entry.family_id,
+        actor_id=user.id,
+        subject_id=entry.id,
+        child_id=entry.child_id,
+        minutes=entry.minutes,
+    )
     db.commit()
     db.refresh(entry)
     return entry
+
+
+@router.post("/payout/bulk", response_model=BulkPayoutResult, status_code=status.HTTP_201_CREATED, dependencies=[Depends(require_role("parent"))])
+def bulk_payout(
+    request: BulkPayoutRequest,
+    family_id: int = Query(..., description="Familie"),
+    idempotency_key: str | None = IdempotencyKeyHeader,
+    db: Session = Depends(get_db_session),
+    user: User = Depends(get_current_user),
+):
+    """Several payouts in one transaction: all are booked or none."""
+    # Verify family access
+    if not verify_family_access(db, user.id, family_id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Kein Zugriff auf diese Familie")
+    _require_family_children(db, family_id, {payout.child_id for payout in request.payouts})
+
+    def create_payouts() -> BulkPayoutResult:
+        providers = ProviderRegistry.resolve_many(db, family_id, {payout.target_device for payout in request.payouts})
+        entries = [
+            TanLedger(
+                child_id=payout.child_id,
+                family_id=family_id,
+                submission_id=None,
+                minutes=payout.minutes,
+                target_device=payout.target_device,
+                provider_type=providers[payout.target_device].code,
+                tan_code=payout.tan_code,
+                valid_until=payout.valid_until,
+                reason=payout.reason or "manual payout",
+                paid_out=True,
+            )
+            for payout in request.payouts
+        ]
+        db.add_all(entries)
+        try:
+            db.flush()
+        except IntegrityError:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="TAN code already exists",
+            )
+        for entry in entries:
+            log_event(
+                db,
+                "payout",
+                family_id=family_id,
+                actor_id=user.id,
+                subject_id=entry.id,
+                child_id=entry.child_id,
+                minutes=entry.minutes,
+            )
+        return BulkPayoutResult(
+            entries=[LedgerEntryRead.model_validate(entry) for entry in entries],
+            entry_count=len(entries),
+            total_minutes=sum(entry.minutes for entry in entries),
+        )
+
+    return run_idempotent(
+        db,
+        user.id,
+        idempotency_key,
+        "ledger.payout.bulk",
+        {"family_id": family_id, "body": request},
+        create_payouts,
+        status_code=status.HTTP_201_CREATED,
+    )
+
+
+@router.post("/mark-paid", response_model=BulkMarkPaidResult, dependencies=[Depends(require_role("parent"))])
+def bulk_mark_paid(
+    request: BulkMarkPaidRequest,
+    family_id: int = Query(..., description="Familie"),
+    idempotency_key: str | None = IdempotencyKeyHeader,
+    db: Session = Depends(get_db_session),
+    user: User = Depends(get_current_user),
+):
+    """Mark all unpaid entries of a child (optionally one device) up to ``until`` as paid."""
+    # Verify family access
+    if not verify_family_access(db, user.id, family_id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Kein Zugriff auf diese Familie")
+    _require_family_children(db, family_id, {request.child_id})
+
+    def mark_paid() -> BulkMarkPaidResult:
+        until = request.until or datetime.utcnow()
+        devices = mark_paid_until(db, family_id, request.child_id, until, target_device=request.target_device)
+        entry_count = sum(device["entry_count"] for device in devices)
+        total_minutes = sum(device["total_minutes"] for device in devices)
+        if entry_count:
+            log_event(
+                db,
+                "ledger_paid_bulk",
+                family_id=family_id,
+                actor_id=user.id,
+                child_id=request.child_id,
+                count=entry_count,
+                minutes=total_minutes,
+            )
+        return BulkMarkPaidResult(
+            child_id=request.child_id,
+            until=until,
+            entry_count=entry_count,
+            total_minutes=total_minutes,
+            devices=[LedgerAggregateRead(**device) for device in devices],
+        )
+
+    return run_idempotent(
+        db,
+        user.id,
+        idempotency_key,
+        "ledger.mark-paid",
+        {"family_id": family_id, "body": request},
+        mark_paid,
+    )
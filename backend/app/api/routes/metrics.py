@@ -0,0 +1,36 @@
+import secrets
+
+from fastapi import APIRouter, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import get_settings
+from app.core.hashing import hashing_pool
+from app.core.metrics import render_metrics
+from app.services.events import event_bus
+from app.services.providers import ProviderRegistry, provider_pipeline
+from app.services.stats_cache import stats_cache
+
+router = APIRouter()
+settings = get_settings()
+
+
+@router.get("", response_class=PlainTextResponse)
+def metrics(authorization: str | None = Header(default=None)):
+    """Prometheus scrape endpoint (per process)."""
+    if settings.metrics_token and not secrets.compare_digest(
+        authorization or "", f"Bearer {settings.metrics_token}"
+    ):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Nicht autorisiert")
+
+    gauges = {
+        "hashing_in_flight": ("bcrypt calls running or queued", hashing_pool.in_flight),
+        "hashing_queue_depth": ("bcrypt calls waiting for a worker", hashing_pool.queue_depth),
+        "event_stream_clients": ("Users with an open event stream", len(event_bus.online_user_ids())),
+        "stats_cache_entries": ("Cached /stats results in this process", len(stats_cache)),
+        "stats_cache_hits": ("Stats cache hits since start", stats_cache.hits),
+        "stats_cache_misses": ("Stats cache misses since start", stats_cache.misses),
+    }
+    for code in ProviderRegistry.get_all_codes():
+        gauges[f"provider_{code}_in_flight"] = (f"{code} provider calls running or queued", provider_pipeline.in_flight.get(code, 0))
+        gauges[f"provider_{code}_timeouts"] = (f"{code} provider calls timed out since start", provider_pipeline.timeouts.get(code, 0))
+    return PlainTextResponse(render_metrics(gauges), media_type="text/plain; version=0.0.4")
@@ -1,31 +1,62 @@
 from datetime import datetime, timedelta
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import func, and_
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
-from app.core.security import require_role
+from app.core.dependencies import get_user_family_ids, verify_family_access
+from app.core.responses import FastJSONResponse
+from app.core.security import get_current_user, require_role
+from app.models.family import FamilyMember
 from app.models.submission import Submission
 from app.models.ledger import TanLedger
 from app.models.user import User
 from app.models.task import Task
+from app.services.archive import archived_device_totals, archived_totals
+from app.services.ledger_balances import lifetime_minutes
+from app.services.stats_cache import cached_stats
 
 router = APIRouter()
 
 
+def _scope_family_ids(db: Session, user: User, family_id: int | None) -> list[int]:
+    if family_id is None:
+        return get_user_family_ids(db, user.id)
+    if not verify_family_access(db, user.id, family_id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Kein Zugriff auf diese Familie")
+    return [family_id]
+
+
 @router.get("/overview", dependencies=[Depends(require_role("parent"))])
 def get_stats_overview(
+    family_id: int | None = Query(default=None, description="Filter auf Familie"),
     db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
 ):
-    """Get overall statistics for the dashboard."""
-    # Get all children
-    children = db.query(User).filter(User.role == "child", User.is_active == True).all()
+    """Get overall statistics for the dashboard (cached per family data version)."""
+    family_ids = _scope_family_ids(db, user, family_id)
+    result = cached_stats(
+        db, "overview", family_ids, {"family_id": family_id}, lambda: _compute_overview(db, family_ids)
+    )
+    return FastJSONResponse(result)
+
+
+def _compute_overview(db: Session, family_ids: list[int]) -> dict:
+    # Children of the families in scope
+    children = db.query(User).filter(
+        User.role == "child",
+        User.is_active == True,
+        User.id.in_(db.query(FamilyMember.user_id).filter(FamilyMember.family_id.in_(family_ids))),
+    ).order_by(User.id).all()
 
     # Date ranges
     today = datetime.utcnow().date()
     week_start = today - timedelta(days=today.weekday())
     month_start = today.replace(day=1)
 
+    minutes_by_child = lifetime_minutes(db, [child.id for child in children])
+    archived = archived_totals(db, [child.id for child in children])
+
     child_stats = []
     for child in children:
         # Total completed submissions
@@ -33,6 +64,7 @@ def get_stats_overview(
             Submission.child_id == child.id,
             Submission.status == "approved"
         ).scalar() or 0
+        total_completed += archived.get(child.id, {}).get("submissions_approved", 0)
 
         # This week completed
         week_completed = db.query(func.count(Submission.id)).filter(
@@ -55,9 +87,7 @@ def get_stats_overview(
         ).scalar() or 0
 
         # Total TAN minutes earned
-        total_minutes = db.query(func.sum(TanLedger.minutes)).filter(
-            TanLedger.child_id == child.id
-        ).scalar() or 0
+        total_minutes = minutes_by_child.get(child.id, 0)
 
         # Calculate streak
         streak = _calculate_streak(db, child.id)
@@ -78,15 +108,20 @@ def get_stats_overview(
         TanLedger.target_device,
         func.sum(TanLedger.minutes).label("total_minutes"),
         func.count(TanLedger.id).label("count")
-    ).group_by(TanLedger.target_device).all()
+    ).filter(TanLedger.family_id.in_(family_ids)).group_by(TanLedger.target_device).all()
+
+    usage = {row.target_device: [row.total_minutes or 0, row.count or 0] for row in device_stats}
+    for device, totals in archived_device_totals(db, family_ids=family_ids).items():
+        minutes, count = usage.get(device, [0, 0])
+        usage[device] = [minutes + totals["ledger_minutes"], count + totals["ledger_entries"]]
 
     device_usage = [
         {
-            "device": row.target_device or "unknown",
-            "total_minutes": row.total_minutes or 0,
-            "count": row.count or 0,
+            "device": device or "unknown",
+            "total_minutes": minutes,
+            "count": count,
         }
-        for row in device_stats
+        for device, (minutes, count) in usage.items()
     ]
 
     # Weekly trend (last 4 weeks)
@@ -96,6 +131,7 @@ def get_stats_overview(
         week_begin = week_end - timedelta(days=7)
 
         count = db.query(func.count(Submission.id)).filter(
+            Submission.family_id.in_(family_ids),
             Submission.status == "approved",
             func.date(Submission.created_at) >= week_begin,
             func.date(Submission.created_at) < week_end
@@ -125,12 +161,26 @@ def get_stats_overview(
 def get_child_stats(
     child_id: int,
     db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
 ):
-    """Get detailed statistics for a specific child."""
-    child = db.query(User).filter(User.id == child_id, User.role == "child").first()
+    """Get detailed statistics for a specific child (cached per family data version)."""
+    family_ids = get_user_family_ids(db, user.id)
+    child = db.query(User).filter(
+        User.id == child_id,
+        User.role == "child",
+        User.id.in_(db.query(FamilyMember.user_id).filter(FamilyMember.family_id.in_(family_ids))),
+    ).first()
     if not child:
         return {"error": "Child not found"}
 
+    result = cached_stats(
+        db, "child", family_ids, {"child_id": child_id}, lambda: _compute_child_stats(db, child)
+    )
+    return FastJSONResponse(result)
+
+
+def _compute_child_stats(db: Session, child: User) -> dict:
+    child_id = child.id
     today = datetime.utcnow().date()
     week_start = today - timedelta(days=today.weekday())
 
@@ -153,7 +203,7 @@ def get_child_stats(
             "is_today": day == today,
         })
 
-    # Top completed tasks
+    # Top completed tasks (not archived, i.e. of the last ARCHIVE_AFTER_DAYS)
     top_tasks = db.query(
         Task.title,
         func.count(Submission.id).label("count")
@@ -167,6 +217,9 @@ def get_child_stats(
         TanLedger.target_device,
         func.sum(TanLedger.minutes).label("minutes")
     ).filter(TanLedger.child_id == child_id).group_by(TanLedger.target_device).all()
+    minutes_by_device = {d.target_device: d.minutes or 0 for d in device_breakdown}
+    for device, totals in archived_device_totals(db, child_id=child_id).items():
+        minutes_by_device[device] = minutes_by_device.get(device, 0) + totals["ledger_minutes"]
 
     return {
         "child_id": child_id,
@@ -174,8 +227,8 @@ def get_child_stats(
         "daily_stats": daily_stats,
         "top_tasks": [{"title": t.title, "count": t.count} for t in top_tasks],
         "device_breakdown": [
-            {"device": d.target_device or "unknown", "minutes": d.minutes or 0}
-            for d in device_breakdown
+            {"device": device or "unknown", "minutes": minutes}
+            for device, minutes in minutes_by_device.items()
         ],
         "current_streak": _calculate_streak(db, child_id),
     }
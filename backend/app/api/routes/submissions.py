@@ -1,13 +1,16 @@
 from datetime import datetime
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from fastapi import BackgroundTasks
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.core.delta import DeltaParams, changed_since, not_modified
 from app.core.dependencies import get_db_session, get_user_family_ids, verify_family_access
+from app.core.pagination import PageParams, iter_ndjson, paginate
 from app.core.security import get_current_user, require_role
 from app.models.ledger import TanLedger
 from app.models.submission import Submission
@@ -15,7 +18,13 @@ from app.models.task import Task
 from app.schemas.submission import SubmissionCreate, SubmissionDecision, SubmissionRead, SubmissionReadExtended
 from app.models.user import User
 from app.services.notifications import send_push, get_parent_tokens
+from app.services.activity import log_event
 from app.services.achievements import check_and_award_achievements
+from app.services.archive import history
+from app.services.change_tracking import get_family_versions
+from app.services.events import event_bus, publish_event
+from app.services.providers import ProviderRegistry
+from app.services.submissions import list_extended
 
 router = APIRouter()
 
@@ -50,8 +59,25 @@ def create_submission(
         updated_at=datetime.utcnow(),
     )
     db.add(submission)
+    db.flush()
+    log_event(
+        db,
+        "submission_pending",
+        family_id=submission.family_id,
+        actor_id=user.id,
+        subject_id=submission.id,
+        task_title=task.title,
+    )
     db.commit()
     db.refresh(submission)
+    publish_event(
+        submission.family_id,
+        "submission_created",
+        submission_id=submission.id,
+        task_id=submission.task_id,
+        child_id=submission.child_id,
+        status=submission.status,
+    )
 
     if is_auto_approve:
         # Auto-approve: create TAN ledger entry
@@ -61,18 +87,36 @@ def create_submission(
             submission_id=submission.id,
             minutes=task.tan_reward,
             target_device=submission.selected_device,
+            provider_type=ProviderRegistry.get_for_device(db, task.family_id, submission.selected_device).code,
             reason=f"Auto: {task.title}",
             paid_out=False,
             created_at=datetime.utcnow(),
         )
         db.add(ledger_entry)
+        log_event(
+            db,
+            "submission_approved",
+            family_id=submission.family_id,
+            subject_id=submission.id,
+            child_id=submission.child_id,
+            task_title=task.title,
+            minutes=task.tan_reward,
+        )
         db.commit()
+        publish_event(
+            submission.family_id,
+            "submission_approved",
+            submission_id=submission.id,
+            child_id=submission.child_id,
+            minutes=task.tan_reward,
+            target_device=submission.selected_device,
+        )
 
         # Check for achievements
         newly_unlocked = check_and_award_achievements(db, submission.child_id)
 
-        # Push to child about auto-approval
-        if background_tasks:
+        # Push to child about auto-approval (skipped while the live stream is open)
+        if background_tasks and submission.child_id not in event_bus.online_user_ids():
             from app.services.notifications import get_child_tokens
             tokens = get_child_tokens(db, submission.child_id)
             background_tasks.add_task(
@@ -87,9 +131,9 @@ def create_submission(
                 },
             )
     else:
-        # Normal flow: notify parents
+        # Normal flow: notify parents that are not on the live stream
         if background_tasks:
-            tokens = get_parent_tokens(db)
+            tokens = get_parent_tokens(db, exclude_user_ids=event_bus.online_user_ids())
             background_tasks.add_task(
                 send_push,
                 tokens,
@@ -105,53 +149,54 @@ def create_submission(
 
 @router.get("/history", response_model=List[SubmissionRead])
 def list_history(
+    request: Request,
+    response: Response,
     family_id: int | None = Query(default=None, description="Filter auf Familie"),
     child_id: int | None = Query(default=None, description="Filter auf Kind-ID (parent-only)"),
+    page: PageParams = Depends(),
+    delta: DeltaParams = Depends(),
+    format: str = Query(default="json", pattern="^(json|ndjson)$", description="ndjson = kompletter Export als Stream"),
+    include_archived: bool = Query(default=False, description="Auch archivierte Einreichungen"),
     db: Session = Depends(get_db_session),
     user=Depends(get_current_user),
 ):
-    stmt = select(Submission).order_by(Submission.created_at.desc())
+    """Submission history, newest first, paginated via the X-Next-Cursor header.
+
+    Supports ETag/If-None-Match; ``?since=`` returns only submissions
+    created or updated after that version. ``include_archived`` adds
+    submissions moved to the archive.
+    """
+    submissions = history(Submission, include_archived)
+    stmt = select(submissions)
 
     # Family filtering
     if family_id is not None:
         if not verify_family_access(db, user.id, family_id):
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Kein Zugriff auf diese Familie")
-        stmt = stmt.where(Submission.family_id == family_id)
+        scope_ids = [family_id]
     else:
-        user_family_ids = get_user_family_ids(db, user.id)
-        if user_family_ids:
-            stmt = stmt.where(Submission.family_id.in_(user_family_ids))
-        else:
-            stmt = stmt.where(Submission.family_id.is_(None))
+        scope_ids = get_user_family_ids(db, user.id)
+    if scope_ids:
+        stmt = stmt.where(submissions.family_id.in_(scope_ids))
+    else:
+        stmt = stmt.where(submissions.family_id.is_(None))
 
     if user.role == "child":
-        stmt = stmt.where(Submission.child_id == user.id)
+        stmt = stmt.where(submissions.child_id == user.id)
     else:
         if child_id is not None:
-            stmt = stmt.where(Submission.child_id == child_id)
-    return db.execute(stmt).scalars().all()
-
-
-def _extend_submission(sub: Submission, db: Session) -> SubmissionReadExtended:
-    """Helper to add task and child info to a submission."""
-    task = db.get(Task, sub.task_id)
-    child = db.get(User, sub.child_id)
-    return SubmissionReadExtended(
-        id=sub.id,
-        task_id=sub.task_id,
-        child_id=sub.child_id,
-        status=sub.status,
-        selected_device=sub.selected_device,
-        comment=sub.comment,
-        photo_path=sub.photo_path,
-        created_at=sub.created_at,
-        updated_at=sub.updated_at,
-        task_title=task.title if task else None,
-        task_description=task.description if task else None,
-        child_name=child.name if child else None,
-        tan_reward=task.tan_reward if task else None,
-        target_devices=task.target_devices if task else None,
-    )
+            stmt = stmt.where(submissions.child_id == child_id)
+
+    if delta.since is not None:
+        stmt = changed_since(stmt, submissions, delta.since)
+
+    if format == "ndjson":
+        return StreamingResponse(iter_ndjson(stmt, submissions, SubmissionRead), media_type="application/x-ndjson")
+
+    cached = not_modified(request, response, get_family_versions(db, scope_ids), user.id)
+    if cached:
+        return cached
+    return paginate(db, stmt, submissions, page, response)
 
 
 @router.get("/pending", response_model=List[SubmissionReadExtended], dependencies=[Depends(require_role("parent"))])
@@ -174,8 +219,7 @@ def list_pending(
         else:
             stmt = stmt.where(Submission.family_id.is_(None))
 
-    submissions = db.execute(stmt).scalars().all()
-    return [_extend_submission(sub, db) for sub in submissions]
+    return list_extended(db, stmt)
 
 
 @router.get("/completed", response_model=List[SubmissionReadExtended], dependencies=[Depends(require_role("parent"))])
@@ -202,8 +246,7 @@ def list_completed(
 
     if child_id is not None:
         stmt = stmt.where(Submission.child_id == child_id)
-    submissions = db.execute(stmt).scalars().all()
-    return [_extend_submission(sub, db) for sub in submissions]
+    return list_extended(db, stmt)
 
 
 @router.post("/{submission_id}/approve", response_model=SubmissionRead, dependencies=[Depends(require_role("parent"))])
@@ -235,6 +278,7 @@ def approve_submission(
         submission_id=submission.id,
         minutes=minutes,
         target_device=target_device,
+        provider_type=ProviderRegistry.get_for_device(db, submission.family_id, target_device).code,
         tan_code=decision.tan_code,
         valid_until=decision.valid_until,
         reason=f"Task {submission.task_id}",
@@ -243,6 +287,16 @@ def approve_submission(
     )
     db.add(ledger_entry)
     db.add(submission)
+    log_event(
+        db,
+        "submission_approved",
+        family_id=submission.family_id,
+        actor_id=user.id,
+        subject_id=submission.id,
+        child_id=submission.child_id,
+        task_title=task.title if task else f"Task {submission.task_id}",
+        minutes=minutes,
+    )
     try:
         db.commit()
     except IntegrityError:
@@ -252,12 +306,20 @@ def approve_submission(
             detail="TAN code already exists",
         )
     db.refresh(submission)
+    publish_event(
+        submission.family_id,
+        "submission_approved",
+        submission_id=submission.id,
+        child_id=submission.child_id,
+        minutes=ledger_entry.minutes,
+        target_device=ledger_entry.target_device,
+    )
 
     # Check for newly unlocked achievements
     newly_unlocked = check_and_award_achievements(db, submission.child_id)
 
-    # Push an Kind
-    if background_tasks:
+    # Push an Kind (entfällt, solange der Live-Stream offen ist)
+    if background_tasks and submission.child_id not in event_bus.online_user_ids():
         from app.services.notifications import get_child_tokens
 
         tokens = get_child_tokens(db, submission.child_id)
@@ -294,6 +356,23 @@ def retry_submission(
     submission.comment = decision.comment or "Bitte noch einmal erledigen."
     submission.updated_at = datetime.utcnow()
     db.add(submission)
+    task = db.get(Task, submission.task_id)
+    log_event(
+        db,
+        "submission_retry",
+        family_id=submission.family_id,
+        actor_id=user.id,
+        subject_id=submission.id,
+        child_id=submission.child_id,
+        task_title=task.title if task else f"Task {submission.task_id}",
+    )
     db.commit()
     db.refresh(submission)
+    publish_event(
+        submission.family_id,
+        "submission_retry",
+        submission_id=submission.id,
+        child_id=submission.child_id,
+        comment=submission.comment,
+    )
     return submission
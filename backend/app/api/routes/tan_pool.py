@@ -1,7 +1,13 @@
+import codecs
+import io
+from collections import Counter
 from datetime import datetime
+from typing import Iterable, Iterator
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func, select
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Query, UploadFile, status
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
@@ -15,9 +21,22 @@ from app.schemas.tan_pool import (
     TanPoolImportResponse,
     TanPoolStats,
 )
+from app.services.activity import log_event
+from app.services.notifications import get_family_parent_tokens, send_push
+from app.services.tan_pool import (
+    adjust_counters,
+    allocate_tans,
+    claim_tan,
+    delete_tan as delete_pool_entry,
+    get_counters,
+    low_stock_alert,
+)
 
 router = APIRouter()
 
+IMPORT_CHUNK_SIZE = 500  # TANs per duplicate check / INSERT
+IMPORT_READ_CHUNK_BYTES = 64 * 1024
+
 
 def normalize_device_name(device: str) -> str:
     """Normalize device names to standard format."""
@@ -32,35 +51,83 @@ def normalize_device_name(device: str) -> str:
     return device
 
 
-@router.post("/import", response_model=TanPoolImportResponse, dependencies=[Depends(require_role("parent"))])
-def import_tans(
-    request: TanPoolImportRequest,
-    family_id: int = Query(..., description="Familie für diese TANs"),
-    db: Session = Depends(get_db_session),
-    user: User = Depends(get_current_user),
-):
+def _iter_text_lines(raw_text: str) -> Iterator[str]:
+    """Yield lines from pasted text without materializing a list."""
+    yield from io.StringIO(raw_text)
+
+
+def _iter_upload_lines(upload: UploadFile) -> Iterator[str]:
+    """Yield decoded lines from an uploaded file, reading it in fixed-size chunks."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    while True:
+        chunk = upload.file.read(IMPORT_READ_CHUNK_BYTES)
+        if not chunk:
+            break
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        yield from lines
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def _insert_ignoring_conflicts(db: Session, rows: list[dict]) -> list[str]:
+    """Insert TAN rows in one statement, skipping codes that already exist.
+
+    Returns the target device of every row actually inserted.
     """
-    Import TANs from text format.
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        stmt = postgresql_insert(TanPool).on_conflict_do_nothing(index_elements=[TanPool.tan_code])
+    elif dialect == "sqlite":
+        stmt = sqlite_insert(TanPool).on_conflict_do_nothing(index_elements=[TanPool.tan_code])
+    else:
+        # Duplicates were already filtered by the IN query
+        stmt = insert(TanPool)
+    return db.scalars(stmt.returning(TanPool.target_device), rows).all()
+
+
+def import_tan_lines(db: Session, family_id: int, lines: Iterable[str]) -> TanPoolImportResponse:
+    """Parse and import TAN lines in chunks.
+
     Expected format per line: TAN;Minutes;Created;Device
-    First line can be a header and will be skipped if it contains 'TAN' or 'Tan'.
+    The first non-empty line is skipped if it looks like a header.
+    Duplicates are detected with one IN query per chunk and rows are
+    inserted with a single multi-row INSERT ... ON CONFLICT DO NOTHING.
     """
-    # Verify family access
-    if not verify_family_access(db, user.id, family_id):
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Kein Zugriff auf diese Familie")
-
-    lines = request.raw_text.strip().split("\n")
     imported = 0
     skipped = 0
     errors: list[str] = []
-
+    seen: set[str] = set()
+    chunk: list[dict] = []
+    now = datetime.utcnow()
+
+    def flush() -> None:
+        nonlocal imported, skipped
+        if not chunk:
+            return
+        codes = [row["tan_code"] for row in chunk]
+        existing = set(db.execute(select(TanPool.tan_code).where(TanPool.tan_code.in_(codes))).scalars())
+        rows = [row for row in chunk if row["tan_code"] not in existing]
+        inserted = _insert_ignoring_conflicts(db, rows) if rows else []
+        for device, count in Counter(inserted).items():
+            adjust_counters(db, family_id, device, available=count)
+        imported += len(inserted)
+        skipped += len(chunk) - len(inserted)
+        chunk.clear()
+
+    header_checked = False
     for i, line in enumerate(lines, 1):
         line = line.strip()
         if not line:
             continue
 
         # Skip header line
-        if i == 1 and ("TAN" in line.upper() or "MINUTES" in line.upper()):
-            continue
+        if not header_checked:
+            header_checked = True
+            if "TAN" in line.upper() or "MINUTES" in line.upper():
+                continue
 
         parts = line.split(";")
         if len(parts) < 4:
@@ -78,25 +145,24 @@ def import_tans(
         device_raw = parts[3].strip().rstrip("#")  # Remove trailing #
         target_device = normalize_device_name(device_raw)
 
-        # Check for duplicate within this family
-        existing = db.execute(
-            select(TanPool).where(TanPool.tan_code == tan_code, TanPool.family_id == family_id)
-        ).scalar_one_or_none()
-
-        if existing:
+        # Duplicate within this import
+        if tan_code in seen:
             skipped += 1
             continue
+        seen.add(tan_code)
 
-        entry = TanPool(
-            tan_code=tan_code,
-            minutes=minutes,
-            target_device=target_device,
-            family_id=family_id,
-            created_at=datetime.utcnow(),
-            used=False,
-        )
-        db.add(entry)
-        imported += 1
+        chunk.append({
+            "tan_code": tan_code,
+            "minutes": minutes,
+            "target_device": target_device,
+            "family_id": family_id,
+            "created_at": now,
+            "used": False,
+        })
+        if len(chunk) >= IMPORT_CHUNK_SIZE:
+            flush()
+
+    flush()
 
     try:
         db.commit()
@@ -110,6 +176,40 @@ def import_tans(
     return TanPoolImportResponse(imported=imported, skipped=skipped, errors=errors)
 
 
+@router.post("/import", response_model=TanPoolImportResponse, dependencies=[Depends(require_role("parent"))])
+def import_tans(
+    request: TanPoolImportRequest,
+    family_id: int = Query(..., description="Familie für diese TANs"),
+    db: Session = Depends(get_db_session),
+    user: User = Depends(get_current_user),
+):
+    """
+    Import TANs from text format.
+    Expected format per line: TAN;Minutes;Created;Device
+    First line can be a header and will be skipped if it contains 'TAN' or 'Tan'.
+    """
+    # Verify family access
+    if not verify_family_access(db, user.id, family_id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Kein Zugriff auf diese Familie")
+
+    return import_tan_lines(db, family_id, _iter_text_lines(request.raw_text))
+
+
+@router.post("/import/file", response_model=TanPoolImportResponse, dependencies=[Depends(require_role("parent"))])
+def import_tans_file(
+    file: UploadFile = File(..., description="Kisi-Export (TAN;Minutes;Created;Device)"),
+    family_id: int = Query(..., description="Familie für diese TANs"),
+    db: Session = Depends(get_db_session),
+    user: User = Depends(get_current_user),
+):
+    """Import TANs from an uploaded CSV file, read in chunks."""
+    # Verify family access
+    if not verify_family_access(db, user.id, family_id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Kein Zugriff auf diese Familie")
+
+    return import_tan_lines(db, family_id, _iter_upload_lines(file))
+
+
 @router.get("", response_model=list[TanPoolEntry], dependencies=[Depends(require_role("parent"))])
 def list_tans(
     family_id: int = Query(..., description="Familie"),
@@ -145,28 +245,15 @@ def get_stats(
     if not verify_family_access(db, user.id, family_id):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Kein Zugriff auf diese Familie")
 
-    total = db.execute(
-        select(func.count(TanPool.id)).where(TanPool.family_id == family_id)
-    ).scalar() or 0
-    available = db.execute(
-        select(func.count(TanPool.id)).where(TanPool.used.is_(False), TanPool.family_id == family_id)
-    ).scalar() or 0
-    used = total - available
-
-    # Count available by device
-    device_counts = db.execute(
-        select(TanPool.target_device, func.count(TanPool.id))
-        .where(TanPool.used.is_(False), TanPool.family_id == family_id)
-        .group_by(TanPool.target_device)
-    ).all()
-
-    by_device = {row[0]: row[1] for row in device_counts}
+    counters = get_counters(db, family_id)
+    available = sum(c.available for c in counters)
+    used = sum(c.used for c in counters)
 
     return TanPoolStats(
-        total=total,
+        total=available + used,
         available=available,
         used=used,
-        by_device=by_device,
+        by_device={c.target_device: c.available for c in counters if c.available > 0},
     )
 
 
@@ -193,12 +280,51 @@ def get_next_available(
     return db.execute(stmt).scalar_one_or_none()
 
 
+@router.post("/allocate", response_model=list[TanPoolEntry], dependencies=[Depends(require_role("parent"))])
+def allocate(
+    target_device: str,
+    family_id: int = Query(..., description="Familie"),
+    count: int = Query(default=1, ge=1, le=100, description="Anzahl TANs"),
+    child_id: int | None = None,
+    db: Session = Depends(get_db_session),
+    user: User = Depends(get_current_user),
+    background_tasks: BackgroundTasks = None,
+):
+    """Atomically take the next `count` available TANs for a device.
+
+    Returns fewer entries if the pool runs out.
+    """
+    # Verify family access
+    if not verify_family_access(db, user.id, family_id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Kein Zugriff auf diese Familie")
+
+    target_device = target_device.lower()
+    entries = allocate_tans(db, family_id, target_device, child_id=child_id, count=count)
+    if entries:
+        log_event(
+            db,
+            "tan_used",
+            family_id=family_id,
+            actor_id=user.id,
+            child_id=child_id,
+            count=len(entries),
+            target_device=target_device,
+        )
+    db.commit()
+
+    alert = low_stock_alert(db, family_id, target_device, len(entries))
+    if alert and background_tasks:
+        background_tasks.add_task(send_push, get_family_parent_tokens(db, family_id), alert)
+    return entries
+
+
 @router.post("/{tan_id}/use", response_model=TanPoolEntry, dependencies=[Depends(require_role("parent"))])
 def mark_used(
     tan_id: int,
     child_id: int | None = None,
     db: Session = Depends(get_db_session),
     user: User = Depends(get_current_user),
+    background_tasks: BackgroundTasks = None,
 ):
     """Mark a TAN as used."""
     entry = db.get(TanPool, tan_id)
@@ -209,15 +335,27 @@ def mark_used(
     if entry.family_id and not verify_family_access(db, user.id, entry.family_id):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Kein Zugriff auf diese TAN")
 
-    if entry.used:
+    claimed = claim_tan(db, tan_id, child_id=child_id)
+    if not claimed:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="TAN bereits verwendet")
 
-    entry.used = True
-    entry.used_at = datetime.utcnow()
-    entry.used_by_child_id = child_id
+    log_event(
+        db,
+        "tan_used",
+        family_id=claimed.family_id,
+        actor_id=user.id,
+        subject_id=claimed.id,
+        child_id=child_id,
+        count=1,
+        target_device=claimed.target_device,
+    )
     db.commit()
-    db.refresh(entry)
-    return entry
+    db.refresh(claimed)
+
+    alert = low_stock_alert(db, claimed.family_id, claimed.target_device, 1)
+    if alert and background_tasks:
+        background_tasks.add_task(send_push, get_family_parent_tokens(db, claimed.family_id), alert)
+    return claimed
 
 
 @router.delete("/{tan_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(require_role("parent"))])
@@ -235,5 +373,5 @@ def delete_tan(
     if entry.family_id and not verify_family_access(db, user.id, entry.family_id):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Kein Zugriff auf diese TAN")
 
-    db.delete(entry)
+    delete_pool_entry(db, entry)
     db.commit()
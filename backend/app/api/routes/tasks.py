@@ -1,16 +1,19 @@
 from datetime import datetime
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
+from app.core.delta import DeltaParams, changed_since, not_modified
 from app.core.dependencies import get_db_session, get_user_family_ids, verify_family_access
 from app.core.security import get_current_user, require_role
-from app.models.task import Task
+from app.models.task import Task, TaskChild
 from app.models.user import User
 from app.schemas.task import TaskCreate, TaskRead, TaskUpdate
+from app.services.change_tracking import get_family_versions
+from app.services.tasks import apply_schedule, check_assigned_children, weekday_bit
 
 router = APIRouter()
 settings = get_settings()
@@ -42,50 +45,54 @@ def list_tasks(
             stmt = stmt.where(Task.family_id.is_(None))
 
     if child_id is not None:
-        stmt = stmt.where(Task.assigned_children.contains([child_id]))
+        stmt = stmt.join(TaskChild, TaskChild.task_id == Task.id).where(TaskChild.child_id == child_id)
 
     tasks = db.execute(stmt).scalars().all()
     return tasks
 
 
-def is_task_due_today(recurrence: dict | list | None, day_key: str) -> bool:
-    if not recurrence:
-        return True
-    if isinstance(recurrence, dict):
-        return bool(recurrence.get(day_key, False))
-    if isinstance(recurrence, list):
-        return day_key in recurrence
-    return True
-
-
 @router.get("/today", response_model=List[TaskRead])
 def list_tasks_today(
+    request: Request,
+    response: Response,
     family_id: int | None = Query(default=None, description="Filter auf Familie"),
     child_id: int | None = Query(default=None, description="Filter auf zugewiesene Kind-ID"),
+    delta: DeltaParams = Depends(),
     db: Session = Depends(get_db_session),
     user: User = Depends(get_current_user),
 ):
-    """List tasks due today. Filters by family_id if provided."""
-    stmt = select(Task).where(Task.is_active.is_(True))
+    """Tasks due today. Supports ETag/If-None-Match and ``?since=``.
 
+    In delta mode the result contains every changed task of the family,
+    including ones that are no longer active, due today or assigned to
+    ``child_id``, so the client can drop them.
+    """
     # Family filtering
     if family_id is not None:
         if not verify_family_access(db, user.id, family_id):
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Kein Zugriff auf diese Familie")
-        stmt = stmt.where(Task.family_id == family_id)
+        scope_ids = [family_id]
     else:
-        user_family_ids = get_user_family_ids(db, user.id)
-        if user_family_ids:
-            stmt = stmt.where(Task.family_id.in_(user_family_ids))
-        else:
-            stmt = stmt.where(Task.family_id.is_(None))
+        scope_ids = get_user_family_ids(db, user.id)
 
-    if child_id is not None:
-        stmt = stmt.where(Task.assigned_children.contains([child_id]))
+    today = datetime.utcnow().date()
+    cached = not_modified(request, response, get_family_versions(db, scope_ids), user.id, today)
+    if cached:
+        return cached
 
-    tasks = db.execute(stmt).scalars().all()
-    day_key = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"][datetime.utcnow().weekday()]
-    return [task for task in tasks if is_task_due_today(task.recurrence, day_key)]
+    stmt = select(Task)
+    if scope_ids:
+        stmt = stmt.where(Task.family_id.in_(scope_ids))
+    else:
+        stmt = stmt.where(Task.family_id.is_(None))
+
+    if delta.since is not None:
+        return db.execute(changed_since(stmt, Task, delta.since)).scalars().all()
+
+    if child_id is not None:
+        stmt = stmt.join(TaskChild, TaskChild.task_id == Task.id).where(TaskChild.child_id == child_id)
+    stmt = stmt.where(Task.is_active.is_(True), Task.recurrence_mask.op("&")(weekday_bit(today)) != 0)
+    return db.execute(stmt).scalars().all()
 
 
 @router.post("", response_model=TaskRead, status_code=status.HTTP_201_CREATED)
@@ -101,6 +108,8 @@ def create_task(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Kein Zugriff auf diese Familie")
 
     task = Task(**payload.model_dump(), family_id=family_id, created_at=datetime.utcnow())
+    check_assigned_children(db, task)
+    apply_schedule(task)
     db.add(task)
     db.commit()
     db.refresh(task)
@@ -123,8 +132,11 @@ def update_task(
     if task.family_id and not verify_family_access(db, user.id, task.family_id):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Kein Zugriff auf diese Aufgabe")
 
+    previous_children = list(task.assigned_children or [])
     for key, value in payload.model_dump(exclude_unset=True).items():
         setattr(task, key, value)
+    check_assigned_children(db, task, previous_children)
+    apply_schedule(task)
     db.add(task)
     db.commit()
     db.refresh(task)
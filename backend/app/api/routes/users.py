@@ -10,6 +10,7 @@ from app.core.security import get_current_user, hash_pin, require_role
 from app.models.user import User
 from app.models.family import FamilyMember
 from app.schemas.user import UserCreate, UserRead, UserUpdate
+from app.services.activity import log_event
 
 router = APIRouter()
 
@@ -29,7 +30,11 @@ def get_family_member_ids(db: Session, family_ids: list[int]) -> set[int]:
 
 
 @router.post("", response_model=UserRead, status_code=status.HTTP_201_CREATED, dependencies=[Depends(require_role("parent"))])
-def create_user(payload: UserCreate, db: Session = Depends(get_db_session)):
+def create_user(
+    payload: UserCreate,
+    db: Session = Depends(get_db_session),
+    current_user: User = Depends(get_current_user),
+):
     """Create a new user (parent-only)."""
     user = User(
         name=payload.name,
@@ -40,6 +45,8 @@ def create_user(payload: UserCreate, db: Session = Depends(get_db_session)):
         created_at=datetime.utcnow(),
     )
     db.add(user)
+    db.flush()
+    log_event(db, "user_created", actor_id=current_user.id, subject_id=user.id, name=user.name, role=user.role)
     db.commit()
     db.refresh(user)
     return user
@@ -0,0 +1,114 @@
+"""Result cache with TTL and LRU eviction, optionally backed by Redis.
+
+``TTLCache`` keeps entries in process memory. With a shared backend
+(``RedisBackend``, ``pip install .[shared-cache]``) a local miss falls back
+to Redis, so all workers profit from one computation. Values must be
+JSON-compatible.
+
+Keys should contain the version of the data they were computed from (see
+``services/stats_cache.py``): a write then makes old entries unreachable,
+and the TTL only bounds memory and drift from writes that are not
+versioned.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from app.core.responses import dumps
+
+logger = logging.getLogger(__name__)
+
+
+class RedisBackend:
+    """Shared cache entries in Redis; errors count as a miss."""
+
+    def __init__(self, url: str, prefix: str = "zeitschatz:"):
+        import redis
+
+        self._redis = redis
+        self._client = redis.Redis.from_url(url, socket_timeout=0.5)
+        self.prefix = prefix
+
+    def get(self, key: str) -> Any | None:
+        try:
+            raw = self._client.get(self.prefix + key)
+        except self._redis.RedisError as exc:
+            logger.warning("Cache backend unavailable: %s", exc)
+            return None
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key: str, value: Any, ttl_seconds: int) -> None:
+        try:
+            self._client.set(self.prefix + key, dumps(value), ex=ttl_seconds)
+        except self._redis.RedisError as exc:
+            logger.warning("Cache backend unavailable: %s", exc)
+
+
+class TTLCache:
+    """Bounded LRU whose entries expire after ``ttl_seconds``; thread-safe."""
+
+    def __init__(self, maxsize: int, ttl_seconds: int, backend: RedisBackend | None = None):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_local(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def _set_local(self, key: str, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Any | None:
+        value = self._get_local(key)
+        if value is None and self.backend is not None:
+            value = self.backend.get(key)
+            if value is not None:
+                self._set_local(key, value)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        self._set_local(key, value)
+        if self.backend is not None:
+            self.backend.set(key, value, self.ttl_seconds)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def create_cache(maxsize: int, ttl_seconds: int, url: str = "") -> TTLCache:
+    """In-process cache, backed by Redis when ``url`` is set."""
+    backend = RedisBackend(url) if url else None
+    return TTLCache(maxsize, ttl_seconds, backend)
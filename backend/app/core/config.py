@@ -1,5 +1,5 @@
 from functools import lru_cache
-from typing import Any
+from typing import Any, Literal
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -17,11 +17,21 @@ class Settings(BaseSettings):
     secret_key: str = Field(default="changeme", alias="SECRET_KEY")
     access_token_expire_minutes: int = Field(default=60, alias="ACCESS_TOKEN_EXPIRE_MINUTES")
     refresh_token_expire_days: int = Field(default=7, alias="REFRESH_TOKEN_EXPIRE_DAYS")
+    jwt_backend: Literal["jose", "pyjwt"] = Field(default="jose", alias="JWT_BACKEND")  # pyjwt needs the fast-jwt extra
+    jwt_cache_size: int = Field(default=1024, alias="JWT_CACHE_SIZE")  # verified tokens kept in memory, 0 = off
+    bcrypt_rounds: int = Field(default=12, ge=4, le=31, alias="BCRYPT_ROUNDS")
+    hash_workers: int = Field(default=2, alias="HASH_WORKERS")  # bcrypt processes per app worker, 0 = one thread
+    hash_queue_limit: int = Field(default=32, alias="HASH_QUEUE_LIMIT")  # concurrent bcrypt calls before 503
     database_url: str = Field(default="sqlite:///./data/zeit.db", alias="DATABASE_URL")
+    slow_query_ms: int = Field(default=200, alias="SLOW_QUERY_MS")  # log SQL statements slower than this
+    gzip_min_size: int = Field(default=1000, alias="GZIP_MIN_SIZE")  # bytes, smaller responses stay uncompressed (gzip and brotli)
+    metrics_token: str = Field(default="", alias="METRICS_TOKEN")  # bearer token for /metrics, empty = open
     storage_dir: str = Field(default="/data/photos", alias="STORAGE_DIR")
     photo_retention_days: int = Field(default=14, alias="PHOTO_RETENTION_DAYS")
     fcm_server_key: str = Field(default="", alias="FCM_SERVER_KEY")
+    event_bus_backend: Literal["memory", "postgres"] = Field(default="memory", alias="EVENT_BUS_BACKEND")  # postgres = shared between workers
     tan_default_duration_minutes: int = Field(default=30, alias="TAN_DEFAULT_DURATION_MINUTES")
+    tan_low_stock_threshold: int = Field(default=3, alias="TAN_LOW_STOCK_THRESHOLD")  # push when available <= N, -1 = off
     photo_max_bytes: int = Field(default=5_000_000, alias="PHOTO_MAX_BYTES")
     cors_origins: str = Field(default="*", alias="CORS_ORIGINS")
     dev_bypass_auth: bool = Field(default=False, alias="DEV_BYPASS_AUTH")
@@ -42,6 +52,25 @@ class Settings(BaseSettings):
 
     # Family settings
     invite_code_expiry_days: int = Field(default=7, alias="INVITE_CODE_EXPIRY_DAYS")
+    provider_cache_ttl_seconds: int = Field(default=60, alias="PROVIDER_CACHE_TTL_SECONDS")
+    provider_concurrency: int = Field(default=4, alias="PROVIDER_CONCURRENCY")  # worker threads per reward provider
+    provider_queue_limit: int = Field(default=32, alias="PROVIDER_QUEUE_LIMIT")  # running + waiting calls per provider before 503
+    provider_timeout_seconds: float = Field(default=10.0, alias="PROVIDER_TIMEOUT_SECONDS")  # per read, then 504; started writes are awaited
+
+    # Admin statistics
+    stats_cache_ttl_seconds: int = Field(default=300, alias="STATS_CACHE_TTL_SECONDS")  # /stats results, 0 = off
+    stats_cache_size: int = Field(default=512, alias="STATS_CACHE_SIZE")  # entries kept per process
+    stats_cache_url: str = Field(default="", alias="STATS_CACHE_URL")  # redis://... shared between workers, empty = in-process only
+    stats_refresh_minutes: int = Field(default=5, alias="STATS_REFRESH_MINUTES")  # recompute snapshot + recent rollups
+    activity_retention_days: int = Field(default=180, alias="ACTIVITY_RETENTION_DAYS")  # activity log entries kept
+    activity_max_rows: int = Field(default=200_000, alias="ACTIVITY_MAX_ROWS")  # hard cap, oldest dropped first
+
+    # Bulk ledger requests
+    idempotency_key_ttl_hours: int = Field(default=48, alias="IDEMPOTENCY_KEY_TTL_HOURS")  # how long retries replay the stored response
+
+    # Ledger/submission archive
+    archive_after_days: int = Field(default=400, alias="ARCHIVE_AFTER_DAYS")  # settled rows older than this are archived, min 400, 0 = off
+    archive_batch_size: int = Field(default=1000, alias="ARCHIVE_BATCH_SIZE")  # rows moved per transaction
 
     def get_cors_origins(self) -> list[str]:
         """Parse CORS origins from comma-separated string."""
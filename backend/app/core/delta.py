@@ -0,0 +1,91 @@
+"""ETag / If-None-Match and ``?since=`` delta support for polling endpoints.
+
+Responses carry an ``ETag`` derived from the change versions of the
+families in scope (see ``app/services/change_tracking.py``) and the
+version token in ``X-Change-Version``. A poll with a matching
+``If-None-Match`` gets a 304 without running the query; passing the token
+back as ``?since=`` returns only rows changed after it.
+
+The token is opaque to clients: ``<family_id>:<version>`` pairs joined by
+commas.
+"""
+
+import hashlib
+from typing import Any
+
+from fastapi import HTTPException, Query, Request, Response, status
+from sqlalchemy import Select, and_, or_
+
+CHANGE_VERSION_HEADER = "X-Change-Version"
+
+
+class DeltaParams:
+    """Query parameter shared by delta-capable endpoints."""
+
+    def __init__(
+        self,
+        since: str | None = Query(default=None, description="Nur Änderungen seit X-Change-Version"),
+    ):
+        self.since = decode_versions(since) if since else None
+
+
+def encode_versions(versions: dict[int, int]) -> str:
+    return ",".join(f"{family_id}:{version}" for family_id, version in sorted(versions.items()))
+
+
+def decode_versions(token: str) -> dict[int, int]:
+    try:
+        versions = {}
+        for part in token.split(","):
+            family_id, version = part.split(":")
+            versions[int(family_id)] = int(version)
+        return versions
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Ungültige Version")
+
+
+def version_headers(request: Request, versions: dict[int, int], *key_parts: Any) -> dict[str, str]:
+    """ETag and version headers for a response.
+
+    ``key_parts`` add anything else the payload depends on (user, date).
+    Empty if no family is in scope, since then nothing is versioned.
+    """
+    if not versions:
+        return {}
+    token = encode_versions(versions)
+    key = "|".join([request.url.path, request.url.query, token, *map(str, key_parts)])
+    etag = '"' + hashlib.sha1(key.encode("utf-8")).hexdigest()[:24] + '"'
+    return {"ETag": etag, CHANGE_VERSION_HEADER: token}
+
+
+def is_not_modified(request: Request, headers: dict[str, str]) -> bool:
+    etag = headers.get("ETag")
+    if not etag:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in request.headers.get("if-none-match", "").split(",")]
+    return etag in candidates or "*" in candidates
+
+
+def not_modified(request: Request, response: Response, versions: dict[int, int], *key_parts: Any) -> Response | None:
+    """Return a 304 response if the client is up to date, else set the headers on ``response``."""
+    headers = version_headers(request, versions, *key_parts)
+    if is_not_modified(request, headers):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
+def changed_since(stmt: Select, model: Any, since: dict[int, int]) -> Select:
+    """Restrict a query to rows written after the given versions.
+
+    Families missing from the token (joined since) return all their rows.
+    """
+    return stmt.where(
+        or_(
+            model.family_id.not_in(list(since)),
+            *(
+                and_(model.family_id == family_id, model.change_version > version)
+                for family_id, version in since.items()
+            ),
+        )
+    )
@@ -0,0 +1,134 @@
+"""bcrypt hashing and verification off the request threads.
+
+bcrypt costs 100-300 ms of CPU per call. Login routes ``await`` the async
+helpers here, which run bcrypt in a small dedicated process pool
+(``HASH_WORKERS``), so a burst of logins cannot occupy the threadpool that
+serves every other sync endpoint. At most ``HASH_QUEUE_LIMIT`` calls may
+be in flight; beyond that a login gets a 503 instead of queueing forever.
+
+The sync helpers in ``app.core.security`` (used by scripts and admin
+routes) run bcrypt inline with the same cost (``BCRYPT_ROUNDS``).
+
+Hashing policy: the bcrypt prefix (``$2b$<cost>$``) records the scheme
+version and work factor of every stored hash. Logins call
+``needs_rehash`` and re-hash the just-verified secret when it differs from
+the current policy, so ``BCRYPT_ROUNDS`` can be raised or lowered without
+locking anyone out; hashes migrate as users log in.
+
+Pool processes are started with ``spawn``, which re-imports ``__main__``;
+entry points must use the ``if __name__ == "__main__"`` guard (uvicorn does).
+"""
+
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import bcrypt
+from fastapi import HTTPException, status
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+def hash_secret(secret: str, rounds: int | None = None) -> str:
+    """Hash a PIN or password with the configured bcrypt cost."""
+    salt = bcrypt.gensalt(rounds or settings.bcrypt_rounds)
+    return bcrypt.hashpw(secret.encode("utf-8"), salt).decode("utf-8")
+
+
+def verify_secret(secret: str, hashed: str) -> bool:
+    """Check a PIN or password against a bcrypt hash."""
+    return bcrypt.checkpw(secret.encode("utf-8"), hashed.encode("utf-8"))
+
+
+# Scheme written by hash_secret; older idents ($2a$, $2y$) are verified but upgraded
+CURRENT_IDENT = "2b"
+
+
+def hash_policy(hashed: str) -> tuple[str, int] | None:
+    """(ident, cost) from a bcrypt hash like ``$2b$12$...``, None if unparseable."""
+    parts = hashed.split("$")
+    if len(parts) < 4 or parts[0] != "":
+        return None
+    try:
+        return parts[1], int(parts[2])
+    except ValueError:
+        return None
+
+
+def needs_rehash(hashed: str) -> bool:
+    """Whether a stored hash differs from the current policy."""
+    return hash_policy(hashed) != (CURRENT_IDENT, settings.bcrypt_rounds)
+
+
+class HashingPool:
+    """Bounded executor for bcrypt calls with an in-flight counter."""
+
+    def __init__(self, workers: int, queue_limit: int):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        self._executor: Executor | None = None
+
+    @property
+    def queue_depth(self) -> int:
+        """Calls waiting for a free worker."""
+        return max(self.in_flight - max(self.workers, 1), 0)
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.workers > 0:
+                    # spawn: forking a process that already runs threads is unsafe
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                else:
+                    # HASH_WORKERS=0: dedicated threads (bcrypt releases the GIL)
+                    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bcrypt")
+            return self._executor
+
+    async def run(self, func, *args):
+        with self._lock:
+            if self.in_flight >= self.queue_limit:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Server ausgelastet, bitte gleich erneut versuchen",
+                    headers={"Retry-After": "1"},
+                )
+            self.in_flight += 1
+        executor = self._get_executor()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, func, *args)
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool for the next call
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            raise
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+hashing_pool = HashingPool(settings.hash_workers, settings.hash_queue_limit)
+
+
+async def hash_secret_async(secret: str) -> str:
+    return await hashing_pool.run(hash_secret, secret, settings.bcrypt_rounds)
+
+
+async def verify_secret_async(secret: str, hashed: str) -> bool:
+    return await hashing_pool.run(verify_secret, secret, hashed)
@@ -1,6 +1,11 @@
 """Login code generator for child-friendly authentication codes.
 
 Generates codes in format: TIER-FARBE-NN (e.g., TIGER-BLAU-42)
+
+The word lists below define the keyspace (40 animals x 16 colors x 90
+numbers = 57,600 codes for the default style). ``extend_word_lists`` adds
+words at startup or in scripts to grow it; uniqueness is enforced by the
+database (see ``app.services.login_codes``).
 """
 
 import random
@@ -28,6 +33,37 @@ ADJECTIVES = [
     "SANFT", "GROSS", "KLEIN", "FRECH", "SCHLAU", "TAPFER", "FLOTT", "FIX",
 ]
 
+NUMBER_COUNT = 90  # 10-99, always two digits
+
+STYLES = ("animal-color", "animal-adjective", "adjective-animal")
+
+
+def _add_words(target: list[str], words) -> int:
+    added = 0
+    for word in words:
+        word = normalize_code(word)
+        if not word.isalpha():
+            raise ValueError(f"Invalid code word: {word!r}")
+        if word not in target:
+            target.append(word)
+            added += 1
+    return added
+
+
+def extend_word_lists(animals=(), colors=(), adjectives=()) -> int:
+    """Add words to the code lists (uppercase, letters only).
+
+    Existing codes stay valid; only new codes can use the added words.
+    Returns the number of words actually added.
+    """
+    return _add_words(ANIMALS, animals) + _add_words(COLORS, colors) + _add_words(ADJECTIVES, adjectives)
+
+
+def keyspace_size(style: str = "animal-color") -> int:
+    """Number of distinct codes a style can produce."""
+    second = COLORS if style == "animal-color" else ADJECTIVES
+    return len(ANIMALS) * len(second) * NUMBER_COUNT
+
 
 def generate_login_code(style: str = "animal-color") -> str:
     """Generate a unique, readable login code.
@@ -38,7 +74,7 @@ def generate_login_code(style: str = "animal-color") -> str:
     Returns:
         A code like "TIGER-BLAU-42"
     """
-    number = secrets.randbelow(90) + 10  # 10-99
+    number = secrets.randbelow(NUMBER_COUNT) + 10  # 10-99
 
     if style == "animal-adjective":
         word1 = secrets.choice(ANIMALS)
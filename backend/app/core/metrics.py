@@ -0,0 +1,230 @@
+"""Request and database instrumentation, exported at ``/metrics``.
+
+Three parts:
+
+- ``MetricsMiddleware`` (ASGI) times every request and records latency and
+  response size per route template (``/tasks/{task_id}``, not the raw path),
+  method and status.
+- ``instrument_engine`` hooks the SQLAlchemy engine: each query adds to the
+  counters of the current request (a context variable, which Starlette
+  copies into the threadpool for sync endpoints). Queries slower than
+  ``SLOW_QUERY_MS`` are logged with their statement.
+- The middleware adds a ``Server-Timing`` header (``app``, ``db`` with the
+  query count) so browser dev tools show the split per request.
+
+``render_metrics`` writes everything in the Prometheus text format. Values
+are per process; with several uvicorn workers each scrape hits one of them.
+"""
+
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger("app.db.slow_query")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+MAX_LOGGED_STATEMENT = 1000
+
+
+@dataclass
+class RequestStats:
+    """DB work done while serving one request."""
+
+    queries: int = 0
+    db_seconds: float = 0.0
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+class Histogram:
+    """Cumulative histogram per label set, thread-safe."""
+
+    def __init__(self, name: str, help_text: str, buckets: tuple, label_names: tuple[str, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.label_names = label_names
+        self._lock = threading.Lock()
+        self._series: dict[tuple, list] = {}  # labels -> [bucket counts..., sum, count]
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((labels, list(series)) for labels, series in self._series.items())
+        for labels, series in items:
+            base = _format_labels(self.label_names, labels)
+            for bound, count in zip(self.buckets, series):
+                lines.append(f"{self.name}_bucket{_with_le(base, bound)} {count}")
+            lines.append(f"{self.name}_bucket{_with_le(base, '+Inf')} {series[-1]}")
+            lines.append(f"{self.name}_sum{base} {series[-2]}")
+            lines.append(f"{self.name}_count{base} {series[-1]}")
+        return lines
+
+
+class Counter:
+    """Monotonic counter per label set, thread-safe."""
+
+    def __init__(self, name: str, help_text: str, label_names: tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._lock = threading.Lock()
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {value}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+def _with_le(base: str, bound) -> str:
+    le = f'le="{bound}"'
+    return "{" + le + "}" if not base else base[:-1] + "," + le + "}"
+
+
+ROUTE_LABELS = ("method", "route", "status")
+
+request_duration = Histogram(
+    "http_request_duration_seconds", "Request latency", LATENCY_BUCKETS, ROUTE_LABELS
+)
+response_size = Histogram(
+    "http_response_size_bytes", "Response body size", SIZE_BUCKETS, ROUTE_LABELS
+)
+request_queries = Histogram(
+    "db_queries_per_request", "SQL statements per request", QUERY_BUCKETS, ("method", "route")
+)
+request_db_time = Histogram(
+    "db_time_per_request_seconds", "Time spent in SQL per request", LATENCY_BUCKETS, ("method", "route")
+)
+queries_total = Counter("db_queries_total", "SQL statements executed (incl. jobs)")
+slow_queries_total = Counter("db_slow_queries_total", "SQL statements slower than SLOW_QUERY_MS")
+
+METRICS = (request_duration, response_size, request_queries, request_db_time, queries_total, slow_queries_total)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count and time every statement of this engine."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        queries_total.inc()
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += elapsed
+        if elapsed * 1000 >= settings.slow_query_ms:
+            slow_queries_total.inc()
+            logger.warning("Slow query (%.1f ms): %s", elapsed * 1000, statement[:MAX_LOGGED_STATEMENT])
+
+
+def _route_label(scope) -> str:
+    """Route template of the request, e.g. ``/tasks/{task_id}``."""
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    path = scope.get("path", "")
+    regex = getattr(route, "path_regex", None)
+    if regex is not None and regex.match(path):
+        return route.path_format
+    # Route object without the router prefix: put the parameter names back
+    names = {str(value): name for name, value in scope.get("path_params", {}).items()}
+    return "/".join(f"{{{names[part]}}}" if part in names else part for part in path.split("/"))
+
+
+class MetricsMiddleware:
+    """Record latency, size and DB work per request; add ``Server-Timing``."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        start = time.perf_counter()
+        status_code = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status_code, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                timing = (
+                    f'app;dur={elapsed_ms:.1f}, '
+                    f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries"'
+                )
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"server-timing", timing.encode())]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_stats.reset(token)
+            method = scope["method"]
+            route = _route_label(scope)
+            labels = (method, route, str(status_code))
+            request_duration.observe(time.perf_counter() - start, *labels)
+            response_size.observe(size, *labels)
+            request_queries.observe(stats.queries, method, route)
+            request_db_time.observe(stats.db_seconds, method, route)
+
+
+def render_metrics(extra_gauges: dict[str, tuple[str, float]] | None = None) -> str:
+    """All metrics in Prometheus text format; gauges as {name: (help, value)}."""
+    lines: list[str] = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    for name, (help_text, value) in (extra_gauges or {}).items():
+        lines.extend([f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {value}"])
+    return "\n".join(lines) + "\n"
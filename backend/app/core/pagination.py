@@ -0,0 +1,157 @@
+"""Keyset (cursor) pagination over (created_at, id) or another sort column.
+
+List endpoints return a JSON array as before and expose the cursor of the
+next page in the ``X-Next-Cursor`` response header. The cursor is opaque to
+clients: a base64url-encoded (sort value, id) pair of the last row. Admin
+lists also send the number of matching rows in ``X-Total-Count``.
+
+Sort columns must be non-nullable; id breaks ties.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Iterator
+
+from fastapi import HTTPException, Query, Response, status
+from pydantic import BaseModel
+from sqlalchemy import DateTime, Select, and_, func, or_, select
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+STREAM_CHUNK_SIZE = 500
+
+
+class PageParams:
+    """Query parameters shared by cursor-paginated endpoints."""
+
+    def __init__(
+        self,
+        cursor: str | None = Query(default=None, description="Cursor aus X-Next-Cursor"),
+        limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Max results"),
+    ):
+        self.cursor = cursor
+        self.limit = limit
+
+
+class SortKey:
+    """Column and direction a list is ordered by (id breaks ties)."""
+
+    def __init__(self, column: Any, descending: bool = True):
+        self.column = column
+        self.descending = descending
+
+    @property
+    def is_datetime(self) -> bool:
+        return isinstance(self.column.type, DateTime)
+
+
+def parse_sort(model: Any, sort: str, allowed: tuple[str, ...]) -> SortKey:
+    """Parse ``"name"`` / ``"-created_at"`` into a SortKey of ``model``."""
+    field = sort.lstrip("-")
+    if field not in allowed:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Ungültige Sortierung")
+    return SortKey(getattr(model, field), descending=sort.startswith("-"))
+
+
+def _sort_key(model: Any, key: SortKey | None) -> SortKey:
+    return key or SortKey(model.created_at)
+
+
+def encode_cursor(value: Any, row_id: int) -> str:
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([value, row_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, parse_datetime: bool = True) -> tuple[Any, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        if parse_datetime:
+            value = datetime.fromisoformat(value)
+        return value, int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Ungültiger Cursor")
+
+
+def keyset_order(stmt: Select, model: Any, key: SortKey | None = None) -> Select:
+    """Order by the sort key (newest first by default), with id as tie-breaker."""
+    key = _sort_key(model, key)
+    if key.descending:
+        return stmt.order_by(key.column.desc(), model.id.desc())
+    return stmt.order_by(key.column.asc(), model.id.asc())
+
+
+def _after_key(stmt: Select, model: Any, value: Any, row_id: int, key: SortKey | None = None) -> Select:
+    key = _sort_key(model, key)
+    if key.descending:
+        return stmt.where(or_(key.column < value, and_(key.column == value, model.id < row_id)))
+    return stmt.where(or_(key.column > value, and_(key.column == value, model.id > row_id)))
+
+
+def after_cursor(stmt: Select, model: Any, cursor: str | None, key: SortKey | None = None) -> Select:
+    """Restrict an ordered query to rows after the given cursor."""
+    if not cursor:
+        return stmt
+    value, row_id = decode_cursor(cursor, parse_datetime=_sort_key(model, key).is_datetime)
+    return _after_key(stmt, model, value, row_id, key)
+
+
+def set_total_count(db: Session, stmt: Select, response: Response) -> int:
+    """Count the rows matching ``stmt`` (before paging) into ``X-Total-Count``."""
+    total = db.scalar(select(func.count()).select_from(stmt.order_by(None).subquery())) or 0
+    response.headers[TOTAL_COUNT_HEADER] = str(total)
+    return total
+
+
+def paginate(
+    db: Session,
+    stmt: Select,
+    model: Any,
+    page: PageParams,
+    response: Response,
+    key: SortKey | None = None,
+    scalars: bool = True,
+) -> list:
+    """Fetch one page of ``model`` rows and set the next-page cursor header.
+
+    With ``scalars=False`` the full result rows are returned (for statements
+    selecting extra columns); ``model`` must then be the first entity.
+    """
+    stmt = keyset_order(after_cursor(stmt, model, page.cursor, key), model, key).limit(page.limit + 1)
+    result = db.execute(stmt)
+    rows = result.scalars().all() if scalars else result.all()
+    if len(rows) > page.limit:
+        rows = rows[: page.limit]
+        last = rows[-1] if scalars else rows[-1][0]
+        column = _sort_key(model, key).column
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(getattr(last, column.key), last.id)
+    return rows
+
+
+def iter_ndjson(stmt: Select, model: Any, schema: type[BaseModel]) -> Iterator[str]:
+    """Yield every row of a newest-first query as NDJSON, page by page.
+
+    Uses its own session because the request session is closed once the
+    streaming response starts.
+    """
+    db = SessionLocal()
+    try:
+        page_stmt = stmt
+        while True:
+            rows = db.execute(keyset_order(page_stmt, model).limit(STREAM_CHUNK_SIZE)).scalars().all()
+            for row in rows:
+                yield schema.model_validate(row).model_dump_json() + "\n"
+            if len(rows) < STREAM_CHUNK_SIZE:
+                break
+            page_stmt = _after_key(stmt, model, rows[-1].created_at, rows[-1].id)
+            db.expunge_all()
+    finally:
+        db.close()
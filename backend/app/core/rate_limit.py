@@ -1,4 +1,171 @@
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+"""Rate limiting for the auth endpoints, shared by all workers.
 
-limiter = Limiter(key_func=get_remote_address)
+Each key (endpoint scope + client IP, and optionally endpoint scope +
+family code, login code or email from the request body) owns a token
+bucket stored as one row of ``rate_limit_buckets``: the tokens left and
+the time of the last refill.
+A request refills the bucket for the elapsed time and takes one token in a
+single ``INSERT ... ON CONFLICT DO UPDATE ... WHERE tokens >= 1 RETURNING``;
+no returned row means the bucket is empty. Counters therefore survive
+restarts and are not multiplied by the number of uvicorn workers.
+
+The IP bucket stops one client from guessing; the credential buckets
+(keyed by the value alone) stop a guess distributed over many IPs. A
+credential bucket is shared by everyone using that credential, e.g. all
+devices of a family behind one NAT, so it gets its own, looser
+``rate_per_value``.
+
+Usage (the endpoint needs a ``request: Request`` parameter; async endpoints
+run the check in the threadpool)::
+
+    @limiter.limit("5/minute", body_keys=("family_code",), rate_per_value="30/minute")
+    def login_pin(request: Request, payload: PinLoginRequest, ...):
+"""
+
+import inspect
+import math
+import time
+from functools import wraps
+from typing import Any, Callable, Iterable
+
+from fastapi import HTTPException, Request, status
+from sqlalchemy import case
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.db.session import SessionLocal
+from app.models.rate_limit import RateLimitBucket
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+def parse_rate(rate: str) -> tuple[int, float]:
+    """Parse "5/minute" into (capacity, refill tokens per second)."""
+    count, period = rate.split("/")
+    capacity = int(count)
+    return capacity, capacity / PERIODS[period.strip().rstrip("s")]
+
+
+def take_token(db: Session, key: str, capacity: int, refill_rate: float, now: float | None = None) -> float:
+    """Take one token from a bucket.
+
+    Returns 0 if the request is allowed, otherwise the seconds until the
+    next token is available.
+    """
+    now = time.time() if now is None else now
+    dialect = db.get_bind().dialect.name
+
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+        refilled = RateLimitBucket.tokens + (now - RateLimitBucket.updated_at) * refill_rate
+        refilled = case((refilled > capacity, capacity), else_=refilled)
+        stmt = insert(RateLimitBucket).values(key=key, tokens=capacity - 1, updated_at=now)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[RateLimitBucket.key],
+            set_={"tokens": refilled - 1, "updated_at": now},
+            where=refilled >= 1,
+        )
+        allowed = db.execute(stmt.returning(RateLimitBucket.tokens)).first() is not None
+        db.commit()
+        if allowed:
+            return 0
+        bucket = db.get(RateLimitBucket, key)
+        tokens = bucket.tokens + (now - bucket.updated_at) * refill_rate
+    else:
+        bucket = db.get(RateLimitBucket, key, with_for_update=True)
+        if not bucket:
+            bucket = RateLimitBucket(key=key, tokens=capacity, updated_at=now)
+            db.add(bucket)
+        tokens = min(capacity, bucket.tokens + (now - bucket.updated_at) * refill_rate)
+        if tokens >= 1:
+            bucket.tokens = tokens - 1
+            bucket.updated_at = now
+        db.commit()
+        if tokens >= 1:
+            return 0
+    return max((1 - tokens) / refill_rate, 0.001)
+
+
+def purge_full_buckets(db: Session, max_refill_seconds: float = 86400) -> int:
+    """Delete buckets untouched long enough to be full again (same as no row)."""
+    deleted = db.query(RateLimitBucket).filter(
+        RateLimitBucket.updated_at < time.time() - max_refill_seconds
+    ).delete(synchronize_session=False)
+    db.commit()
+    return deleted
+
+
+def _client_ip(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+class Limiter:
+    """Decorator factory for DB-backed per-key rate limits."""
+
+    def keys_for(self, scope: str, request: Request, payload: Any, body_keys: Iterable[str]) -> list[str]:
+        """The IP key first, then one key per credential value in the body."""
+        keys = [f"{scope}:ip:{_client_ip(request)}"]
+        for field in body_keys:
+            value = getattr(payload, field, None)
+            if value:
+                keys.append(f"{scope}:{field}:{str(value).strip().upper()}")
+        return keys
+
+    def check(
+        self,
+        scope: str,
+        rate: str,
+        request: Request,
+        payload: Any = None,
+        body_keys: Iterable[str] = (),
+        rate_per_value: str | None = None,
+    ) -> None:
+        """Raise 429 if any bucket of this request is empty."""
+        ip_key, *value_keys = self.keys_for(scope, request, payload, body_keys)
+        db = SessionLocal()
+        try:
+            retry_after = max(
+                [take_token(db, ip_key, *parse_rate(rate))]
+                + [take_token(db, key, *parse_rate(rate_per_value or rate)) for key in value_keys]
+            )
+        finally:
+            db.close()
+        if retry_after:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Zu viele Versuche. Bitte warte kurz.",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
+    def limit(self, rate: str, body_keys: Iterable[str] = (), rate_per_value: str | None = None) -> Callable:
+        """Limit an endpoint by client IP (``rate``) and by each given field of its ``payload``.
+
+        The field buckets use ``rate_per_value`` (default: ``rate``).
+        """
+        body_keys = tuple(body_keys)
+
+        def decorator(func: Callable) -> Callable:
+            scope = func.__name__
+
+            if inspect.iscoroutinefunction(func):
+                @wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    # The check does blocking DB I/O
+                    await run_in_threadpool(
+                        self.check, scope, rate, kwargs["request"], kwargs.get("payload"), body_keys, rate_per_value
+                    )
+                    return await func(*args, **kwargs)
+                return async_wrapper
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                self.check(scope, rate, kwargs["request"], kwargs.get("payload"), body_keys, rate_per_value)
+                return func(*args, **kwargs)
+            return wrapper
+
+        return decorator
+
+
+limiter = Limiter()
@@ -0,0 +1,48 @@
+"""Fast JSON rendering for routes without a response model.
+
+Routes with a ``response_model`` are already serialized to JSON bytes by
+Pydantic's core, and FastAPI only takes that path while the route keeps the
+default response class, so nothing changes for them. Untyped routes
+(``/stats/*`` build plain dicts) otherwise go through ``jsonable_encoder``
+and ``json.dumps``; returning a ``FastJSONResponse`` skips both.
+
+Uses ``orjson`` when installed (``pip install .[fast-json]``) and compact
+stdlib JSON otherwise; both handle datetimes, dates and Decimals.
+"""
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional, stdlib fallback
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize to compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with ``dumps`` (return it directly from the route)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,29 @@
+"""Normalized search keys for admin lookups.
+
+Names and emails are stored once more in a lowercase, accent-free form
+(``users.search_text``) so a search is a plain ``LIKE`` on one column; on
+PostgreSQL a trigram index on that column serves ``%term%`` lookups.
+"""
+
+import unicodedata
+
+# Before accent stripping, so "Jürgen" is stored (and searched) as "juergen"
+_TRANSLITERATE = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+
+
+def normalize_search(*parts: str | None) -> str:
+    """Lowercase, transliterate umlauts and drop other accents; join parts with spaces."""
+    text = " ".join(part for part in parts if part).casefold().translate(_TRANSLITERATE)
+    text = unicodedata.normalize("NFKD", text)
+    return " ".join("".join(ch for ch in text if not unicodedata.combining(ch)).split())
+
+
+LIKE_ESCAPE = "!"
+
+
+def like_pattern(term: str) -> str:
+    """``%term%`` for a normalized search term; use with ``escape=LIKE_ESCAPE``."""
+    escaped = normalize_search(term)
+    for char in (LIKE_ESCAPE, "%", "_"):
+        escaped = escaped.replace(char, LIKE_ESCAPE + char)
+    return f"%{escaped}%"
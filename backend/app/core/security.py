@@ -1,13 +1,17 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
-import bcrypt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
+from app.core.hashing import hash_secret, hash_secret_async, verify_secret, verify_secret_async
 from app.db.session import get_db
 from app.models.user import User
 
@@ -16,21 +20,120 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
 def verify_pin(plain_pin: str, hashed_pin: str) -> bool:
-    return bcrypt.checkpw(plain_pin.encode("utf-8"), hashed_pin.encode("utf-8"))
+    return verify_secret(plain_pin, hashed_pin)
 
 
 def hash_pin(pin: str) -> str:
-    return bcrypt.hashpw(pin.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    return hash_secret(pin)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
-    return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
+    return verify_secret(plain_password, hashed_password)
 
 
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt."""
-    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    return hash_secret(password)
+
+
+# Async variants for request handlers: bcrypt runs in the hashing pool
+async def verify_pin_async(plain_pin: str, hashed_pin: str) -> bool:
+    return await verify_secret_async(plain_pin, hashed_pin)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await verify_secret_async(plain_password, hashed_password)
+
+
+async def hash_pin_async(pin: str) -> str:
+    return await hash_secret_async(pin)
+
+
+async def hash_password_async(password: str) -> str:
+    return await hash_secret_async(password)
+
+
+class JoseBackend:
+    """HS256 via python-jose (default)."""
+
+    def encode(self, claims: dict[str, Any], key: str) -> str:
+        return jwt.encode(claims, key, algorithm="HS256")
+
+    def decode(self, token: str, key: str) -> dict[str, Any]:
+        return jwt.decode(token, key, algorithms=["HS256"])
+
+
+class PyJWTBackend:
+    """HS256 via PyJWT (optional, ``pip install .[fast-jwt]``); noticeably less overhead per call."""
+
+    def __init__(self):
+        import jwt as pyjwt
+
+        self._jwt = pyjwt
+
+    def encode(self, claims: dict[str, Any], key: str) -> str:
+        return self._jwt.encode(claims, key, algorithm="HS256")
+
+    def decode(self, token: str, key: str) -> dict[str, Any]:
+        try:
+            return self._jwt.decode(token, key, algorithms=["HS256"])
+        except self._jwt.PyJWTError as exc:
+            # Callers only know python-jose's error type
+            raise JWTError(str(exc)) from exc
+
+
+JWT_BACKENDS = {"jose": JoseBackend, "pyjwt": PyJWTBackend}
+
+
+class TokenCache:
+    """Bounded LRU of verified token digests -> claims.
+
+    Polling clients present the same access token many times a minute; a
+    hit skips signature verification and claims parsing. Entries are only
+    returned while their ``exp`` lies in the future, so expiry behaves as
+    without the cache.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[bytes, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> dict[str, Any] | None:
+        digest = self._digest(token)
+        with self._lock:
+            claims = self._entries.get(digest)
+            if claims is None:
+                return None
+            exp = claims.get("exp")
+            if exp is not None and exp <= time.time():
+                del self._entries[digest]
+                return None
+            self._entries.move_to_end(digest)
+            return dict(claims)
+
+    def put(self, token: str, claims: dict[str, Any]) -> None:
+        if self.maxsize <= 0:
+            return
+        digest = self._digest(token)
+        with self._lock:
+            self._entries[digest] = dict(claims)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+jwt_backend = JWT_BACKENDS[settings.jwt_backend]()
+token_cache = TokenCache(settings.jwt_cache_size)
 
 
 def create_access_token(data: dict[str, Any], expires_minutes: int | None = None) -> str:
@@ -42,7 +145,7 @@ def create_access_token(data: dict[str, Any], expires_minutes: int | None = None
         minutes=expires_minutes or settings.access_token_expire_minutes
     )
     to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, settings.secret_key, algorithm="HS256")
+    return jwt_backend.encode(to_encode, settings.secret_key)
 
 
 def create_refresh_token(data: dict[str, Any], expires_days: int | None = None) -> str:
@@ -54,11 +157,15 @@ def create_refresh_token(data: dict[str, Any], expires_days: int | None = None)
         days=expires_days or settings.refresh_token_expire_days
     )
     to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, settings.secret_key, algorithm="HS256")
+    return jwt_backend.encode(to_encode, settings.secret_key)
 
 
 def decode_token(token: str) -> dict[str, Any]:
-    return jwt.decode(token, settings.secret_key, algorithms=["HS256"])
+    claims = token_cache.get(token)
+    if claims is None:
+        claims = jwt_backend.decode(token, settings.secret_key)
+        token_cache.put(token, claims)
+    return claims
 
 
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
@@ -0,0 +1,138 @@
+"""Hashed, precompressed static assets for the admin dashboard.
+
+Sources live in ``app/admin_ui``. ``build_assets`` copies every file to
+``app/static/admin`` under a content-hashed name (``admin.3f2a9c1b07.js``),
+rewrites the references in ``index.html`` and writes ``.gz`` siblings (and
+``.br`` ones when the optional ``brotli`` package is installed).
+
+``PrecompressedStaticFiles`` serves those siblings directly when the client
+accepts them, so nothing is compressed per request. Hashed files never
+change, so they get a one-year ``immutable`` Cache-Control; ``index.html``
+is always revalidated against its ETag and picks up new hashes after a
+deploy.
+
+The Docker image builds the assets (``scripts/build_admin_assets.py``);
+``ensure_assets`` rebuilds on startup when the sources are newer, which
+keeps local development working without a build step.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import re
+import shutil
+import stat
+from pathlib import Path
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.staticfiles import StaticFiles
+
+try:
+    import brotli
+except ImportError:  # optional, gzip only
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+APP_DIR = Path(__file__).resolve().parent.parent
+SOURCE_DIR = APP_DIR / "admin_ui"
+BUILD_DIR = APP_DIR / "static" / "admin"
+ADMIN_ASSETS_PATH = "/admin/assets"
+INDEX_FILE = "index.html"
+MANIFEST_FILE = "manifest.json"
+
+HASH_LENGTH = 10
+COMPRESS_MIN_SIZE = 512  # smaller files are not worth a compressed copy
+HASHED_CACHE_CONTROL = "public, max-age=31536000, immutable"
+INDEX_CACHE_CONTROL = "no-cache"
+# Preferred first
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+_REFERENCE = re.compile(r'(href|src)="([^"/:]+)"')
+
+
+def _hashed_name(path: Path, content: bytes) -> str:
+    digest = hashlib.sha256(content).hexdigest()[:HASH_LENGTH]
+    return f"{path.stem}.{digest}{path.suffix}"
+
+
+def _write_compressed(path: Path, content: bytes) -> None:
+    if len(content) < COMPRESS_MIN_SIZE:
+        return
+    path.with_name(path.name + ".gz").write_bytes(gzip.compress(content, compresslevel=9, mtime=0))
+    if brotli is not None:
+        path.with_name(path.name + ".br").write_bytes(brotli.compress(content, quality=11))
+
+
+def build_assets(source: Path = SOURCE_DIR, dest: Path = BUILD_DIR) -> dict[str, str]:
+    """Write hashed and precompressed copies of ``source`` to ``dest``.
+
+    Returns the manifest (source name -> URL), which is also stored in
+    ``dest/manifest.json``.
+    """
+    if dest.exists():
+        shutil.rmtree(dest)
+    dest.mkdir(parents=True)
+
+    manifest: dict[str, str] = {}
+    for path in sorted(source.iterdir()):
+        if not path.is_file() or path.name == INDEX_FILE:
+            continue
+        content = path.read_bytes()
+        name = _hashed_name(path, content)
+        (dest / name).write_bytes(content)
+        _write_compressed(dest / name, content)
+        manifest[path.name] = f"{ADMIN_ASSETS_PATH}/{name}"
+
+    def replace(match: re.Match) -> str:
+        attribute, name = match.groups()
+        return f'{attribute}="{manifest.get(name, name)}"'
+
+    index = _REFERENCE.sub(replace, (source / INDEX_FILE).read_text(encoding="utf-8")).encode()
+    (dest / INDEX_FILE).write_bytes(index)
+    _write_compressed(dest / INDEX_FILE, index)
+
+    (dest / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2) + "\n")
+    return manifest
+
+
+def ensure_assets(source: Path = SOURCE_DIR, dest: Path = BUILD_DIR) -> None:
+    """Build the assets if missing or older than their sources."""
+    manifest = dest / MANIFEST_FILE
+    if manifest.exists():
+        built = manifest.stat().st_mtime
+        if all(path.stat().st_mtime <= built for path in source.iterdir()):
+            return
+    logger.info("Building admin assets in %s", dest)
+    build_assets(source, dest)
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that prefers ``.br``/``.gz`` siblings and sets caching headers."""
+
+    async def get_response(self, path: str, scope):
+        accepted = Headers(scope=scope).get("accept-encoding", "")
+        response = None
+        for encoding, suffix in ENCODINGS:
+            if encoding not in accepted:
+                continue
+            full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path + suffix)
+            if stat_result is not None and stat.S_ISREG(stat_result.st_mode):
+                # Media type is guessed from the name without the suffix
+                response = self.file_response(full_path, stat_result, scope)
+                if response.status_code == 200:
+                    response.headers["content-encoding"] = encoding
+                break
+        if response is None:
+            response = await super().get_response(path, scope)
+
+        if response.status_code in (200, 304):
+            is_index = Path(path).name == INDEX_FILE
+            response.headers["cache-control"] = INDEX_CACHE_CONTROL if is_index else HASHED_CACHE_CONTROL
+            response.headers["vary"] = "Accept-Encoding"
+        return response
+
+
+admin_assets = PrecompressedStaticFiles(directory=BUILD_DIR, check_dir=False)
@@ -1,14 +1,22 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import get_settings
+from app.core.metrics import instrument_engine
+from app.services.change_tracking import track_changes
+from app.services.ledger_balances import track_ledger_balances
+from app.services.stats import track_stats
 
 settings = get_settings()
 
 connect_args = {"check_same_thread": False} if settings.database_url.startswith("sqlite") else {}
 
 engine = create_engine(settings.database_url, connect_args=connect_args, future=True)
+instrument_engine(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
+event.listen(SessionLocal, "before_flush", track_changes)
+event.listen(SessionLocal, "before_flush", track_stats)
+event.listen(SessionLocal, "before_flush", track_ledger_balances)
 
 
 def get_db():
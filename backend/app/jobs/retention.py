@@ -9,6 +9,10 @@ from app.models.submission import Submission
 from app.models.user import User
 from app.models.family import FamilyMember
 from app.models.ledger import TanLedger
+from app.services.activity import purge_activity_events
+from app.services.archive import archive_history, delete_archived
+from app.services.idempotency import purge_idempotency_keys
+from app.services.ledger_balances import check_ledger_balances
 from app.services.photos import cleanup_expired, stream_photo
 
 logger = logging.getLogger(__name__)
@@ -87,6 +91,7 @@ def clean_inactive_users(db: Session, inactive_days: int = 90) -> List[str]:
             db.query(FamilyMember).filter(FamilyMember.user_id == user.id).delete()
             db.query(Submission).filter(Submission.child_id == user.id).delete()
             db.query(TanLedger).filter(TanLedger.child_id == user.id).delete()
+            delete_archived(db, user.id)
 
             # Delete the user
             db.delete(user)
@@ -100,3 +105,37 @@ def clean_inactive_users(db: Session, inactive_days: int = 90) -> List[str]:
         db.commit()
 
     return deleted
+
+
+def clean_activity_events(db: Session) -> int:
+    """Apply the activity log retention (age and row cap). Returns deleted rows."""
+    deleted = purge_activity_events(db)
+    if deleted:
+        logger.info(f"[retention] Purged {deleted} activity events")
+    return deleted
+
+
+def clean_idempotency_keys(db: Session) -> int:
+    """Drop expired idempotency keys. Returns deleted rows."""
+    deleted = purge_idempotency_keys(db)
+    if deleted:
+        logger.info(f"[retention] Purged {deleted} idempotency keys")
+    return deleted
+
+
+def archive_settled_history(db: Session) -> dict[str, int]:
+    """Move old paid ledger rows and closed submissions to the archive. Returns moved rows per table."""
+    archived = archive_history(db)
+    if any(archived.values()):
+        logger.info(f"[archive] Archived {archived['ledger']} ledger entries, {archived['submissions']} submissions")
+    return archived
+
+
+def check_balances(db: Session) -> int:
+    """Recompute ledger balances from the raw rows; log and repair drift. Returns drifted keys."""
+    drift = check_ledger_balances(db, fix=True)
+    for entry in drift:
+        logger.warning(f"[ledger] Balance drift: {entry}")
+    if drift:
+        db.commit()
+    return len(drift)
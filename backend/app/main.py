@@ -1,9 +1,13 @@
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
-from slowapi import _rate_limit_exceeded_handler
-from slowapi.errors import RateLimitExceeded
 
-from app.core.rate_limit import limiter
+from app.core.compression import CompressionMiddleware
+from app.core.delta import CHANGE_VERSION_HEADER
+from app.core.hashing import hashing_pool
+from app.core.metrics import MetricsMiddleware
+from app.core.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER
+from app.core.rate_limit import purge_full_buckets
+from app.core.static_assets import ADMIN_ASSETS_PATH, admin_assets, ensure_assets
 from app.api.routes.health import router as health_router
 from app.api.routes.tasks import router as tasks_router
 from app.api.routes.submissions import router as submissions_router
@@ -19,9 +23,22 @@ from app.api.routes.achievements import router as achievements_router
 from app.api.routes.templates import router as templates_router
 from app.api.routes.families import router as families_router
 from app.api.routes.admin import router as admin_router
+from app.api.routes.events import router as events_router
+from app.api.routes.metrics import router as metrics_router
 from fastapi.middleware.cors import CORSMiddleware
 from app.db.session import SessionLocal
-from app.jobs.retention import clean_expired_photos, clean_inactive_users
+from app.services.events import event_bus
+from app.services.idempotency import REPLAY_HEADER
+from app.services.providers import provider_pipeline
+from app.services.stats import rebuild_daily_stats, refresh_snapshot
+from app.jobs.retention import (
+    archive_settled_history,
+    check_balances,
+    clean_activity_events,
+    clean_expired_photos,
+    clean_idempotency_keys,
+    clean_inactive_users,
+)
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from app.core.config import get_settings
 
@@ -34,10 +51,6 @@ def create_app() -> FastAPI:
         redirect_slashes=False,  # Prevent 307 redirects that lose Auth headers
     )
 
-    # Rate limiting
-    app.state.limiter = limiter
-    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
     scheduler = AsyncIOScheduler()
 
     # Routers
@@ -56,6 +69,12 @@ def create_app() -> FastAPI:
     app.include_router(templates_router, prefix="/templates", tags=["templates"])
     app.include_router(families_router, prefix="/families", tags=["families"])
     app.include_router(admin_router, prefix="/admin", tags=["admin"])
+    app.include_router(events_router, prefix="/events", tags=["events"])
+    app.include_router(metrics_router, prefix="/metrics", tags=["metrics"])
+
+    # Admin dashboard assets (hashed names, precompressed)
+    ensure_assets()
+    app.mount(ADMIN_ASSETS_PATH, admin_assets, name="admin-assets")
 
     # CORS for web/desktop
     app.add_middleware(
@@ -64,7 +83,12 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, "ETag", CHANGE_VERSION_HEADER, "Server-Timing", REPLAY_HEADER],
     )
+    # brotli/gzip above GZIP_MIN_SIZE; skips precompressed assets and event streams
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.gzip_min_size)
+    # Outermost: timings include CORS handling
+    app.add_middleware(MetricsMiddleware)
 
     @app.on_event("startup")
     async def startup_event():
@@ -84,8 +108,64 @@ def create_app() -> FastAPI:
             id="inactive-user-cleanup",
             replace_existing=True,
         )
+        # Daily activity log retention at 04:30
+        scheduler.add_job(
+            lambda: run_activity_cleanup(),
+            trigger="cron",
+            hour=4,
+            minute=30,
+            id="activity-retention",
+            replace_existing=True,
+        )
+        # Daily ledger balance consistency check at 05:00
+        scheduler.add_job(
+            lambda: run_balance_check(),
+            trigger="cron",
+            hour=5,
+            id="ledger-balance-check",
+            replace_existing=True,
+        )
+        # Daily archival of settled ledger rows and closed submissions at 04:45
+        scheduler.add_job(
+            lambda: run_archive_job(),
+            trigger="cron",
+            hour=4,
+            minute=45,
+            id="history-archive",
+            replace_existing=True,
+        )
+        # Hourly cleanup of refilled rate-limit buckets
+        scheduler.add_job(
+            lambda: run_rate_limit_cleanup(),
+            trigger="interval",
+            hours=1,
+            id="rate-limit-cleanup",
+            replace_existing=True,
+        )
+        # Hourly cleanup of expired idempotency keys
+        scheduler.add_job(
+            lambda: run_idempotency_cleanup(),
+            trigger="interval",
+            hours=1,
+            id="idempotency-key-cleanup",
+            replace_existing=True,
+        )
+        # Admin stats: snapshot and the rollups of today/yesterday
+        scheduler.add_job(
+            lambda: run_stats_refresh(),
+            trigger="interval",
+            minutes=settings.stats_refresh_minutes,
+            id="stats-refresh",
+            replace_existing=True,
+        )
         scheduler.start()
 
+    @app.on_event("shutdown")
+    async def shutdown_event():
+        event_bus.stop()
+        hashing_pool.shutdown()
+        provider_pipeline.shutdown()
+
     def run_retention_job():
         db = SessionLocal()
         try:
@@ -104,6 +184,56 @@ def create_app() -> FastAPI:
         finally:
             db.close()
 
+    def run_activity_cleanup():
+        db = SessionLocal()
+        try:
+            deleted = clean_activity_events(db)
+            if deleted:
+                print(f"[retention] purged {deleted} activity events")
+        finally:
+            db.close()
+
+    def run_balance_check():
+        db = SessionLocal()
+        try:
+            drifted = check_balances(db)
+            if drifted:
+                print(f"[ledger] repaired {drifted} drifted balances")
+        finally:
+            db.close()
+
+    def run_archive_job():
+        db = SessionLocal()
+        try:
+            archived = archive_settled_history(db)
+            if any(archived.values()):
+                print(f"[archive] moved {archived['ledger']} ledger entries, {archived['submissions']} submissions")
+        finally:
+            db.close()
+
+    def run_rate_limit_cleanup():
+        db = SessionLocal()
+        try:
+            purge_full_buckets(db)
+        finally:
+            db.close()
+
+    def run_idempotency_cleanup():
+        db = SessionLocal()
+        try:
+            clean_idempotency_keys(db)
+        finally:
+            db.close()
+
+    def run_stats_refresh():
+        db = SessionLocal()
+        try:
+            rebuild_daily_stats(db, days=2)
+            refresh_snapshot(db)
+            db.commit()
+        finally:
+            db.close()
+
     return app
 
 
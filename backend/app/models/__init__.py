@@ -1,26 +1,42 @@
 from app.models.base import Base
 from app.models.user import User
 from app.models.child_profile import ChildProfile
-from app.models.task import Task, TaskTemplate
+from app.models.task import Task, TaskChild, TaskTemplate
 from app.models.submission import Submission
-from app.models.ledger import TanLedger
+from app.models.ledger import LedgerBalance, TanLedger
 from app.models.device import DeviceToken
-from app.models.tan_pool import TanPool
+from app.models.tan_pool import TanPool, TanPoolCounter
 from app.models.family import Family, FamilyMember
 from app.models.device_provider import DeviceProvider, RewardProvider
+from app.models.rate_limit import RateLimitBucket
+from app.models.stats import FamilyDailyStats, StatsSnapshot
+from app.models.activity import ActivityEvent
+from app.models.idempotency import IdempotencyKey
+from app.models.archive import ArchiveRollup, SubmissionArchive, TanLedgerArchive
 
 __all__ = [
     "Base",
     "User",
     "ChildProfile",
     "Task",
+    "TaskChild",
     "TaskTemplate",
     "Submission",
     "TanLedger",
+    "LedgerBalance",
     "DeviceToken",
     "TanPool",
+    "TanPoolCounter",
     "Family",
     "FamilyMember",
     "DeviceProvider",
     "RewardProvider",
+    "RateLimitBucket",
+    "FamilyDailyStats",
+    "StatsSnapshot",
+    "ActivityEvent",
+    "IdempotencyKey",
+    "TanLedgerArchive",
+    "SubmissionArchive",
+    "ArchiveRollup",
 ]
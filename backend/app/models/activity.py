@@ -0,0 +1,24 @@
+from datetime import datetime
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, String
+
+from app.models.base import Base
+
+
+class ActivityEvent(Base):
+    """Append-only activity log entry, see services/activity.py."""
+    __tablename__ = "activity_events"
+
+    id = Column(Integer, primary_key=True)
+    ts = Column(DateTime, default=datetime.utcnow, nullable=False)
+    family_id = Column(Integer, nullable=True)  # no FKs: the log outlives users and families
+    actor_id = Column(Integer, nullable=True)  # user who caused the event
+    type = Column(String(40), nullable=False)  # e.g. login, submission_approved, tan_used
+    subject_id = Column(Integer, nullable=True)  # id of the submission/ledger entry/user concerned
+    payload = Column(JSON, nullable=True)  # few small values for the log message
+
+    # Keyset pagination, overall and per family/type (newest first)
+    __table_args__ = (
+        Index("ix_activity_events_ts", "ts", "id"),
+        Index("ix_activity_events_family_ts", "family_id", "ts", "id"),
+        Index("ix_activity_events_type_ts", "type", "ts", "id"),
+    )
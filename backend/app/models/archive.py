@@ -0,0 +1,55 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Integer, String, Table
+
+from app.models.base import Base
+from app.models.ledger import TanLedger
+from app.models.submission import Submission
+
+
+def _archive_table(source: Table, name: str, *indexes: Index) -> Table:
+    """Same columns as ``source`` (no foreign keys or defaults) plus ``archived_at``."""
+    columns = [
+        Column(column.name, column.type, primary_key=column.primary_key, nullable=column.nullable)
+        for column in source.columns
+    ]
+    return Table(name, Base.metadata, *columns, Column("archived_at", DateTime, nullable=False), *indexes)
+
+
+class TanLedgerArchive(Base):
+    """Settled ledger rows moved out of ``tan_ledger``, see services/archive.py."""
+    __table__ = _archive_table(
+        TanLedger.__table__,
+        "tan_ledger_archive",
+        Index("ix_tan_ledger_archive_child_created", "child_id", "created_at", "id"),
+        Index("ix_tan_ledger_archive_family_created", "family_id", "created_at", "id"),
+    )
+
+
+class SubmissionArchive(Base):
+    """Closed submissions moved out of ``submissions``, see services/archive.py."""
+    __table__ = _archive_table(
+        Submission.__table__,
+        "submissions_archive",
+        Index("ix_submissions_archive_family_created", "family_id", "created_at", "id"),
+        Index("ix_submissions_archive_child_created", "child_id", "created_at", "id"),
+    )
+
+
+class ArchiveRollup(Base):
+    """Totals of the archived rows per family, child, month and device."""
+    __tablename__ = "archive_rollups"
+
+    # Sentinels instead of NULL so the key stays unique: family 0, device ""
+    family_id = Column(Integer, primary_key=True)
+    child_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    month = Column(Date, primary_key=True)  # first day of the month (UTC) the row was created
+    target_device = Column(String(50), primary_key=True)  # ledger device / selected device of submissions
+    submissions = Column(Integer, default=0, nullable=False)
+    submissions_approved = Column(Integer, default=0, nullable=False)
+    ledger_entries = Column(Integer, default=0, nullable=False)
+    ledger_minutes = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # Lifetime totals of one child
+    __table_args__ = (Index("ix_archive_rollups_child", "child_id"),)
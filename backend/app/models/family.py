@@ -16,6 +16,7 @@ class Family(Base):
     invite_expires_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
+    change_version = Column(Integer, default=0, nullable=False)  # bumped on writes, see services/change_tracking.py
 
     # Relationships
     members = relationship("FamilyMember", back_populates="family", cascade="all, delete-orphan")
@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer, String
+
+from app.models.base import Base
+
+
+class IdempotencyKey(Base):
+    """Stored response of a request sent with an ``Idempotency-Key``, see services/idempotency.py."""
+    __tablename__ = "idempotency_keys"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    key = Column(String(100), primary_key=True)  # chosen by the client
+    endpoint = Column(String(100), nullable=False)
+    fingerprint = Column(String(64), nullable=False)  # sha256 of the request parameters
+    status_code = Column(Integer, nullable=False)
+    response = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String
 
 from app.models.base import Base
 
@@ -21,3 +21,27 @@ class TanLedger(Base):
     # Multi-family support
     family_id = Column(Integer, ForeignKey("families.id", ondelete="CASCADE"), nullable=True, index=True)
     provider_type = Column(String(30), nullable=True)  # kisi | family_link | manual
+    change_version = Column(Integer, default=0, nullable=False)  # family version of the last write
+
+    # Keyset pagination per child (newest first), delta sync
+    __table_args__ = (
+        Index("ix_tan_ledger_child_created", "child_id", "created_at", "id"),
+        Index("ix_tan_ledger_family_version", "family_id", "change_version"),
+    )
+
+
+class LedgerBalance(Base):
+    """Running totals of the ledger per family/child/device/provider, see services/ledger_balances.py."""
+    __tablename__ = "ledger_balances"
+
+    # Sentinels instead of NULL so the key stays unique: family 0, device/provider ""
+    family_id = Column(Integer, primary_key=True)
+    child_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    target_device = Column(String(50), primary_key=True)
+    provider_type = Column(String(30), primary_key=True)
+    unpaid_minutes = Column(Integer, default=0, nullable=False)
+    unpaid_count = Column(Integer, default=0, nullable=False)
+    lifetime_minutes = Column(Integer, default=0, nullable=False)  # paid and unpaid
+
+    # Balances of one child across families
+    __table_args__ = (Index("ix_ledger_balances_child", "child_id"),)
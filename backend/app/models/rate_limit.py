@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Float, String
+
+from app.models.base import Base
+
+
+class RateLimitBucket(Base):
+    """Token bucket of one rate-limit key, shared by all workers."""
+    __tablename__ = "rate_limit_buckets"
+
+    key = Column(String(255), primary_key=True)  # e.g. "login_code:ip:1.2.3.4"
+    tokens = Column(Float, nullable=False)  # tokens left after the last request
+    updated_at = Column(Float, nullable=False, index=True)  # unix time of the last refill
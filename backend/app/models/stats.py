@@ -0,0 +1,42 @@
+from datetime import datetime
+from sqlalchemy import Column, Date, DateTime, Index, Integer
+
+from app.models.base import Base
+
+
+class FamilyDailyStats(Base):
+    """Activity counters of one family on one day (UTC), see services/stats.py."""
+    __tablename__ = "family_daily_stats"
+
+    day = Column(Date, primary_key=True)
+    family_id = Column(Integer, primary_key=True)  # 0 = rows without family; no FK, history outlives families
+    submissions_created = Column(Integer, default=0, nullable=False)
+    submissions_approved = Column(Integer, default=0, nullable=False)
+    submissions_rejected = Column(Integer, default=0, nullable=False)
+    minutes_earned = Column(Integer, default=0, nullable=False)
+    tans_used = Column(Integer, default=0, nullable=False)
+    active_children = Column(Integer, default=0, nullable=False)  # set by the refresh job only
+
+    # Trends of one family
+    __table_args__ = (Index("ix_family_daily_stats_family_day", "family_id", "day"),)
+
+
+class StatsSnapshot(Base):
+    """Precomputed admin dashboard totals (single row, id = 1)."""
+    __tablename__ = "stats_snapshot"
+
+    id = Column(Integer, primary_key=True)
+    users_total = Column(Integer, default=0, nullable=False)
+    users_parents = Column(Integer, default=0, nullable=False)
+    users_children = Column(Integer, default=0, nullable=False)
+    users_pending_verification = Column(Integer, default=0, nullable=False)
+    families_total = Column(Integer, default=0, nullable=False)
+    tasks_total = Column(Integer, default=0, nullable=False)
+    tasks_active = Column(Integer, default=0, nullable=False)
+    submissions_total = Column(Integer, default=0, nullable=False)
+    submissions_pending = Column(Integer, default=0, nullable=False)
+    submissions_approved = Column(Integer, default=0, nullable=False)
+    tan_pool_available = Column(Integer, default=0, nullable=False)
+    tan_pool_used = Column(Integer, default=0, nullable=False)
+    minutes_earned_total = Column(Integer, default=0, nullable=False)
+    refreshed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
 
 from app.models.base import Base
 
@@ -20,3 +20,10 @@ class Submission(Base):
 
     # Multi-family support
     family_id = Column(Integer, ForeignKey("families.id", ondelete="CASCADE"), nullable=True, index=True)
+    change_version = Column(Integer, default=0, nullable=False)  # family version of the last write
+
+    # Keyset pagination of the history (newest first), delta sync
+    __table_args__ = (
+        Index("ix_submissions_family_created", "family_id", "created_at", "id"),
+        Index("ix_submissions_family_version", "family_id", "change_version"),
+    )
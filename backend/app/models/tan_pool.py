@@ -20,3 +20,18 @@ class TanPool(Base):
     # Multi-family support
     family_id = Column(Integer, ForeignKey("families.id", ondelete="CASCADE"), nullable=True, index=True)
     family = relationship("Family", back_populates="tan_pool")
+
+
+class TanPoolCounter(Base):
+    """Maintained TAN counts per family and device.
+
+    Kept in sync by every write to ``tan_pool`` (see app/services/tan_pool.py),
+    so pool statistics are a point read instead of a COUNT over the pool.
+    """
+
+    __tablename__ = "tan_pool_counters"
+
+    family_id = Column(Integer, ForeignKey("families.id", ondelete="CASCADE"), primary_key=True)
+    target_device = Column(String(50), primary_key=True)
+    available = Column(Integer, default=0, nullable=False)
+    used = Column(Integer, default=0, nullable=False)
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text, JSON
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text, JSON
 from sqlalchemy.orm import relationship
 
 from app.models.base import Base
@@ -22,9 +22,24 @@ class Task(Base):
     is_active = Column(Boolean, default=True, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
+    # Derived from recurrence/assigned_children, see app/services/tasks.py
+    recurrence_mask = Column(Integer, nullable=False, default=127)  # bit 0 = mon ... bit 6 = sun
+    child_links = relationship("TaskChild", cascade="all, delete-orphan")
+
     # Multi-family support
     family_id = Column(Integer, ForeignKey("families.id", ondelete="CASCADE"), nullable=True, index=True)
     family = relationship("Family", back_populates="tasks")
+    change_version = Column(Integer, default=0, nullable=False)  # family version of the last write
+
+    __table_args__ = (Index("ix_tasks_family_version", "family_id", "change_version"),)
+
+
+class TaskChild(Base):
+    """Child assignment of a task; mirrors Task.assigned_children for indexed lookups."""
+    __tablename__ = "task_children"
+
+    task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True)
+    child_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True, index=True)
 
 
 class TaskTemplate(Base):
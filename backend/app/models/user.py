@@ -1,7 +1,8 @@
 from datetime import datetime
-from sqlalchemy import Boolean, Column, DateTime, Integer, String, JSON
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, String, JSON, event
 from sqlalchemy.orm import relationship
 
+from app.core.search import normalize_search
 from app.models.base import Base
 
 
@@ -28,6 +29,17 @@ class User(Base):
     # Simple code-based login (for children)
     login_code = Column(String(30), unique=True, nullable=True, index=True)  # e.g., "TIGER-BLAU-42"
 
+    # Normalized "name email" for admin search, kept in sync below
+    search_text = Column(String(400), nullable=True)
+
     # Relationships
     device_tokens = relationship("DeviceToken", back_populates="user", cascade="all, delete-orphan")
     family_memberships = relationship("FamilyMember", back_populates="user", cascade="all, delete-orphan")
+
+    __table_args__ = (Index("ix_users_created", "created_at", "id"),)
+
+
+@event.listens_for(User, "before_insert")
+@event.listens_for(User, "before_update")
+def _update_search_text(mapper, connection, target):
+    target.search_text = normalize_search(target.name, target.email)
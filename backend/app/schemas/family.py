@@ -80,3 +80,13 @@ class ProviderInfo(BaseModel):
     name: str
     description: str | None
     requires_tan_pool: bool
+
+
+class PendingPayoutRead(BaseModel):
+    """Unpaid rewards of one child and device at one provider."""
+    provider_type: str
+    child_id: int
+    target_device: str | None
+    total_minutes: int
+    entry_count: int
+    action_hint: str | None = None
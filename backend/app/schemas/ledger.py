@@ -1,5 +1,5 @@
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.schemas.common import ORMBase
 
@@ -31,3 +31,27 @@ class LedgerAggregateRead(BaseModel):
     target_device: str | None
     total_minutes: int
     entry_count: int
+
+
+class BulkMarkPaidRequest(BaseModel):
+    child_id: int
+    target_device: str | None = None  # None = all devices
+    until: datetime | None = None  # entries created up to here, default now
+
+
+class BulkMarkPaidResult(BaseModel):
+    child_id: int
+    until: datetime
+    entry_count: int
+    total_minutes: int
+    devices: list[LedgerAggregateRead]  # marked per device
+
+
+class BulkPayoutRequest(BaseModel):
+    payouts: list[PayoutRequest] = Field(min_length=1, max_length=100)
+
+
+class BulkPayoutResult(BaseModel):
+    entries: list[LedgerEntryRead]
+    entry_count: int
+    total_minutes: int
@@ -5,9 +5,12 @@ from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.models.achievement import Achievement, UserAchievement
+from app.models.family import FamilyMember
 from app.models.submission import Submission
 from app.models.ledger import TanLedger
 from app.models.learning import LearningSession
+from app.services.archive import archived_totals
+from app.services.events import publish_event
 
 
 # Achievement definitions - will be seeded to database
@@ -123,6 +126,19 @@ def check_and_award_achievements(db: Session, user_id: int) -> List[Achievement]
 
     if newly_unlocked:
         db.commit()
+        family_ids = [
+            m.family_id for m in db.query(FamilyMember.family_id).filter(FamilyMember.user_id == user_id).all()
+        ]
+        for achievement in newly_unlocked:
+            for family_id in family_ids:
+                publish_event(
+                    family_id,
+                    "achievement_unlocked",
+                    child_id=user_id,
+                    achievement_id=achievement.id,
+                    code=achievement.code,
+                    name=achievement.name,
+                )
 
     return newly_unlocked
 
@@ -142,6 +158,7 @@ def _check_achievement(db: Session, user_id: int, achievement: Achievement) -> b
             Submission.child_id == user_id,
             Submission.status == "approved"
         ).scalar() or 0
+        count += archived_totals(db, [user_id]).get(user_id, {}).get("submissions_approved", 0)
         return count >= (achievement.threshold or 0)
 
     # Learning achievements
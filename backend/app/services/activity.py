@@ -0,0 +1,100 @@
+"""Append-only activity log for the admin console (``activity_events``).
+
+Routes call ``log_event`` before their commit, so the entry is written in
+the same transaction as the change it describes. Rows are never updated;
+the nightly retention job drops entries older than
+``ACTIVITY_RETENTION_DAYS`` and caps the table at ``ACTIVITY_MAX_ROWS``.
+
+Payloads stay small: only what the log message needs that cannot be
+looked up later (titles, minutes, devices). Names of users are resolved
+when reading.
+"""
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.activity import ActivityEvent
+from app.models.user import User
+
+settings = get_settings()
+
+# Message templates per event type; {actor} and {child} are user names
+MESSAGES = {
+    "registration": "Neuer User: {name} ({role})",
+    "user_created": "{actor} hat {name} ({role}) angelegt",
+    "family_joined": "{actor} ist der Familie beigetreten",
+    "login": "{actor} angemeldet ({method})",
+    "submission_pending": "{actor}: '{task_title}' eingereicht",
+    "submission_approved": "'{task_title}' von {child} genehmigt ({minutes} Min)",
+    "submission_retry": "'{task_title}' von {child} zurueckgegeben",
+    "payout": "Auszahlung: {minutes} Min fuer {child}",
+    "ledger_paid": "{minutes} Min von {child} als ausgezahlt markiert",
+    "ledger_paid_bulk": "{count} Eintraege ({minutes} Min) von {child} als ausgezahlt markiert",
+    "tan_used": "{count} TAN(s) fuer {target_device} vergeben",
+}
+
+
+def log_event(
+    db: Session,
+    event_type: str,
+    *,
+    family_id: int | None = None,
+    actor_id: int | None = None,
+    subject_id: int | None = None,
+    **payload: Any,
+) -> ActivityEvent:
+    """Add an activity entry to the session; it is written with the caller's commit."""
+    event = ActivityEvent(
+        ts=datetime.utcnow(),
+        family_id=family_id,
+        actor_id=actor_id,
+        type=event_type,
+        subject_id=subject_id,
+        payload=payload or None,
+    )
+    db.add(event)
+    return event
+
+
+def user_names(db: Session, events: list[ActivityEvent]) -> dict[int, str]:
+    """Names of all actors and children referenced by the events (one query)."""
+    ids = {e.actor_id for e in events if e.actor_id}
+    ids |= {e.payload["child_id"] for e in events if e.payload and e.payload.get("child_id")}
+    if not ids:
+        return {}
+    return dict(db.execute(select(User.id, User.name).where(User.id.in_(ids))).all())
+
+
+def format_message(event: ActivityEvent, names: dict[int, str]) -> str:
+    """Human-readable (German) message of an event."""
+    values = defaultdict(lambda: "?", event.payload or {})
+    if event.actor_id:
+        values["actor"] = names.get(event.actor_id, f"User {event.actor_id}")
+    child_id = values.get("child_id")
+    if child_id:
+        values["child"] = names.get(child_id, f"User {child_id}")
+    template = MESSAGES.get(event.type, event.type)
+    return template.format_map(values)
+
+
+def purge_activity_events(db: Session) -> int:
+    """Apply the retention cap (age and row count). Returns deleted rows; commits."""
+    cutoff = datetime.utcnow() - timedelta(days=settings.activity_retention_days)
+    deleted = db.execute(delete(ActivityEvent).where(ActivityEvent.ts < cutoff)).rowcount or 0
+
+    # Newest ACTIVITY_MAX_ROWS survive; ids grow with time
+    boundary = db.scalar(
+        select(ActivityEvent.id)
+        .order_by(ActivityEvent.id.desc())
+        .offset(settings.activity_max_rows)
+        .limit(1)
+    )
+    if boundary is not None:
+        deleted += db.execute(delete(ActivityEvent).where(ActivityEvent.id <= boundary)).rowcount or 0
+    db.commit()
+    return deleted
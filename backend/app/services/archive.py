@@ -0,0 +1,233 @@
+"""Archival of settled ledger rows and closed submissions.
+
+``tan_ledger`` and ``submissions`` only ever grew. The nightly archive job
+moves rows older than ``ARCHIVE_AFTER_DAYS`` into ``tan_ledger_archive`` and
+``submissions_archive`` (same columns plus ``archived_at``) in batches:
+
+- ledger rows that are paid out
+- approved or rejected submissions without photo and without a ledger row
+  that is still in ``tan_ledger``
+
+and adds their counts to ``archive_rollups`` (per family, child, month and
+device). Lifetime figures (``/stats``, achievements, the admin snapshot) add
+the rollups to the hot tables; the ledger balances keep their totals and
+``check_ledger_balances`` includes the archive. History endpoints read the
+archive too with ``include_archived=true`` via ``history``.
+
+The horizon never goes below ``MIN_ARCHIVE_DAYS``, so streaks (365 days)
+and the recent windows of ``/stats`` only ever see the hot tables;
+``ARCHIVE_AFTER_DAYS=0`` turns archival off.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import delete, exists, func, literal, select, union_all
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, aliased
+
+from app.core.config import get_settings
+from app.models.archive import ArchiveRollup, SubmissionArchive, TanLedgerArchive
+from app.models.ledger import TanLedger
+from app.models.submission import Submission
+from app.services.change_tracking import bump_family_version
+
+settings = get_settings()
+
+MIN_ARCHIVE_DAYS = 400
+CLOSED_STATUSES = ("approved", "rejected")
+ROLLUP_COUNTERS = ("submissions", "submissions_approved", "ledger_entries", "ledger_minutes")
+ROLLUP_KEY = ("family_id", "child_id", "month", "target_device")
+
+ARCHIVES = {TanLedger: TanLedgerArchive, Submission: SubmissionArchive}
+
+
+def archive_cutoff() -> datetime:
+    """Rows created (ledger) or last updated (submissions) before this are archived."""
+    return datetime.utcnow() - timedelta(days=max(settings.archive_after_days, MIN_ARCHIVE_DAYS))
+
+
+def history(model: Any, include_archived: bool = False) -> Any:
+    """``model`` itself, or an alias of it over hot and archived rows.
+
+    The alias works like the model in queries (``select(entity).where(
+    entity.child_id == ...)``, keyset pagination) and yields model
+    instances; ids are unique across both tables because rows are moved.
+    """
+    if not include_archived:
+        return model
+    hot = model.__table__
+    archive = ARCHIVES[model].__table__
+    rows = union_all(
+        select(*hot.columns),
+        select(*(archive.c[column.name] for column in hot.columns)),
+    ).subquery(f"{hot.name}_history")
+    return aliased(model, rows)
+
+
+def _month(value: datetime) -> date:
+    return value.date().replace(day=1)
+
+
+def _add_rollup(db: Session, key: dict, **deltas: int) -> None:
+    """Add deltas to a rollup row (created on first use)."""
+    deltas = {name: value for name, value in deltas.items() if value}
+    if not deltas:
+        return
+    conn = db.connection()
+    table = ArchiveRollup.__table__
+    now = datetime.utcnow()
+    dialect = conn.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+        stmt = insert(table).values(**key, **deltas, updated_at=now)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c[name] for name in ROLLUP_KEY],
+            set_={**{name: table.c[name] + value for name, value in deltas.items()}, "updated_at": now},
+        )
+        conn.execute(stmt)
+        return
+
+    updated = conn.execute(
+        table.update()
+        .where(*(table.c[name] == value for name, value in key.items()))
+        .values({**{name: table.c[name] + value for name, value in deltas.items()}, "updated_at": now})
+    ).rowcount
+    if not updated:
+        conn.execute(table.insert().values(**key, **deltas, updated_at=now))
+
+
+def _move(db: Session, model: Any, ids: list[int]) -> None:
+    """Copy rows to the archive table and delete them from the hot table."""
+    hot = model.__table__
+    archive = ARCHIVES[model].__table__
+    names = [column.name for column in hot.columns]
+    db.execute(
+        archive.insert().from_select(
+            names + ["archived_at"],
+            select(*hot.columns, literal(datetime.utcnow(), archive.c.archived_at.type)).where(hot.c.id.in_(ids)),
+        )
+    )
+    db.execute(delete(hot).where(hot.c.id.in_(ids)))
+
+
+def _archive_ledger_batch(db: Session, cutoff: datetime, batch_size: int) -> int:
+    rows = db.execute(
+        select(TanLedger.id, TanLedger.family_id, TanLedger.child_id, TanLedger.target_device,
+               TanLedger.minutes, TanLedger.created_at)
+        .where(
+            TanLedger.paid_out.is_(True),
+            TanLedger.created_at < cutoff,
+            # SQLite hands out max(id) + 1; keeping the newest row prevents id reuse
+            TanLedger.id < select(func.max(TanLedger.id)).scalar_subquery(),
+        )
+        .order_by(TanLedger.id)
+        .limit(batch_size)
+    ).all()
+    if not rows:
+        return 0
+
+    totals: dict[tuple, dict[str, int]] = defaultdict(lambda: dict.fromkeys(ROLLUP_COUNTERS, 0))
+    for row in rows:
+        key = (row.family_id or 0, row.child_id, _month(row.created_at), row.target_device or "")
+        totals[key]["ledger_entries"] += 1
+        totals[key]["ledger_minutes"] += row.minutes
+    _finish_batch(db, TanLedger, [row.id for row in rows], totals)
+    return len(rows)
+
+
+def _archive_submission_batch(db: Session, cutoff: datetime, batch_size: int) -> int:
+    rows = db.execute(
+        select(Submission.id, Submission.family_id, Submission.child_id, Submission.selected_device,
+               Submission.status, Submission.created_at)
+        .where(
+            Submission.status.in_(CLOSED_STATUSES),
+            Submission.updated_at < cutoff,
+            Submission.photo_path.is_(None),
+            ~exists().where(TanLedger.submission_id == Submission.id),
+            Submission.id < select(func.max(Submission.id)).scalar_subquery(),
+        )
+        .order_by(Submission.id)
+        .limit(batch_size)
+    ).all()
+    if not rows:
+        return 0
+
+    totals: dict[tuple, dict[str, int]] = defaultdict(lambda: dict.fromkeys(ROLLUP_COUNTERS, 0))
+    for row in rows:
+        key = (row.family_id or 0, row.child_id, _month(row.created_at), row.selected_device or "")
+        totals[key]["submissions"] += 1
+        totals[key]["submissions_approved"] += row.status == "approved"
+    _finish_batch(db, Submission, [row.id for row in rows], totals)
+    return len(rows)
+
+
+def _finish_batch(db: Session, model: Any, ids: list[int], totals: dict[tuple, dict[str, int]]) -> None:
+    _move(db, model, ids)
+    for key, deltas in totals.items():
+        _add_rollup(db, dict(zip(ROLLUP_KEY, key)), **deltas)
+    # Lists and caches of these families changed
+    for family_id in {key[0] for key in totals if key[0]}:
+        bump_family_version(db, family_id)
+    db.commit()
+
+
+def archive_history(db: Session, batch_size: int | None = None) -> dict[str, int]:
+    """Move old settled rows into the archive, one commit per batch.
+
+    Ledger rows go first, so their submissions can follow in the same run.
+    Returns the number of archived rows per table.
+    """
+    archived = {"ledger": 0, "submissions": 0}
+    if settings.archive_after_days <= 0:
+        return archived
+    batch_size = batch_size or settings.archive_batch_size
+    cutoff = archive_cutoff()
+    for name, archive_batch in (("ledger", _archive_ledger_batch), ("submissions", _archive_submission_batch)):
+        while True:
+            moved = archive_batch(db, cutoff, batch_size)
+            archived[name] += moved
+            if moved < batch_size:
+                break
+    return archived
+
+
+def archived_totals(db: Session, child_ids: list[int]) -> dict[int, dict[str, int]]:
+    """Rollup counters per child, across families and months."""
+    if not child_ids:
+        return {}
+    rows = db.execute(
+        select(ArchiveRollup.child_id, *(func.sum(ArchiveRollup.__table__.c[name]) for name in ROLLUP_COUNTERS))
+        .where(ArchiveRollup.child_id.in_(child_ids))
+        .group_by(ArchiveRollup.child_id)
+    ).all()
+    return {row[0]: dict(zip(ROLLUP_COUNTERS, (value or 0 for value in row[1:]))) for row in rows}
+
+
+def archived_device_totals(
+    db: Session, family_ids: list[int] | None = None, child_id: int | None = None
+) -> dict[str | None, dict[str, int]]:
+    """Archived ledger minutes and entries per device (``None`` for entries without device)."""
+    stmt = select(
+        ArchiveRollup.target_device,
+        func.sum(ArchiveRollup.ledger_minutes),
+        func.sum(ArchiveRollup.ledger_entries),
+    ).where(ArchiveRollup.ledger_entries > 0)
+    if family_ids is not None:
+        stmt = stmt.where(ArchiveRollup.family_id.in_(family_ids))
+    if child_id is not None:
+        stmt = stmt.where(ArchiveRollup.child_id == child_id)
+    rows = db.execute(stmt.group_by(ArchiveRollup.target_device)).all()
+    return {
+        device or None: {"ledger_minutes": minutes or 0, "ledger_entries": entries or 0}
+        for device, minutes, entries in rows
+    }
+
+
+def delete_archived(db: Session, user_id: int) -> None:
+    """Remove a user's archived rows and rollups (account deletion); the caller commits."""
+    db.execute(delete(TanLedgerArchive).where(TanLedgerArchive.child_id == user_id))
+    db.execute(delete(SubmissionArchive).where(SubmissionArchive.child_id == user_id))
+    db.execute(delete(ArchiveRollup).where(ArchiveRollup.child_id == user_id))
@@ -0,0 +1,87 @@
+"""Per-family change versions for conditional GETs and delta sync.
+
+Every family has a ``change_version`` counter. A ``before_flush`` hook on
+``SessionLocal`` bumps it once per flush when tasks, submissions, ledger
+entries, memberships or unlocked achievements of that family are written
+(the stats cache keys on it too), and stamps
+the written rows with the new value. Polling endpoints derive their ETag
+from the counter and can return only rows with a newer ``change_version``.
+
+The bump is an ``UPDATE`` on the family row, so concurrent writers of the
+same family are serialized until commit and versions become visible in
+order. Set-based writes that bypass the ORM call ``bump_family_version``
+themselves and stamp their rows with the result.
+"""
+
+from itertools import chain
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.achievement import UserAchievement
+from app.models.family import Family, FamilyMember
+from app.models.ledger import TanLedger
+from app.models.submission import Submission
+from app.models.task import Task
+
+# Rows that carry family_id and change_version
+VERSIONED_MODELS = (Task, Submission, TanLedger)
+
+
+def bump_family_version(session: Session, family_id: int) -> int | None:
+    """Increment the family's change version; returns the new value (``None`` if unknown)."""
+    families = Family.__table__
+    conn = session.connection()
+    stmt = (
+        families.update()
+        .where(families.c.id == family_id)
+        .values(change_version=families.c.change_version + 1)
+    )
+    if conn.dialect.update_returning:
+        return conn.execute(stmt.returning(families.c.change_version)).scalar_one_or_none()
+    conn.execute(stmt)
+    return conn.execute(
+        select(families.c.change_version).where(families.c.id == family_id)
+    ).scalar_one_or_none()
+
+
+def _user_family_ids(session: Session, user_id: int) -> list[int]:
+    return session.execute(
+        select(FamilyMember.family_id).where(FamilyMember.user_id == user_id)
+    ).scalars().all()
+
+
+def track_changes(session: Session, flush_context, instances) -> None:
+    """``before_flush`` hook: bump family versions and stamp changed rows."""
+    stamped: dict[int, list] = {}
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, VERSIONED_MODELS):
+            if obj.family_id is None or not (obj in session.new or obj in session.deleted or session.is_modified(obj)):
+                continue
+            rows = stamped.setdefault(obj.family_id, [])
+            if obj not in session.deleted:
+                rows.append(obj)
+        elif isinstance(obj, FamilyMember) and (obj in session.new or obj in session.deleted):
+            # Membership decides which children family stats include
+            stamped.setdefault(obj.family_id, [])
+        elif isinstance(obj, UserAchievement) and obj in session.new:
+            # Only unlocks matter; marking as notified does not change what clients see
+            for family_id in _user_family_ids(session, obj.user_id):
+                stamped.setdefault(family_id, [])
+
+    for family_id, rows in stamped.items():
+        version = bump_family_version(session, family_id)
+        if version is None:
+            continue
+        for obj in rows:
+            obj.change_version = version
+
+
+def get_family_versions(db: Session, family_ids: list[int]) -> dict[int, int]:
+    """Current change version of each family."""
+    if not family_ids:
+        return {}
+    rows = db.execute(
+        select(Family.id, Family.change_version).where(Family.id.in_(family_ids))
+    ).all()
+    return {row.id: row.change_version for row in rows}
@@ -0,0 +1,176 @@
+"""In-process pub/sub for live family events (consumed by ``/events/stream``).
+
+Routes publish after their commit, e.g. ``publish_event(family_id,
+"submission_created", submission_id=...)``. Every connected client of that
+family gets the event through its own bounded queue; slow clients lose the
+oldest events instead of blocking publishers.
+
+Delivery across processes goes through a backend (``EVENT_BUS_BACKEND``):
+
+- ``memory`` (default): events stay in this process. Fine for one worker.
+- ``postgres``: ``pg_notify`` on publish plus a listener thread per process
+  (``LISTEN``), so all uvicorn workers see all events. Needs psycopg2.
+
+Publishing is thread-safe; sync routes run in the threadpool.
+"""
+
+import asyncio
+import json
+import select
+import threading
+from datetime import datetime
+from typing import Any, Callable
+
+from sqlalchemy import text
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+QUEUE_SIZE = 100
+Dispatch = Callable[[int, dict[str, Any]], None]
+
+
+class Subscription:
+    """Queue of events for one connected client."""
+
+    def __init__(self, family_id: int, user_id: int):
+        self.family_id = family_id
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=QUEUE_SIZE)
+
+    def put(self, event: dict[str, Any]) -> None:
+        # Runs on the subscriber's loop
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+
+class MemoryBackend:
+    """Deliver events within this process only."""
+
+    def start(self, dispatch: Dispatch) -> None:
+        self._dispatch = dispatch
+
+    def publish(self, family_id: int, event: dict[str, Any]) -> None:
+        self._dispatch(family_id, event)
+
+    def stop(self) -> None:
+        pass
+
+
+class PostgresBackend:
+    """Share events between processes via ``LISTEN``/``NOTIFY``."""
+
+    channel = "zeitschatz_events"
+
+    def start(self, dispatch: Dispatch) -> None:
+        from app.db.session import engine
+
+        self._engine = engine
+        self._dispatch = dispatch
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._listen, name="event-bus-listener", daemon=True)
+        self._thread.start()
+
+    def publish(self, family_id: int, event: dict[str, Any]) -> None:
+        payload = json.dumps({"family_id": family_id, "event": event}, default=str)
+        with self._engine.begin() as conn:
+            conn.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": self.channel, "payload": payload})
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _listen(self) -> None:
+        raw = self._engine.raw_connection()
+        try:
+            conn = raw.driver_connection
+            conn.autocommit = True
+            conn.cursor().execute(f"LISTEN {self.channel}")
+            while not self._stopped.is_set():
+                if select.select([conn], [], [], 5) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    message = json.loads(conn.notifies.pop(0).payload)
+                    self._dispatch(message["family_id"], message["event"])
+        finally:
+            raw.close()
+
+
+BACKENDS = {
+    "memory": MemoryBackend,
+    "postgres": PostgresBackend,
+}
+
+
+class EventBus:
+    """Fan events out to the subscribers of a family."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: dict[int, set[Subscription]] = {}
+        self._backend = None
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._backend is None:
+                backend = BACKENDS[settings.event_bus_backend]()
+                backend.start(self._dispatch)
+                self._backend = backend
+            return self._backend
+
+    def stop(self) -> None:
+        with self._lock:
+            if self._backend is not None:
+                self._backend.stop()
+                self._backend = None
+
+    def publish(self, family_id: int, event: dict[str, Any]) -> None:
+        self._ensure_started().publish(family_id, event)
+
+    def subscribe(self, family_id: int, user_id: int) -> Subscription:
+        """Register a client; call from its event loop."""
+        self._ensure_started()
+        subscription = Subscription(family_id, user_id)
+        with self._lock:
+            self._subscribers.setdefault(family_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.family_id, set())
+            subscribers.discard(subscription)
+            if not subscribers:
+                self._subscribers.pop(subscription.family_id, None)
+
+    def online_user_ids(self) -> set[int]:
+        """Users with an open stream on this process (other workers are not known)."""
+        with self._lock:
+            return {sub.user_id for subscribers in self._subscribers.values() for sub in subscribers}
+
+    def _dispatch(self, family_id: int, event: dict[str, Any]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(family_id, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put, event)
+            except RuntimeError:
+                # Loop already closed, client is gone
+                self.unsubscribe(subscription)
+
+
+event_bus = EventBus()
+
+
+def publish_event(family_id: int | None, event_type: str, **data: Any) -> None:
+    """Publish an event to the live stream of a family (after commit)."""
+    if family_id is None:
+        return
+    event = {"type": event_type, "family_id": family_id, "at": datetime.utcnow().isoformat(), **data}
+    try:
+        event_bus.publish(family_id, event)
+    except Exception as exc:
+        # Live updates are best effort; the write itself already succeeded
+        print(f"[events] publish failed: {exc}")
@@ -0,0 +1,101 @@
+"""Replay protection for bulk ledger writes (``Idempotency-Key`` header).
+
+A client sends a unique key with a request. The first request runs and its
+response is stored under (user, key) in the same transaction as its
+changes. A retry with the same key and parameters gets the stored response
+back (marked with ``Idempotent-Replay: true``) instead of paying out twice;
+reusing a key for a different request is rejected. Without a key the
+request simply runs. Keys expire after ``IDEMPOTENCY_KEY_TTL_HOURS``.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Any, Callable
+
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.idempotency import IdempotencyKey
+
+settings = get_settings()
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAY_HEADER = "Idempotent-Replay"
+
+
+def fingerprint(params: Any) -> str:
+    """sha256 of the JSON-encoded request parameters."""
+    encoded = json.dumps(jsonable_encoder(params), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def stored_response(db: Session, user_id: int, key: str, endpoint: str, request_hash: str) -> JSONResponse | None:
+    """The response stored for ``key``, or ``None``; 409 if the key belongs to another request."""
+    row = db.get(IdempotencyKey, (user_id, key))
+    if row is None:
+        return None
+    if row.endpoint != endpoint or row.fingerprint != request_hash:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Idempotency-Key wurde bereits fuer eine andere Anfrage verwendet",
+        )
+    return JSONResponse(row.response, status_code=row.status_code, headers={REPLAY_HEADER: "true"})
+
+
+def run_idempotent(
+    db: Session,
+    user_id: int,
+    key: str | None,
+    endpoint: str,
+    params: Any,
+    operation: Callable[[], Any],
+    status_code: int = status.HTTP_200_OK,
+) -> Any:
+    """Run ``operation`` (which must not commit) once per key and commit.
+
+    Returns the operation's result, or the stored response of an earlier
+    request with the same key.
+    """
+    if not key:
+        result = operation()
+        db.commit()
+        return result
+
+    request_hash = fingerprint(params)
+    replay = stored_response(db, user_id, key, endpoint, request_hash)
+    if replay is not None:
+        return replay
+
+    result = operation()
+    db.add(IdempotencyKey(
+        user_id=user_id,
+        key=key,
+        endpoint=endpoint,
+        fingerprint=request_hash,
+        status_code=status_code,
+        response=jsonable_encoder(result),
+    ))
+    try:
+        db.commit()
+    except IntegrityError:
+        # A concurrent request with the same key won; its changes count
+        db.rollback()
+        replay = stored_response(db, user_id, key, endpoint, request_hash)
+        if replay is None:
+            raise
+        return replay
+    return result
+
+
+def purge_idempotency_keys(db: Session) -> int:
+    """Delete keys older than ``IDEMPOTENCY_KEY_TTL_HOURS``. Returns deleted rows; commits."""
+    cutoff = datetime.utcnow() - timedelta(hours=settings.idempotency_key_ttl_hours)
+    deleted = db.execute(delete(IdempotencyKey).where(IdempotencyKey.created_at < cutoff)).rowcount or 0
+    db.commit()
+    return deleted
@@ -0,0 +1,282 @@
+"""Running ledger balances per family, child, device and provider.
+
+``ledger_balances`` holds unpaid minutes/entries and lifetime minutes so
+that balance views (``/ledger/my``, ``/ledger/aggregate``, the providers'
+pending payouts, ``/stats``) read a handful of rows instead of summing the
+whole ledger.
+
+The ``track_ledger_balances`` ``before_flush`` hook applies the difference
+of every inserted, changed or deleted ledger row in the same transaction.
+Set-based updates that bypass the ORM (``mark_paid_until``) must call
+``apply_balance`` themselves; archiving paid rows leaves the balances as
+they are. ``check_ledger_balances`` recomputes everything from the raw
+rows including the archive; the nightly job logs and repairs any drift.
+
+Keys use sentinels instead of NULL: family ``0``, device and provider ``""``.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import datetime
+from itertools import chain
+
+from sqlalchemy import case, delete, event, exists, func, inspect, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.ledger import LedgerBalance, TanLedger
+from app.services.archive import history
+from app.services.change_tracking import bump_family_version
+
+logger = logging.getLogger(__name__)
+
+KEY_COLUMNS = ("family_id", "child_id", "target_device", "provider_type")
+BALANCE_COLUMNS = ("unpaid_minutes", "unpaid_count", "lifetime_minutes")
+TRACKED_ATTRIBUTES = KEY_COLUMNS + ("minutes", "paid_out")
+
+
+def balance_key(family_id: int | None, child_id: int, target_device: str | None, provider_type: str | None) -> dict:
+    return {
+        "family_id": family_id or 0,
+        "child_id": child_id,
+        "target_device": target_device or "",
+        "provider_type": provider_type or "",
+    }
+
+
+def apply_balance(db: Session, key: dict, **deltas: int) -> None:
+    """Add deltas to a balance row (created on first use)."""
+    deltas = {name: value for name, value in deltas.items() if value}
+    if not deltas:
+        return
+    conn = db.connection()
+    table = LedgerBalance.__table__
+    dialect = conn.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+        stmt = insert(table).values(**key, **deltas)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c[name] for name in KEY_COLUMNS],
+            set_={name: table.c[name] + value for name, value in deltas.items()},
+        )
+        conn.execute(stmt)
+        return
+
+    updated = conn.execute(
+        table.update()
+        .where(*(table.c[name] == value for name, value in key.items()))
+        .values({name: table.c[name] + value for name, value in deltas.items()})
+    ).rowcount
+    if not updated:
+        conn.execute(table.insert().values(**key, **deltas))
+
+
+def _contribution(values: dict) -> tuple[dict, dict]:
+    key = balance_key(values["family_id"], values["child_id"], values["target_device"], values["provider_type"])
+    minutes = values["minutes"] or 0
+    unpaid = not values["paid_out"]
+    return key, {
+        "unpaid_minutes": minutes if unpaid else 0,
+        "unpaid_count": 1 if unpaid else 0,
+        "lifetime_minutes": minutes,
+    }
+
+
+def _values(obj: TanLedger, previous: bool = False) -> dict:
+    if not previous:
+        return {name: getattr(obj, name) for name in TRACKED_ATTRIBUTES}
+    state = inspect(obj)
+    values = {}
+    for name in TRACKED_ATTRIBUTES:
+        history = state.attrs[name].history
+        values[name] = history.deleted[0] if history.deleted else getattr(obj, name)
+    return values
+
+
+def _apply(session: Session, obj: TanLedger, sign: int, previous: bool = False) -> None:
+    key, amounts = _contribution(_values(obj, previous))
+    apply_balance(session, key, **{name: sign * value for name, value in amounts.items()})
+
+
+def track_ledger_balances(session: Session, flush_context, instances) -> None:
+    """``before_flush`` hook: move ledger inserts, changes and deletes into the balances."""
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if not isinstance(obj, TanLedger):
+            continue
+        if obj in session.new:
+            _apply(session, obj, +1)
+        elif obj in session.deleted:
+            _apply(session, obj, -1, previous=True)
+        elif any(inspect(obj).attrs[name].history.has_changes() for name in TRACKED_ATTRIBUTES):
+            _apply(session, obj, -1, previous=True)
+            _apply(session, obj, +1)
+
+
+def _load_previous(target, value, oldvalue, initiator):
+    return value
+
+
+# Load the old value on assignment, so the hook sees it even on expired rows
+for _name in TRACKED_ATTRIBUTES:
+    event.listen(getattr(TanLedger, _name), "set", _load_previous, active_history=True, retval=True)
+
+
+def mark_paid_until(
+    db: Session,
+    family_id: int,
+    child_id: int,
+    until: datetime,
+    target_device: str | None = None,
+) -> list[dict]:
+    """Mark all unpaid entries of a child created up to ``until`` as paid (one ``UPDATE``).
+
+    Bypasses the ORM, so it bumps the family version and moves the balances
+    itself; if nothing qualifies it writes nothing, so caches and ETags stay
+    valid. Returns the marked totals per device like ``balance_rows``; the
+    caller commits.
+    """
+    ledger = TanLedger.__table__
+    criteria = [
+        ledger.c.family_id == family_id,
+        ledger.c.child_id == child_id,
+        ledger.c.paid_out.is_(False),
+        ledger.c.created_at <= until,
+    ]
+    if target_device is not None:
+        criteria.append(ledger.c.target_device == target_device)
+    marked_columns = (ledger.c.target_device, ledger.c.provider_type, ledger.c.minutes)
+
+    conn = db.connection()
+    if not conn.execute(select(exists().where(*criteria))).scalar():
+        return []
+    version = bump_family_version(db, family_id)
+    stmt = ledger.update().where(*criteria).values(paid_out=True, change_version=version or 0)
+    if conn.dialect.update_returning:
+        marked = conn.execute(stmt.returning(*marked_columns)).all()
+    else:
+        marked = conn.execute(select(*marked_columns).where(*criteria)).all()
+        conn.execute(stmt)
+
+    per_key: dict[tuple, list[int]] = defaultdict(lambda: [0, 0])
+    for device, provider, minutes in marked:
+        totals = per_key[(device or "", provider or "")]
+        totals[0] += minutes
+        totals[1] += 1
+    per_device: dict[str, list[int]] = defaultdict(lambda: [0, 0])
+    for (device, provider), (minutes, count) in per_key.items():
+        key = balance_key(family_id, child_id, device, provider)
+        apply_balance(db, key, unpaid_minutes=-minutes, unpaid_count=-count)
+        per_device[device][0] += minutes
+        per_device[device][1] += count
+    return [
+        {"child_id": child_id, "target_device": device or None, "total_minutes": minutes, "entry_count": count}
+        for device, (minutes, count) in sorted(per_device.items())
+    ]
+
+
+def balance_rows(
+    db: Session,
+    family_ids: list[int] | None,
+    child_id: int | None = None,
+    target_device: str | None = None,
+    provider_type: str | None = None,
+    devices: list[str | None] | None = None,
+    unpaid_only: bool = True,
+) -> list[dict]:
+    """Unpaid totals per child and device (summed over families and providers).
+
+    ``family_ids=None`` means rows without family; ``devices`` restricts to
+    these devices (``None`` for entries without device).
+    """
+    device = func.nullif(LedgerBalance.target_device, "")
+    stmt = select(
+        LedgerBalance.child_id,
+        device.label("target_device"),
+        func.sum(LedgerBalance.unpaid_minutes).label("total_minutes"),
+        func.sum(LedgerBalance.unpaid_count).label("entry_count"),
+    )
+    if family_ids is None:
+        stmt = stmt.where(LedgerBalance.family_id == 0)
+    else:
+        stmt = stmt.where(LedgerBalance.family_id.in_(family_ids))
+    if child_id is not None:
+        stmt = stmt.where(LedgerBalance.child_id == child_id)
+    if target_device is not None:
+        stmt = stmt.where(LedgerBalance.target_device == target_device)
+    if provider_type is not None:
+        stmt = stmt.where(LedgerBalance.provider_type == provider_type)
+    if devices is not None:
+        stmt = stmt.where(LedgerBalance.target_device.in_([d or "" for d in devices]))
+    if unpaid_only:
+        stmt = stmt.where(LedgerBalance.unpaid_count > 0)
+    stmt = stmt.group_by(LedgerBalance.child_id, LedgerBalance.target_device).order_by(
+        LedgerBalance.child_id, LedgerBalance.target_device
+    )
+    return [row._asdict() for row in db.execute(stmt)]
+
+
+def lifetime_minutes(db: Session, child_ids: list[int]) -> dict[int, int]:
+    """Minutes ever earned per child, across all families."""
+    if not child_ids:
+        return {}
+    rows = db.execute(
+        select(LedgerBalance.child_id, func.sum(LedgerBalance.lifetime_minutes))
+        .where(LedgerBalance.child_id.in_(child_ids))
+        .group_by(LedgerBalance.child_id)
+    ).all()
+    return {child_id: minutes or 0 for child_id, minutes in rows}
+
+
+def _recompute(db: Session) -> dict[tuple, dict]:
+    # Archived rows are paid but still count towards the lifetime minutes
+    ledger = history(TanLedger, include_archived=True)
+    unpaid = ledger.paid_out.is_(False)
+    family = func.coalesce(ledger.family_id, 0)
+    device = func.coalesce(ledger.target_device, "")
+    provider = func.coalesce(ledger.provider_type, "")
+    rows = db.execute(
+        select(
+            family,
+            ledger.child_id,
+            device,
+            provider,
+            func.sum(case((unpaid, ledger.minutes), else_=0)),
+            func.sum(case((unpaid, 1), else_=0)),
+            func.sum(ledger.minutes),
+        ).group_by(family, ledger.child_id, device, provider)
+    ).all()
+    return {
+        tuple(row[:4]): dict(zip(BALANCE_COLUMNS, (value or 0 for value in row[4:])))
+        for row in rows
+    }
+
+
+def check_ledger_balances(db: Session, fix: bool = False) -> list[dict]:
+    """Compare the balances with the raw ledger; optionally rewrite drifted rows.
+
+    Returns one entry per drifted key with the stored and expected values.
+    With ``fix`` the caller commits.
+    """
+    expected = _recompute(db)
+    stored = {
+        tuple(getattr(row, name) for name in KEY_COLUMNS): {name: getattr(row, name) for name in BALANCE_COLUMNS}
+        for row in db.execute(select(LedgerBalance)).scalars()
+    }
+    zero = dict.fromkeys(BALANCE_COLUMNS, 0)
+
+    drift = []
+    for key in expected.keys() | stored.keys():
+        want = expected.get(key, zero)
+        have = stored.get(key, zero)
+        if want != have:
+            drift.append({**dict(zip(KEY_COLUMNS, key)), "stored": have, "expected": want})
+
+    if fix and drift:
+        table = LedgerBalance.__table__
+        for entry in drift:
+            key = {name: entry[name] for name in KEY_COLUMNS}
+            db.execute(delete(LedgerBalance).where(*(table.c[name] == value for name, value in key.items())))
+            if entry["expected"] != zero:
+                db.execute(table.insert().values(**key, **entry["expected"]))
+    return drift
@@ -0,0 +1,95 @@
+"""Allocation of unique login codes.
+
+Instead of loading every existing code to pick a free one, candidates are
+drawn at random and written; the unique index on ``users.login_code``
+decides. With the keyspace less than half full, a candidate collides with
+probability < 0.5, so ``MAX_ATTEMPTS`` retries practically never run out.
+
+Bulk allocation draws one candidate per user, checks the whole batch with
+a single indexed ``IN`` lookup, draws again for the users whose candidate
+was taken and writes the batch with one flush. If a concurrent writer took
+a code in between, the index rejects the flush; the transaction is rolled
+back and the whole batch retried. No savepoints: pysqlite runs a
+``SAVEPOINT`` outside a transaction as its own transaction, so releasing
+it would commit.
+
+The helpers only flush; the caller commits (or rolls back, e.g. for a dry
+run). Call them at the start of a transaction, a collision rolls it back.
+"""
+
+from typing import Iterable
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.login_code import generate_login_code, keyspace_size
+from app.models.user import User
+
+MAX_ATTEMPTS = 20
+
+
+def assign_login_code(db: Session, user: User, max_attempts: int = MAX_ATTEMPTS) -> str | None:
+    """Give a user a new unique code. Returns None if all attempts collided."""
+    assigned = assign_login_codes(db, [user], max_attempts)
+    return assigned.get(user.id)
+
+
+def assign_login_codes(db: Session, users: Iterable[User], max_attempts: int = MAX_ATTEMPTS) -> dict[int, str]:
+    """Give each user a new unique code in the current transaction.
+
+    Returns {user_id: code} for every user that got one; users missing from
+    the result collided ``max_attempts`` times.
+    """
+    users = list(users)
+    if len(users) > keyspace_size():
+        raise ValueError("More users than possible login codes")
+
+    for _ in range(max_attempts):
+        assigned = _draw_free_codes(db, users, max_attempts)
+        for user in users:
+            if user.id in assigned:
+                user.login_code = assigned[user.id]
+        try:
+            db.flush()
+        except IntegrityError:
+            # Written by someone else since the lookup
+            db.rollback()
+            continue
+        return assigned
+    return {}
+
+
+def _draw_free_codes(db: Session, users: list[User], max_attempts: int) -> dict[int, str]:
+    """One distinct candidate per user that is not in the table yet (one lookup per round)."""
+    assigned: dict[int, str] = {}
+    chosen: set[str] = set()
+    pending = users
+    for _ in range(max_attempts):
+        if not pending:
+            break
+        candidates: dict[str, User] = {}
+        while len(candidates) < len(pending):
+            code = generate_login_code()
+            if code not in chosen:
+                candidates.setdefault(code, pending[len(candidates)])
+        taken = set(db.scalars(select(User.login_code).where(User.login_code.in_(candidates))))
+        pending = []
+        for code, user in candidates.items():
+            if code in taken:
+                pending.append(user)
+            else:
+                assigned[user.id] = code
+                chosen.add(code)
+    return assigned
+
+
+def login_code_usage(db: Session) -> dict:
+    """How full the default code space is."""
+    used = db.scalar(select(func.count()).select_from(User).where(User.login_code.isnot(None))) or 0
+    keyspace = keyspace_size()
+    return {
+        "used": used,
+        "keyspace": keyspace,
+        "utilization": round(used / keyspace, 4) if keyspace else 1.0,
+    }
@@ -1,11 +1,12 @@
 import json
-from typing import List
+from typing import Iterable, List
 
 import httpx
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
 from app.models.device import DeviceToken
+from app.models.family import FamilyMember
 
 settings = get_settings()
 
@@ -21,11 +22,26 @@ def register_token(db: Session, user_id: int, token: str, platform: str | None =
     return device
 
 
-def get_parent_tokens(db: Session) -> List[str]:
-    tokens = (
+def get_parent_tokens(db: Session, exclude_user_ids: Iterable[int] = ()) -> List[str]:
+    query = (
         db.query(DeviceToken.fcm_token)
         .join(DeviceToken.user)
         .filter(DeviceToken.user.has(role="parent"))
+    )
+    exclude = list(exclude_user_ids)
+    if exclude:
+        query = query.filter(DeviceToken.user_id.not_in(exclude))
+    return [t[0] for t in query.all()]
+
+
+def get_family_parent_tokens(db: Session, family_id: int) -> List[str]:
+    tokens = (
+        db.query(DeviceToken.fcm_token)
+        .join(FamilyMember, FamilyMember.user_id == DeviceToken.user_id)
+        .filter(
+            FamilyMember.family_id == family_id,
+            FamilyMember.role_in_family.in_(["admin", "parent"]),
+        )
         .all()
     )
     return [t[0] for t in tokens]
@@ -5,6 +5,7 @@ from app.services.providers.kisi import KisiProvider
 from app.services.providers.family_link import FamilyLinkProvider
 from app.services.providers.manual import ManualProvider
 from app.services.providers.registry import ProviderRegistry
+from app.services.providers.pipeline import ProviderPipeline, provider_pipeline
 
 __all__ = [
     "RewardProvider",
@@ -12,4 +13,6 @@ __all__ = [
     "FamilyLinkProvider",
     "ManualProvider",
     "ProviderRegistry",
+    "ProviderPipeline",
+    "provider_pipeline",
 ]
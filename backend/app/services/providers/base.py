@@ -13,6 +13,12 @@ class RewardProvider(ABC):
 
     Each provider handles how rewards are tracked and distributed
     for a specific parental control system (Kisi, Family Link, etc.).
+
+    The reward methods are blocking: they use a sync ``Session`` and may
+    commit or call external systems. Async code runs them through
+    ``provider_pipeline`` (see ``pipeline.py``), which dispatches them to a
+    worker thread with a timeout and a concurrency limit per provider.
+    ``contract.py`` checks that an implementation behaves as described here.
     """
 
     # Provider identification
@@ -21,7 +27,7 @@ class RewardProvider(ABC):
     requires_tan_pool: bool  # Whether this provider needs TAN pool
 
     @abstractmethod
-    async def approve_reward(
+    def approve_reward(
         self,
         db: Session,
         family_id: int,
@@ -44,7 +50,9 @@ class RewardProvider(ABC):
             submission_id: Optional linked submission ID
             tan_code: Optional TAN code (for Kisi)
             reason: Optional reason/note
-            **kwargs: Provider-specific arguments
+            **kwargs: Provider-specific arguments; ``notifications`` is a
+                list the provider may append (tokens, payload) pushes to,
+                which the caller sends after the call
 
         Returns:
             Created TanLedger entry
@@ -52,7 +60,7 @@ class RewardProvider(ABC):
         pass
 
     @abstractmethod
-    async def get_available_rewards(
+    def get_available_rewards(
         self,
         db: Session,
         family_id: int,
@@ -75,7 +83,7 @@ class RewardProvider(ABC):
         pass
 
     @abstractmethod
-    async def get_pending_payouts(
+    def get_pending_payouts(
         self,
         db: Session,
         family_id: int,
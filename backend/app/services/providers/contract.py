@@ -0,0 +1,108 @@
+"""Behaviour every reward provider must show (see ``base.RewardProvider``).
+
+``check_provider`` runs one provider through ``provider_pipeline`` against
+a family with one child and returns the violations (empty list = passed).
+It writes ledger entries and claims TANs, so run it against a throwaway
+database: ``scripts/check_providers.py`` seeds one and checks every
+registered provider.
+"""
+
+import inspect
+from typing import Any
+
+from app.models.ledger import TanLedger
+from app.services.providers.pipeline import PROVIDER_METHODS, provider_pipeline
+from app.services.providers.registry import ProviderRegistry
+
+CONTRACT_MINUTES = 25
+PAYOUT_KEYS = {"child_id", "target_device", "total_minutes", "entry_count"}
+UI_CONFIG_KEYS = {"show_tan_selector", "show_minutes_input", "show_device_selector"}
+
+
+def _pending_for(rows: list[dict[str, Any]], child_id: int, target_device: str) -> tuple[int, int]:
+    """(minutes, entries) of one child and device in a pending payout list."""
+    for row in rows:
+        if row.get("child_id") == child_id and row.get("target_device") == target_device:
+            return row.get("total_minutes", 0), row.get("entry_count", 0)
+    return 0, 0
+
+
+async def check_provider(provider_code: str, family_id: int, child_id: int, target_device: str = "pc") -> list[str]:
+    """Contract violations of one provider."""
+    failures: list[str] = []
+
+    def expect(condition: bool, message: str) -> None:
+        if not condition:
+            failures.append(message)
+
+    provider = ProviderRegistry.get(provider_code)
+
+    # Interface
+    expect(provider.code == provider_code, f"code is {provider.code!r}, registered as {provider_code!r}")
+    expect(bool(getattr(provider, "name", None)), "name missing")
+    for method in PROVIDER_METHODS:
+        expect(
+            not inspect.iscoroutinefunction(getattr(provider, method)),
+            f"{method} must be blocking (def), the pipeline runs it in a worker thread",
+        )
+    expect(UI_CONFIG_KEYS <= provider.get_approval_ui_config().keys(), "approval UI config lacks the base keys")
+    expect(provider.validate_settings({}) is True, "validate_settings({}) must accept empty settings")
+
+    # Available rewards
+    available = await provider_pipeline.get_available_rewards(
+        provider_code, family_id=family_id, target_device=target_device
+    )
+    expect(
+        isinstance(available, list) and all(isinstance(reward, dict) for reward in available),
+        "get_available_rewards must return a list of dicts",
+    )
+    expect(
+        all(reward.get("target_device") == target_device for reward in available),
+        "get_available_rewards ignores the device filter",
+    )
+
+    # Approve -> pending payout
+    before = await provider_pipeline.get_pending_payouts(
+        provider_code, family_id=family_id, child_id=child_id, target_device=target_device
+    )
+    entry = await provider_pipeline.approve_reward(
+        provider_code,
+        family_id=family_id,
+        child_id=child_id,
+        minutes=CONTRACT_MINUTES,
+        target_device=target_device,
+        reason="contract check",
+    )
+    if not isinstance(entry, TanLedger) or entry.id is None:
+        return failures + ["approve_reward must return the committed TanLedger entry"]
+    expect(entry.provider_type == provider_code, f"entry provider_type is {entry.provider_type!r}")
+    expect(
+        (entry.family_id, entry.child_id, entry.minutes, entry.target_device)
+        == (family_id, child_id, CONTRACT_MINUTES, target_device),
+        "entry does not match the approved reward",
+    )
+    expect(entry.paid_out is False, "approved rewards must start unpaid")
+    if provider.requires_tan_pool and available:
+        expect(
+            entry.tan_code in {reward.get("tan_code") for reward in available},
+            "no TAN from the pool was assigned",
+        )
+
+    after = await provider_pipeline.get_pending_payouts(
+        provider_code, family_id=family_id, child_id=child_id, target_device=target_device
+    )
+    expect(
+        all(PAYOUT_KEYS <= row.keys() for row in after),
+        f"pending payouts need the keys {sorted(PAYOUT_KEYS)}",
+    )
+    minutes_before, count_before = _pending_for(before, child_id, target_device)
+    minutes_after, count_after = _pending_for(after, child_id, target_device)
+    expect(
+        (minutes_after - minutes_before, count_after - count_before) == (CONTRACT_MINUTES, 1),
+        "pending payouts do not include the approved reward",
+    )
+
+    # Tenant isolation
+    other = await provider_pipeline.get_pending_payouts(provider_code, family_id=family_id + 1_000_000)
+    expect(other == [], "pending payouts leak entries of other families")
+    return failures
@@ -1,14 +1,15 @@
 """Kisi (Salfeld) provider - TAN-based rewards."""
 
-from datetime import datetime
 from typing import Any
 
-from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.models.ledger import TanLedger
 from app.models.tan_pool import TanPool
 from app.services.providers.base import RewardProvider
+from app.services.notifications import get_family_parent_tokens
+from app.services.tan_pool import allocate_tan, low_stock_alert
+from app.services.ledger_balances import balance_rows
 
 
 class KisiProvider(RewardProvider):
@@ -22,7 +23,7 @@ class KisiProvider(RewardProvider):
     name = "Salfeld Kisi"
     requires_tan_pool = True
 
-    async def approve_reward(
+    def approve_reward(
         self,
         db: Session,
         family_id: int,
@@ -39,24 +40,13 @@ class KisiProvider(RewardProvider):
         If tan_code is provided, uses that specific TAN.
         Otherwise, automatically assigns the next available TAN.
         """
-        # If no TAN code provided, get next available from pool
+        # If no TAN code provided, atomically claim the next available one
+        allocated = False
         if not tan_code:
-            next_tan = (
-                db.query(TanPool)
-                .filter(
-                    TanPool.family_id == family_id,
-                    TanPool.used == False,
-                    TanPool.target_device == target_device,
-                )
-                .order_by(TanPool.created_at)
-                .first()
-            )
+            next_tan = allocate_tan(db, family_id, target_device, child_id=child_id)
             if next_tan:
                 tan_code = next_tan.tan_code
-                # Mark TAN as used
-                next_tan.used = True
-                next_tan.used_at = datetime.utcnow()
-                next_tan.used_by_child_id = child_id
+                allocated = True
 
         # Create ledger entry
         ledger_entry = TanLedger(
@@ -74,9 +64,16 @@ class KisiProvider(RewardProvider):
         db.commit()
         db.refresh(ledger_entry)
 
+        # The reward is committed; the caller sends the push outside the call
+        notifications = kwargs.get("notifications")
+        if allocated and notifications is not None:
+            alert = low_stock_alert(db, family_id, target_device, 1)
+            if alert:
+                notifications.append((get_family_parent_tokens(db, family_id), alert))
+
         return ledger_entry
 
-    async def get_available_rewards(
+    def get_available_rewards(
         self,
         db: Session,
         family_id: int,
@@ -104,7 +101,7 @@ class KisiProvider(RewardProvider):
             for tan in tans
         ]
 
-    async def get_pending_payouts(
+    def get_pending_payouts(
         self,
         db: Session,
         family_id: int,
@@ -112,35 +109,10 @@ class KisiProvider(RewardProvider):
         target_device: str | None = None,
     ) -> list[dict[str, Any]]:
         """Get unpaid TAN rewards grouped by child and device."""
-        query = db.query(
-            TanLedger.child_id,
-            TanLedger.target_device,
-            func.sum(TanLedger.minutes).label("total_minutes"),
-            func.count(TanLedger.id).label("entry_count"),
-        ).filter(
-            TanLedger.family_id == family_id,
-            TanLedger.provider_type == self.code,
-            TanLedger.paid_out == False,
+        rows = balance_rows(
+            db, [family_id], child_id=child_id or None, target_device=target_device or None, provider_type=self.code
         )
-
-        if child_id:
-            query = query.filter(TanLedger.child_id == child_id)
-        if target_device:
-            query = query.filter(TanLedger.target_device == target_device)
-
-        query = query.group_by(TanLedger.child_id, TanLedger.target_device)
-
-        results = query.all()
-
-        return [
-            {
-                "child_id": r.child_id,
-                "target_device": r.target_device,
-                "total_minutes": r.total_minutes,
-                "entry_count": r.entry_count,
-            }
-            for r in results
-        ]
+        return rows
 
     def get_approval_ui_config(self) -> dict[str, Any]:
         """Kisi needs TAN selector in approval UI."""
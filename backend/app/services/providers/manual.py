@@ -2,11 +2,11 @@
 
 from typing import Any
 
-from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.models.ledger import TanLedger
 from app.services.providers.base import RewardProvider
+from app.services.ledger_balances import balance_rows
 
 
 class ManualProvider(RewardProvider):
@@ -20,7 +20,7 @@ class ManualProvider(RewardProvider):
     name = "Manuell"
     requires_tan_pool = False
 
-    async def approve_reward(
+    def approve_reward(
         self,
         db: Session,
         family_id: int,
@@ -50,7 +50,7 @@ class ManualProvider(RewardProvider):
 
         return ledger_entry
 
-    async def get_available_rewards(
+    def get_available_rewards(
         self,
         db: Session,
         family_id: int,
@@ -59,7 +59,7 @@ class ManualProvider(RewardProvider):
         """No pre-defined rewards for manual tracking."""
         return []
 
-    async def get_pending_payouts(
+    def get_pending_payouts(
         self,
         db: Session,
         family_id: int,
@@ -67,35 +67,10 @@ class ManualProvider(RewardProvider):
         target_device: str | None = None,
     ) -> list[dict[str, Any]]:
         """Get unpaid time rewards grouped by child and device."""
-        query = db.query(
-            TanLedger.child_id,
-            TanLedger.target_device,
-            func.sum(TanLedger.minutes).label("total_minutes"),
-            func.count(TanLedger.id).label("entry_count"),
-        ).filter(
-            TanLedger.family_id == family_id,
-            TanLedger.provider_type == self.code,
-            TanLedger.paid_out == False,
+        rows = balance_rows(
+            db, [family_id], child_id=child_id or None, target_device=target_device or None, provider_type=self.code
         )
-
-        if child_id:
-            query = query.filter(TanLedger.child_id == child_id)
-        if target_device:
-            query = query.filter(TanLedger.target_device == target_device)
-
-        query = query.group_by(TanLedger.child_id, TanLedger.target_device)
-
-        results = query.all()
-
-        return [
-            {
-                "child_id": r.child_id,
-                "target_device": r.target_device,
-                "total_minutes": r.total_minutes,
-                "entry_count": r.entry_count,
-            }
-            for r in results
-        ]
+        return rows
 
     def get_approval_ui_config(self) -> dict[str, Any]:
         """Simple approval UI for manual tracking."""
@@ -0,0 +1,148 @@
+"""Non-blocking dispatch of reward provider calls.
+
+Provider methods are blocking (sync ``Session``, commits, external
+systems). ``ProviderPipeline.run`` executes one in a worker thread so the
+event loop stays free:
+
+- every provider has its own thread pool with ``PROVIDER_CONCURRENCY``
+  workers, so a slow provider only delays its own calls
+- at most ``PROVIDER_QUEUE_LIMIT`` calls per provider may be running or
+  waiting; beyond that the caller gets a 503 instead of queueing forever
+- a read that takes longer than ``PROVIDER_TIMEOUT_SECONDS`` returns 504;
+  it still counts as in flight until its thread is done, so a hanging
+  provider runs into the queue limit instead of piling up threads
+- a write (``approve_reward``) only times out while it still waits for a
+  worker and nothing was written; once started it is awaited to the end,
+  so a booked reward is never reported as failed (and booked again on retry)
+
+Each call opens its own session in the worker thread. A timed-out call
+keeps running to completion in the background (threads cannot be
+cancelled), so it must not share the caller's session. Returned ORM
+objects are detached but loaded.
+
+Pushes a provider queues during ``approve_reward`` are sent after the call
+returned, so a slow push service cannot turn a committed reward into a 504
+(and a retry into a second booking).
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from fastapi import BackgroundTasks, HTTPException, status
+
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.services.notifications import send_push
+from app.services.providers.registry import ProviderRegistry
+
+settings = get_settings()
+
+PROVIDER_METHODS = ("approve_reward", "get_available_rewards", "get_pending_payouts")
+WRITE_METHODS = frozenset({"approve_reward"})
+
+
+class ProviderPipeline:
+    """Per-provider bounded thread pools with in-flight counters and a timeout."""
+
+    def __init__(self, concurrency: int, queue_limit: int, timeout_seconds: float):
+        self.concurrency = max(concurrency, 1)
+        self.queue_limit = queue_limit
+        self.timeout_seconds = timeout_seconds
+        self.in_flight: dict[str, int] = {}
+        self.timeouts: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._executors: dict[str, ThreadPoolExecutor] = {}
+
+    def _get_executor(self, provider_code: str) -> ThreadPoolExecutor:
+        with self._lock:
+            executor = self._executors.get(provider_code)
+            if executor is None:
+                executor = ThreadPoolExecutor(
+                    max_workers=self.concurrency, thread_name_prefix=f"provider-{provider_code}"
+                )
+                self._executors[provider_code] = executor
+            return executor
+
+    async def run(self, provider_code: str, method: str, **kwargs: Any) -> Any:
+        """Call ``method`` of a provider with a fresh session (``db``) in a worker thread."""
+        if method not in PROVIDER_METHODS:
+            raise ValueError(f"Unknown provider method: {method}")
+        provider = ProviderRegistry.get(provider_code)
+
+        with self._lock:
+            if self.in_flight.get(provider_code, 0) >= self.queue_limit:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Anbieter ausgelastet, bitte gleich erneut versuchen",
+                    headers={"Retry-After": "1"},
+                )
+            self.in_flight[provider_code] = self.in_flight.get(provider_code, 0) + 1
+
+        def call() -> Any:
+            db = SessionLocal()
+            try:
+                return getattr(provider, method)(db, **kwargs)
+            finally:
+                db.close()
+
+        def release(_future) -> None:
+            # Counts until the thread is done, also after the caller timed out
+            with self._lock:
+                self.in_flight[provider_code] -= 1
+
+        try:
+            future = self._get_executor(provider_code).submit(call)
+        except RuntimeError:
+            release(None)
+            raise
+        future.add_done_callback(release)
+        result = asyncio.wrap_future(future)
+        done, _ = await asyncio.wait({result}, timeout=self.timeout_seconds)
+        if done:
+            return result.result()
+
+        with self._lock:
+            self.timeouts[provider_code] = self.timeouts.get(provider_code, 0) + 1
+        # cancel() only succeeds for a call still waiting for a worker
+        if future.cancel() or method not in WRITE_METHODS:
+            result.cancel()
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail=f"Anbieter {provider.name} antwortet nicht",
+            )
+        # A started write may already have committed: wait for its outcome
+        return await result
+
+    async def approve_reward(
+        self, provider_code: str, background_tasks: BackgroundTasks | None = None, **kwargs: Any
+    ) -> Any:
+        """Book a reward; queued pushes go to ``background_tasks`` or are sent before returning."""
+        notifications: list[tuple[list[str], dict]] = []
+        entry = await self.run(provider_code, "approve_reward", notifications=notifications, **kwargs)
+        for tokens, payload in notifications:
+            if background_tasks is not None:
+                background_tasks.add_task(send_push, tokens, payload)
+            else:
+                await send_push(tokens, payload)
+        return entry
+
+    async def get_available_rewards(self, provider_code: str, **kwargs: Any) -> list[dict[str, Any]]:
+        return await self.run(provider_code, "get_available_rewards", **kwargs)
+
+    async def get_pending_payouts(self, provider_code: str, **kwargs: Any) -> list[dict[str, Any]]:
+        return await self.run(provider_code, "get_pending_payouts", **kwargs)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executors, self._executors = self._executors, {}
+        for executor in executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+provider_pipeline = ProviderPipeline(
+    settings.provider_concurrency,
+    settings.provider_queue_limit,
+    settings.provider_timeout_seconds,
+)
@@ -1,15 +1,21 @@
 """Provider registry for managing reward provider instances."""
 
-from typing import Type
+import threading
+import time
+from typing import Iterable, Type
 
 from sqlalchemy.orm import Session
 
+from app.core.config import get_settings
+
 from app.models.device_provider import DeviceProvider, RewardProvider as RewardProviderModel
 from app.services.providers.base import RewardProvider
 from app.services.providers.kisi import KisiProvider
 from app.services.providers.family_link import FamilyLinkProvider
 from app.services.providers.manual import ManualProvider
 
+settings = get_settings()
+
 
 class ProviderRegistry:
     """Registry for reward provider implementations.
@@ -26,6 +32,15 @@ class ProviderRegistry:
 
     _instances: dict[str, RewardProvider] = {}
 
+    # In-process cache of the family -> device -> provider mapping and the
+    # provider catalog. Entries carry the cache version they were loaded
+    # under; invalidate() bumps the version. The TTL bounds staleness across
+    # worker processes, which don't see each other's invalidations.
+    _cache_lock = threading.Lock()
+    _cache_version: int = 0
+    _device_cache: dict[int, tuple[int, float, dict[str, str]]] = {}
+    _catalog_cache: tuple[int, float, list[dict]] | None = None
+
     @classmethod
     def get(cls, provider_code: str) -> RewardProvider:
         """Get a provider instance by code.
@@ -68,20 +83,50 @@ class ProviderRegistry:
         Raises:
             ValueError: If no provider configured for this device
         """
-        config = (
-            db.query(DeviceProvider)
-            .filter(
-                DeviceProvider.family_id == family_id,
-                DeviceProvider.device_type == device_type,
-            )
-            .first()
-        )
+        return cls.resolve_many(db, family_id, [device_type])[device_type]
+
+    @classmethod
+    def resolve_many(
+        cls,
+        db: Session,
+        family_id: int,
+        device_types: Iterable[str],
+    ) -> dict[str, RewardProvider]:
+        """Get the configured providers for several devices of a family.
+
+        Costs at most one query per family until the cache is invalidated.
+
+        Args:
+            db: Database session
+            family_id: Family ID
+            device_types: Device types (phone, pc, tablet, console)
+
+        Returns:
+            Dict of device type -> provider instance
+        """
+        mapping = cls._get_device_mapping(db, family_id)
+        # Default to manual if not configured
+        return {device: cls.get(mapping.get(device, "manual")) for device in device_types}
 
-        if not config:
-            # Default to manual if not configured
-            return cls.get("manual")
+    @classmethod
+    def _get_device_mapping(cls, db: Session, family_id: int) -> dict[str, str]:
+        """Load (or reuse) the device -> provider code mapping of a family."""
+        version = cls._cache_version
+        cached = cls._device_cache.get(family_id)
+        if cached and cached[0] == version and cached[1] > time.monotonic():
+            return cached[2]
+
+        rows = (
+            db.query(DeviceProvider.device_type, DeviceProvider.provider_type)
+            .filter(DeviceProvider.family_id == family_id)
+            .all()
+        )
+        mapping = {row.device_type: row.provider_type for row in rows}
 
-        return cls.get(config.provider_type)
+        with cls._cache_lock:
+            if cls._cache_version == version:
+                cls._device_cache[family_id] = (version, cls._expires_at(), mapping)
+        return mapping
 
     @classmethod
     def list_available(cls, db: Session) -> list[dict]:
@@ -93,6 +138,11 @@ class ProviderRegistry:
         Returns:
             List of provider info dicts
         """
+        version = cls._cache_version
+        cached = cls._catalog_cache
+        if cached and cached[0] == version and cached[1] > time.monotonic():
+            return cached[2]
+
         providers = (
             db.query(RewardProviderModel)
             .filter(RewardProviderModel.is_active == True)
@@ -100,7 +150,7 @@ class ProviderRegistry:
             .all()
         )
 
-        return [
+        catalog = [
             {
                 "code": p.code,
                 "name": p.name,
@@ -110,6 +160,26 @@ class ProviderRegistry:
             for p in providers
         ]
 
+        with cls._cache_lock:
+            if cls._cache_version == version:
+                cls._catalog_cache = (version, cls._expires_at(), catalog)
+        return catalog
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Drop all cached provider configuration.
+
+        Call after writing device_providers or reward_providers.
+        """
+        with cls._cache_lock:
+            cls._cache_version += 1
+            cls._device_cache = {}
+            cls._catalog_cache = None
+
+    @staticmethod
+    def _expires_at() -> float:
+        return time.monotonic() + settings.provider_cache_ttl_seconds
+
     @classmethod
     def register(cls, provider_class: Type[RewardProvider]) -> None:
         """Register a new provider class.
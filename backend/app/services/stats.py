@@ -0,0 +1,266 @@
+"""Materialized statistics: daily per-family rollups and the admin snapshot.
+
+``family_daily_stats`` holds one row per (day, family) with submission,
+minute and TAN counters; ``stats_snapshot`` holds the admin dashboard
+totals in a single row.
+
+- The rollups are kept current incrementally: a ``before_flush`` hook
+  (``track_stats``) adds the deltas of new submissions, status changes and
+  new ledger entries; ``adjust_counters`` reports used TANs via
+  ``record_tan_pool``. Writers only touch their own family's row.
+- The snapshot belongs to the ``stats-refresh`` job (every
+  ``STATS_REFRESH_MINUTES``), which recomputes it and the last days from
+  the raw tables; that also fixes rollup drift from writes that bypass the
+  hooks (deletes, imports without family, Core updates). Writers never
+  update the snapshot, since that single row would serialize all of them.
+
+Days are UTC dates. Rows without family use ``family_id = 0``.
+"""
+
+from datetime import date, datetime, timedelta
+from itertools import chain
+
+from sqlalchemy import Integer, case, delete, func, inspect, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.archive import ArchiveRollup
+from app.models.family import Family
+from app.models.ledger import TanLedger
+from app.models.stats import FamilyDailyStats, StatsSnapshot
+from app.models.submission import Submission
+from app.models.tan_pool import TanPool
+from app.models.task import Task
+from app.models.user import User
+from app.services.archive import archive_cutoff, history
+
+SNAPSHOT_ID = 1
+DAILY_COUNTERS = (
+    "submissions_created",
+    "submissions_approved",
+    "submissions_rejected",
+    "minutes_earned",
+    "tans_used",
+    "active_children",
+)
+
+
+def _today() -> date:
+    return datetime.utcnow().date()
+
+
+def bump_daily(db: Session, family_id: int | None, day: date, **deltas: int) -> None:
+    """Add deltas to the rollup row of a family/day (created on first use)."""
+    deltas = {name: value for name, value in deltas.items() if value}
+    if not deltas:
+        return
+    key = {"day": day, "family_id": family_id or 0}
+    conn = db.connection()
+    dialect = conn.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+        columns = FamilyDailyStats.__table__.c
+        stmt = insert(FamilyDailyStats.__table__).values(**key, **deltas)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[columns.day, columns.family_id],
+            set_={name: columns[name] + value for name, value in deltas.items()},
+        )
+        conn.execute(stmt)
+        return
+
+    table = FamilyDailyStats.__table__
+    updated = conn.execute(
+        table.update()
+        .where(table.c.day == key["day"], table.c.family_id == key["family_id"])
+        .values({name: table.c[name] + value for name, value in deltas.items()})
+    ).rowcount
+    if not updated:
+        conn.execute(table.insert().values(**key, **deltas))
+
+
+def _change(obj, attr: str) -> tuple:
+    history = inspect(obj).attrs[attr].history
+    if not history.has_changes():
+        return None, None
+    old = history.deleted[0] if history.deleted else None
+    new = history.added[0] if history.added else None
+    return old, new
+
+
+def track_stats(session: Session, flush_context, instances) -> None:
+    """``before_flush`` hook: add submission and ledger deltas to the daily rollups."""
+    today = _today()
+    for obj in chain(session.new, session.dirty):
+        if isinstance(obj, Submission):
+            if obj in session.new:
+                old, new = None, obj.status or "pending"
+            else:
+                old, new = _change(obj, "status")
+                if old == new:
+                    continue
+            bump_daily(
+                session,
+                obj.family_id,
+                today,
+                submissions_created=int(old is None),
+                submissions_approved=int(new == "approved"),
+                submissions_rejected=int(new == "rejected"),
+            )
+        elif isinstance(obj, TanLedger) and obj in session.new:
+            bump_daily(session, obj.family_id, today, minutes_earned=obj.minutes)
+
+
+def record_tan_pool(db: Session, family_id: int | None, used: int = 0) -> None:
+    """Count used TANs in the family's daily rollup (called by ``adjust_counters``)."""
+    if used > 0:
+        bump_daily(db, family_id, _today(), tans_used=used)
+
+
+def _day(value) -> date:
+    # func.date() gives a string on SQLite and a date on PostgreSQL
+    return value if isinstance(value, date) else date.fromisoformat(str(value))
+
+
+def rebuild_daily_stats(db: Session, days: int = 2) -> int:
+    """Recompute the rollups of the last ``days`` days from the raw tables.
+
+    Returns the number of rows written; the caller commits. Windows that
+    reach past the archive horizon read the archive tables too.
+    """
+    first_day = _today() - timedelta(days=days - 1)
+    since = datetime.combine(first_day, datetime.min.time())
+    include_archived = since < archive_cutoff()
+    submissions = history(Submission, include_archived)
+    ledger = history(TanLedger, include_archived)
+    rows: dict[tuple[date, int], dict[str, int]] = {}
+
+    def add(day, family_id, **values):
+        row = rows.setdefault((_day(day), family_id or 0), dict.fromkeys(DAILY_COUNTERS, 0))
+        for name, value in values.items():
+            row[name] += value or 0
+
+    created_day = func.date(submissions.created_at)
+    for day, family_id, created, children in db.execute(
+        select(created_day, submissions.family_id, func.count(), func.count(submissions.child_id.distinct()))
+        .where(submissions.created_at >= since)
+        .group_by(created_day, submissions.family_id)
+    ):
+        add(day, family_id, submissions_created=created, active_children=children)
+
+    # Decisions count on the day of the last update
+    decided_day = func.date(submissions.updated_at)
+    for day, family_id, approved, rejected in db.execute(
+        select(
+            decided_day,
+            submissions.family_id,
+            func.sum(case((submissions.status == "approved", 1), else_=0)),
+            func.sum(case((submissions.status == "rejected", 1), else_=0)),
+        )
+        .where(submissions.updated_at >= since, submissions.status.in_(("approved", "rejected")))
+        .group_by(decided_day, submissions.family_id)
+    ):
+        add(day, family_id, submissions_approved=approved, submissions_rejected=rejected)
+
+    ledger_day = func.date(ledger.created_at)
+    for day, family_id, minutes in db.execute(
+        select(ledger_day, ledger.family_id, func.sum(ledger.minutes))
+        .where(ledger.created_at >= since)
+        .group_by(ledger_day, ledger.family_id)
+    ):
+        add(day, family_id, minutes_earned=minutes)
+
+    used_day = func.date(TanPool.used_at)
+    for day, family_id, used in db.execute(
+        select(used_day, TanPool.family_id, func.count())
+        .where(TanPool.used == True, TanPool.used_at >= since)
+        .group_by(used_day, TanPool.family_id)
+    ):
+        add(day, family_id, tans_used=used)
+
+    db.execute(delete(FamilyDailyStats).where(FamilyDailyStats.day >= first_day))
+    if rows:
+        db.execute(
+            FamilyDailyStats.__table__.insert(),
+            [{"day": day, "family_id": family_id, **values} for (day, family_id), values in rows.items()],
+        )
+    return len(rows)
+
+
+def _count_if(condition):
+    return func.sum(case((condition, 1), else_=0)).cast(Integer)
+
+
+def refresh_snapshot(db: Session) -> StatsSnapshot:
+    """Recompute the dashboard totals, one aggregate query per table (archived rows via the rollups)."""
+    users = db.execute(select(
+        func.count(),
+        _count_if(User.role == "parent"),
+        _count_if(User.role == "child"),
+        _count_if((User.email_verified == False) & User.email.isnot(None)),
+    )).one()
+    families_total = db.scalar(select(func.count()).where(Family.is_active == True))
+    tasks = db.execute(select(func.count(), _count_if(Task.is_active == True))).one()
+    submissions = db.execute(select(
+        func.count(),
+        _count_if(Submission.status == "pending"),
+        _count_if(Submission.status == "approved"),
+    ).select_from(Submission)).one()
+    pool = db.execute(select(_count_if(TanPool.used == False), _count_if(TanPool.used == True))).one()
+    minutes = db.scalar(select(func.sum(TanLedger.minutes)))
+    archived = db.execute(select(
+        func.sum(ArchiveRollup.submissions),
+        func.sum(ArchiveRollup.submissions_approved),
+        func.sum(ArchiveRollup.ledger_minutes),
+    )).one()
+
+    values = {
+        "users_total": users[0],
+        "users_parents": users[1] or 0,
+        "users_children": users[2] or 0,
+        "users_pending_verification": users[3] or 0,
+        "families_total": families_total or 0,
+        "tasks_total": tasks[0],
+        "tasks_active": tasks[1] or 0,
+        "submissions_total": submissions[0] + (archived[0] or 0),
+        "submissions_pending": submissions[1] or 0,
+        "submissions_approved": (submissions[2] or 0) + (archived[1] or 0),
+        "tan_pool_available": pool[0] or 0,
+        "tan_pool_used": pool[1] or 0,
+        "minutes_earned_total": (minutes or 0) + (archived[2] or 0),
+        "refreshed_at": datetime.utcnow(),
+    }
+    snapshot = db.get(StatsSnapshot, SNAPSHOT_ID)
+    if snapshot is None:
+        snapshot = StatsSnapshot(id=SNAPSHOT_ID)
+        db.add(snapshot)
+    for name, value in values.items():
+        setattr(snapshot, name, value)
+    db.flush()
+    return snapshot
+
+
+def get_snapshot(db: Session) -> StatsSnapshot:
+    """The current snapshot, computed on first use."""
+    snapshot = db.get(StatsSnapshot, SNAPSHOT_ID)
+    if snapshot is None:
+        snapshot = refresh_snapshot(db)
+        db.commit()
+    return snapshot
+
+
+def daily_trend(db: Session, days: int, family_id: int | None = None) -> list[dict]:
+    """Counters per day for the last ``days`` days, all families summed unless filtered."""
+    first_day = _today() - timedelta(days=days - 1)
+    stmt = (
+        select(FamilyDailyStats.day, *(func.sum(getattr(FamilyDailyStats, name)) for name in DAILY_COUNTERS))
+        .where(FamilyDailyStats.day >= first_day)
+        .group_by(FamilyDailyStats.day)
+        .order_by(FamilyDailyStats.day)
+    )
+    if family_id is not None:
+        stmt = stmt.where(FamilyDailyStats.family_id == family_id)
+    return [
+        {"day": row[0], **{name: value or 0 for name, value in zip(DAILY_COUNTERS, row[1:])}}
+        for row in db.execute(stmt)
+    ]
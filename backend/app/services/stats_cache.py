@@ -0,0 +1,51 @@
+"""Cached results of the parent dashboard statistics (``/stats/*``).
+
+Entries are keyed by endpoint, parameters, the families in scope, their
+``change_version`` (bumped on task, submission, ledger and membership
+writes, see ``change_tracking.py``) and the current day. A write therefore
+changes the key instead of having to find and delete entries, which also
+holds across workers sharing a Redis backend. A lookup costs one query for
+the versions; a miss recomputes and stores the result.
+"""
+
+from datetime import datetime
+from typing import Any, Callable
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import create_cache
+from app.core.config import get_settings
+from app.services.change_tracking import get_family_versions
+
+settings = get_settings()
+
+stats_cache = create_cache(
+    settings.stats_cache_size,
+    settings.stats_cache_ttl_seconds,
+    settings.stats_cache_url,
+)
+
+
+def cache_key(endpoint: str, params: dict[str, Any], versions: dict[int, int]) -> str:
+    """``stats:<endpoint>:<params>:<family@version,...>:<day>``."""
+    param_part = ",".join(f"{name}={value}" for name, value in sorted(params.items()))
+    version_part = ",".join(f"{family_id}@{version}" for family_id, version in sorted(versions.items()))
+    return f"stats:{endpoint}:{param_part}:{version_part}:{datetime.utcnow().date().isoformat()}"
+
+
+def cached_stats(
+    db: Session,
+    endpoint: str,
+    family_ids: list[int],
+    params: dict[str, Any],
+    compute: Callable[[], dict],
+) -> dict:
+    """Cached result of ``compute()`` for the current data version of ``family_ids``."""
+    # Versions are read before computing: a concurrent write can only make
+    # the stored result newer than its key, never older
+    key = cache_key(endpoint, params, get_family_versions(db, family_ids))
+    result = stats_cache.get(key)
+    if result is None:
+        result = compute()
+        stats_cache.set(key, result)
+    return result
@@ -0,0 +1,55 @@
+"""Submission read helpers shared by the parent and admin views."""
+
+from typing import List
+
+from sqlalchemy import Select
+from sqlalchemy.orm import Session
+
+from app.models.submission import Submission
+from app.models.task import Task
+from app.models.user import User
+from app.schemas.submission import SubmissionReadExtended
+
+
+def with_task_and_child(stmt: Select) -> Select:
+    """Add task and child columns to a ``select(Submission)`` statement.
+
+    Rows then come back as (Submission, task_title, task_description,
+    tan_reward, target_devices, child_name) in one query instead of two
+    ``db.get`` calls per submission.
+    """
+    return (
+        stmt.add_columns(
+            Task.title.label("task_title"),
+            Task.description.label("task_description"),
+            Task.tan_reward.label("tan_reward"),
+            Task.target_devices.label("target_devices"),
+            User.name.label("child_name"),
+        )
+        .outerjoin(Task, Task.id == Submission.task_id)
+        .outerjoin(User, User.id == Submission.child_id)
+    )
+
+
+def list_extended(db: Session, stmt: Select) -> List[SubmissionReadExtended]:
+    """Run a ``select(Submission)`` and project task/child info into the result."""
+    result = []
+    for row in db.execute(with_task_and_child(stmt)).all():
+        sub = row.Submission
+        result.append(SubmissionReadExtended(
+            id=sub.id,
+            task_id=sub.task_id,
+            child_id=sub.child_id,
+            status=sub.status,
+            selected_device=sub.selected_device,
+            comment=sub.comment,
+            photo_path=sub.photo_path,
+            created_at=sub.created_at,
+            updated_at=sub.updated_at,
+            task_title=row.task_title,
+            task_description=row.task_description,
+            child_name=row.child_name,
+            tan_reward=row.tan_reward,
+            target_devices=row.target_devices,
+        ))
+    return result
@@ -0,0 +1,205 @@
+"""Atomic TAN allocation from the pool.
+
+Handing out a TAN must never give the same code to two children, even when
+two parents approve at the same moment. Instead of selecting a free row and
+flipping ``used`` afterwards, allocation claims rows in a single step:
+
+- PostgreSQL: ``SELECT ... FOR UPDATE SKIP LOCKED`` so concurrent callers
+  skip rows another transaction is already claiming.
+- SQLite (and others): a conditional ``UPDATE ... WHERE used = false
+  RETURNING``; SQLite serializes writers, so the condition is re-checked
+  under the write lock.
+
+The helpers only flush; the caller commits together with its own changes
+(e.g. the ledger entry), so a failed request never burns a TAN.
+
+Every write to the pool also adjusts ``tan_pool_counters`` (and the stats
+rollups) in the same transaction, so availability per device is a point
+read.
+"""
+
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.tan_pool import TanPool, TanPoolCounter
+from app.services.stats import record_tan_pool
+
+settings = get_settings()
+
+# Refresh already-loaded instances from the RETURNING row
+_RETURNING_OPTIONS = {"synchronize_session": False, "populate_existing": True}
+
+
+def _supports_skip_locked(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def adjust_counters(
+    db: Session,
+    family_id: int | None,
+    target_device: str,
+    available: int = 0,
+    used: int = 0,
+) -> int | None:
+    """Apply deltas to the counter row of a family/device.
+
+    Returns the new available count (None for TANs without family).
+    """
+    record_tan_pool(db, family_id, used=used)
+    if family_id is None or (available == 0 and used == 0):
+        return None
+
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+        stmt = insert(TanPoolCounter).values(
+            family_id=family_id,
+            target_device=target_device,
+            available=available,
+            used=used,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TanPoolCounter.family_id, TanPoolCounter.target_device],
+            set_={
+                "available": TanPoolCounter.available + available,
+                "used": TanPoolCounter.used + used,
+            },
+        )
+        return db.execute(stmt.returning(TanPoolCounter.available)).scalar_one()
+
+    counter = db.get(TanPoolCounter, (family_id, target_device), with_for_update=True)
+    if not counter:
+        counter = TanPoolCounter(family_id=family_id, target_device=target_device, available=0, used=0)
+        db.add(counter)
+    counter.available += available
+    counter.used += used
+    db.flush()
+    return counter.available
+
+
+def get_counters(db: Session, family_id: int) -> list[TanPoolCounter]:
+    """Read the counter rows of a family."""
+    return db.execute(
+        select(TanPoolCounter)
+        .where(TanPoolCounter.family_id == family_id)
+        .order_by(TanPoolCounter.target_device)
+    ).scalars().all()
+
+
+def low_stock_alert(
+    db: Session,
+    family_id: int | None,
+    target_device: str,
+    taken: int,
+) -> dict[str, Any] | None:
+    """Return a push payload if taking ``taken`` TANs crossed the low watermark.
+
+    Call after the allocation; the payload is meant for ``send_push``.
+    """
+    threshold = settings.tan_low_stock_threshold
+    if family_id is None or taken < 1 or threshold < 0:
+        return None
+    counter = db.get(TanPoolCounter, (family_id, target_device))
+    available = counter.available if counter else 0
+    if not available <= threshold < available + taken:
+        return None
+    return {
+        "type": "tan_pool_low",
+        "family_id": family_id,
+        "target_device": target_device,
+        "available": available,
+    }
+
+
+def allocate_tans(
+    db: Session,
+    family_id: int,
+    target_device: str,
+    child_id: int | None = None,
+    count: int = 1,
+) -> list[TanPool]:
+    """Claim up to ``count`` of the oldest unused TANs for a device.
+
+    Returns the claimed entries (oldest first). The list is shorter than
+    ``count`` if the pool does not hold enough TANs.
+    """
+    if count < 1:
+        return []
+
+    now = datetime.utcnow()
+    available = (
+        select(TanPool)
+        .where(
+            TanPool.family_id == family_id,
+            TanPool.target_device == target_device,
+            TanPool.used.is_(False),
+        )
+        .order_by(TanPool.created_at, TanPool.id)
+        .limit(count)
+    )
+
+    if _supports_skip_locked(db):
+        entries = db.execute(available.with_for_update(skip_locked=True)).scalars().all()
+        for entry in entries:
+            entry.used = True
+            entry.used_at = now
+            entry.used_by_child_id = child_id
+        db.flush()
+        adjust_counters(db, family_id, target_device, available=-len(entries), used=len(entries))
+        return list(entries)
+
+    entries = db.execute(
+        update(TanPool)
+        .where(
+            TanPool.id.in_(available.with_only_columns(TanPool.id).scalar_subquery()),
+            TanPool.used.is_(False),
+        )
+        .values(used=True, used_at=now, used_by_child_id=child_id)
+        .returning(TanPool),
+        execution_options=_RETURNING_OPTIONS,
+    ).scalars().all()
+    adjust_counters(db, family_id, target_device, available=-len(entries), used=len(entries))
+    return sorted(entries, key=lambda e: (e.created_at, e.id))
+
+
+def allocate_tan(
+    db: Session,
+    family_id: int,
+    target_device: str,
+    child_id: int | None = None,
+) -> TanPool | None:
+    """Claim the oldest unused TAN for a device, or None if the pool is empty."""
+    entries = allocate_tans(db, family_id, target_device, child_id=child_id, count=1)
+    return entries[0] if entries else None
+
+
+def claim_tan(db: Session, tan_id: int, child_id: int | None = None) -> TanPool | None:
+    """Mark a specific TAN as used if it is still unused.
+
+    Returns the updated entry, or None if it was already used (or missing).
+    """
+    entry = db.execute(
+        update(TanPool)
+        .where(TanPool.id == tan_id, TanPool.used.is_(False))
+        .values(used=True, used_at=datetime.utcnow(), used_by_child_id=child_id)
+        .returning(TanPool),
+        execution_options=_RETURNING_OPTIONS,
+    ).scalar_one_or_none()
+    if entry:
+        adjust_counters(db, entry.family_id, entry.target_device, available=-1, used=1)
+    return entry
+
+
+def delete_tan(db: Session, entry: TanPool) -> None:
+    """Remove a TAN from the pool and its counter."""
+    if entry.used:
+        adjust_counters(db, entry.family_id, entry.target_device, used=-1)
+    else:
+        adjust_counters(db, entry.family_id, entry.target_device, available=-1)
+    db.delete(entry)
@@ -0,0 +1,89 @@
+"""Task schedule helpers.
+
+``Task.recurrence`` (dict or list of weekday keys) and
+``Task.assigned_children`` (list of user ids) stay the API representation.
+Their derived forms, ``recurrence_mask`` and the ``task_children`` rows, are
+what queries filter on, so "due today for child X" is a single indexed query.
+"""
+
+from datetime import date
+from typing import Iterable
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.family import FamilyMember
+from app.models.task import Task, TaskChild
+from app.models.user import User
+
+WEEKDAY_KEYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+ALL_DAYS_MASK = (1 << len(WEEKDAY_KEYS)) - 1
+
+
+def recurrence_mask(recurrence: dict | list | None) -> int:
+    """Convert a recurrence (``{"mon": true}`` or ``["mon"]``) to a weekday bitmask.
+
+    No recurrence means the task is due every day.
+    """
+    if not recurrence:
+        return ALL_DAYS_MASK
+    if isinstance(recurrence, dict):
+        days = [key for key, value in recurrence.items() if value]
+    elif isinstance(recurrence, list):
+        days = recurrence
+    else:
+        return ALL_DAYS_MASK
+    mask = 0
+    for i, key in enumerate(WEEKDAY_KEYS):
+        if key in days:
+            mask |= 1 << i
+    return mask
+
+
+def weekday_bit(day: date) -> int:
+    """Bit of the given date's weekday in ``recurrence_mask``."""
+    return 1 << day.weekday()
+
+
+def family_child_ids(db: Session, family_id: int | None) -> set[int]:
+    """Ids of the children a task of this family can be assigned to."""
+    if family_id is None:
+        # Legacy tasks without family
+        return set(db.execute(select(User.id).where(User.role == "child")).scalars())
+    return set(db.execute(
+        select(FamilyMember.user_id).where(
+            FamilyMember.family_id == family_id,
+            FamilyMember.role_in_family == "child",
+        )
+    ).scalars())
+
+
+def check_assigned_children(db: Session, task: Task, previous: Iterable[int] = ()) -> None:
+    """Restrict ``task.assigned_children`` to children of the task's family.
+
+    Ids that were already assigned (``previous``) but are gone, e.g. deleted
+    by ``clean_inactive_users``, are dropped; new ids of other users are
+    rejected with 400 instead of failing on the ``task_children`` foreign key.
+    """
+    if not task.assigned_children:
+        return
+    valid = family_child_ids(db, task.family_id)
+    foreign = sorted(set(task.assigned_children) - valid - set(previous))
+    if foreign:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Kinder gehoeren nicht zu dieser Familie: {', '.join(map(str, foreign))}",
+        )
+    task.assigned_children = list(dict.fromkeys(child_id for child_id in task.assigned_children if child_id in valid))
+
+
+def apply_schedule(task: Task) -> None:
+    """Refresh the derived schedule columns after recurrence/assignment changes."""
+    task.recurrence_mask = recurrence_mask(task.recurrence)
+
+    assigned = set(task.assigned_children or [])
+    task.child_links = [link for link in task.child_links if link.child_id in assigned]
+    linked = {link.child_id for link in task.child_links}
+    for child_id in sorted(assigned - linked):
+        task.child_links.append(TaskChild(child_id=child_id))
@@ -0,0 +1,52 @@
+"""
+Micro-benchmark of the token part of auth overhead per request.
+
+Decodes the same access token repeatedly (like a polling client) and
+reports microseconds per call for each JWT backend, with and without the
+verified-token cache.
+
+Usage:
+  .venv/bin/python backend/scripts/bench_auth.py
+  .venv/bin/python backend/scripts/bench_auth.py --iterations 50000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core import security
+from app.core.security import JWT_BACKENDS, TokenCache, create_access_token, decode_token
+
+
+def bench(iterations: int, token: str) -> float:
+    decode_token(token)  # warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        decode_token(token)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark JWT verification per request")
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'backend':<8} {'cache':<6} {'us/request':>10}")
+    for name, backend_cls in JWT_BACKENDS.items():
+        try:
+            security.jwt_backend = backend_cls()
+        except ImportError:
+            print(f"{name:<8} {'-':<6} {'not installed':>10}")
+            continue
+        token = create_access_token({"sub": 1, "role": "child", "family_id": 1})
+        for cache_size in (0, 1024):
+            security.token_cache = TokenCache(cache_size)
+            print(f"{name:<8} {'on' if cache_size else 'off':<6} {bench(args.iterations, token):>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""
+Benchmark of response serialization and bytes on the wire.
+
+Seeds a throwaway SQLite database with one family, then for
+``/stats/overview``, ``/admin/users`` and ``/submissions/history`` reports:
+
+- serialization time of the payload per serializer (``jsonable_encoder`` +
+  ``json.dumps`` as FastAPI does for untyped routes, Pydantic ``dump_json``
+  as it does for response models, and ``app.core.responses.dumps``)
+- response size and request latency for identity, gzip and brotli
+
+Usage:
+  .venv/bin/python backend/scripts/bench_responses.py
+  .venv/bin/python backend/scripts/bench_responses.py --children 20 --submissions 200
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Throwaway database, must be set before the app is imported
+_tmp = tempfile.mkdtemp(prefix="zeitschatz-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/bench.db"
+os.environ["STORAGE_DIR"] = f"{_tmp}/photos"
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+from app.api.routes.admin import UserAdminRead
+from app.core.compression import brotli
+from app.core.responses import dumps, orjson
+from app.core.security import create_access_token
+from app.db.session import SessionLocal, engine
+from app.models import Base, Family, FamilyMember, Submission, TanLedger, Task, User
+from app.schemas.submission import SubmissionRead
+
+ENDPOINTS = {
+    "/stats/overview": None,
+    "/admin/users?limit=200": list[UserAdminRead],
+    "/submissions/history?limit=200": list[SubmissionRead],
+}
+ENCODINGS = ["identity", "gzip"] + (["br"] if brotli is not None else [])
+
+
+def seed(children: int, submissions: int) -> int:
+    """One family with a parent, ``children`` children and their submissions. Returns the parent id."""
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    family = Family(name="Benchmark", invite_code="BENCH1")
+    parent = User(name="Bench Parent", role="parent", pin_hash="", email="bench@example.com", email_verified=True)
+    db.add_all([family, parent])
+    db.flush()
+    db.add(FamilyMember(family_id=family.id, user_id=parent.id, role_in_family="admin"))
+    tasks = [
+        Task(title=f"Aufgabe {i}", description="Zimmer aufraeumen und Spielsachen wegraeumen",
+             tan_reward=15, family_id=family.id, target_devices=["phone", "pc"])
+        for i in range(10)
+    ]
+    db.add_all(tasks)
+    db.flush()
+
+    now = datetime.utcnow()
+    for c in range(children):
+        child = User(name=f"Kind {c}", role="child", pin_hash="", login_code=f"BENCH-KIND-{c:02d}")
+        db.add(child)
+        db.flush()
+        db.add(FamilyMember(family_id=family.id, user_id=child.id, role_in_family="child"))
+        for s in range(submissions):
+            created = now - timedelta(hours=s * 7)
+            task = tasks[s % len(tasks)]
+            submission = Submission(
+                task_id=task.id, child_id=child.id, family_id=family.id, status="approved",
+                selected_device="phone", comment="Erledigt!", created_at=created, updated_at=created,
+            )
+            db.add(submission)
+            db.flush()
+            db.add(TanLedger(
+                child_id=child.id, family_id=family.id, submission_id=submission.id,
+                minutes=task.tan_reward, target_device="phone", reason=task.title, created_at=created,
+            ))
+    db.commit()
+    parent_id = parent.id
+    db.close()
+    return parent_id
+
+
+def timed(func, repeat: int) -> float:
+    """Median milliseconds per call."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark JSON serialization and compression")
+    parser.add_argument("--children", type=int, default=10)
+    parser.add_argument("--submissions", type=int, default=100, help="Submissions per child")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    parent_id = seed(args.children, args.submissions)
+    # The app is imported after seeding so its startup sees the populated DB
+    from app.main import app
+
+    headers = {"Authorization": "Bearer " + create_access_token({"sub": parent_id, "role": "parent"})}
+    client = TestClient(app)
+
+    print(f"JSON backend: {'orjson' if orjson is not None else 'stdlib'}, brotli: {'yes' if brotli else 'no'}\n")
+    print(f"{'endpoint':<32} {'serializer':<22} {'ms':>8}")
+    for endpoint, model in ENDPOINTS.items():
+        payload = client.get(endpoint, headers={**headers, "accept-encoding": "identity"}).json()
+        serializers = {
+            "jsonable+json.dumps": lambda payload=payload: json.dumps(jsonable_encoder(payload)).encode(),
+            "responses.dumps": lambda payload=payload: dumps(payload),
+        }
+        if model is not None:
+            adapter = TypeAdapter(model)
+            objects = adapter.validate_python(payload)
+            serializers["pydantic dump_json"] = lambda adapter=adapter, objects=objects: adapter.dump_json(objects)
+        for name, func in serializers.items():
+            print(f"{endpoint:<32} {name:<22} {timed(func, args.repeat):>8.3f}")
+
+    print(f"\n{'endpoint':<32} {'encoding':<10} {'bytes':>9} {'ratio':>7} {'ms':>8}")
+    for endpoint in ENDPOINTS:
+        identity_size = None
+        for encoding in ENCODINGS:
+            request_headers = {**headers, "accept-encoding": encoding}
+            response = client.get(endpoint, headers=request_headers)
+            size = int(response.headers.get("content-length") or len(response.content))
+            identity_size = identity_size or size
+            ms = timed(
+                lambda endpoint=endpoint, request_headers=request_headers: client.get(endpoint, headers=request_headers),
+                args.repeat,
+            )
+            print(f"{endpoint:<32} {encoding:<10} {size:>9} {identity_size / size:>6.1f}x {ms:>8.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""Build the admin dashboard assets (hashed names, gzip/brotli copies).
+
+Usage:
+    python scripts/build_admin_assets.py
+    python scripts/build_admin_assets.py --dest /tmp/admin-assets
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.static_assets import BUILD_DIR, SOURCE_DIR, brotli, build_assets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build admin dashboard assets")
+    parser.add_argument("--dest", type=Path, default=BUILD_DIR, help=f"Output directory (default: {BUILD_DIR})")
+    args = parser.parse_args()
+
+    manifest = build_assets(SOURCE_DIR, args.dest)
+    for name, url in manifest.items():
+        print(f"  {name} -> {url}")
+    print(f"\nWrote {len(manifest) + 1} files to {args.dest} (gzip{', brotli' if brotli else ''})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Compare ledger_balances with the raw TAN ledger and report drift.
+
+Usage:
+    python scripts/check_ledger_balances.py
+    python scripts/check_ledger_balances.py --fix
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import get_settings
+from app.services.ledger_balances import check_ledger_balances
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check ledger balances against the ledger")
+    parser.add_argument("--fix", action="store_true", help="Rewrite drifted balances")
+    args = parser.parse_args()
+
+    settings = get_settings()
+    engine = create_engine(settings.database_url)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+
+    try:
+        drift = check_ledger_balances(db, fix=args.fix)
+        for entry in drift:
+            print(
+                f"  family {entry['family_id']} child {entry['child_id']} "
+                f"device '{entry['target_device']}' provider '{entry['provider_type']}': "
+                f"stored {entry['stored']}, expected {entry['expected']}"
+            )
+        if not drift:
+            print("Balances match the ledger.")
+            return 0
+        if args.fix:
+            db.commit()
+            print(f"\nRepaired {len(drift)} balances.")
+            return 0
+        print(f"\n{len(drift)} balances drifted, run with --fix to repair.")
+        return 1
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
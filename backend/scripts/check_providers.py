@@ -0,0 +1,106 @@
+"""
+Contract check of all reward providers.
+
+Seeds a throwaway SQLite database with one family, a parent, a child and a
+few TANs, then runs every registered provider through
+``app.services.providers.contract.check_provider`` via the async pipeline.
+Also checks that the event loop stays responsive while providers run.
+Exits with 1 if any provider violates the contract.
+
+Usage:
+  .venv/bin/python backend/scripts/check_providers.py
+  .venv/bin/python backend/scripts/check_providers.py --provider kisi
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Throwaway database, must be set before the app is imported
+_tmp = tempfile.mkdtemp(prefix="zeitschatz-providers-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/providers.db"
+os.environ["STORAGE_DIR"] = f"{_tmp}/photos"
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.db.session import SessionLocal, engine
+from app.models import Base, Family, FamilyMember, TanPool, User
+from app.services.providers import ProviderRegistry
+from app.services.providers.contract import check_provider
+
+DEVICE = "pc"
+
+
+def seed() -> tuple[int, int]:
+    """One family with a parent, a child and three TANs. Returns (family id, child id)."""
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    family = Family(name="Contract", invite_code="CONTRACT1")
+    parent = User(name="Contract Parent", role="parent", pin_hash="", email="contract@example.com", email_verified=True)
+    child = User(name="Contract Kind", role="child", pin_hash="", login_code="CONTRACT-KIND-01")
+    db.add_all([family, parent, child])
+    db.flush()
+    db.add_all([
+        FamilyMember(family_id=family.id, user_id=parent.id, role_in_family="admin"),
+        FamilyMember(family_id=family.id, user_id=child.id, role_in_family="child"),
+    ])
+    db.add_all([
+        TanPool(tan_code=f"90000{i}", minutes=30, target_device=DEVICE, family_id=family.id)
+        for i in range(3)
+    ])
+    db.commit()
+    ids = family.id, child.id
+    db.close()
+    return ids
+
+
+async def max_loop_lag(work) -> tuple[list, float]:
+    """Run ``work`` while measuring the longest event loop stall (seconds)."""
+    lag = 0.0
+    done = asyncio.Event()
+
+    async def ticker():
+        nonlocal lag
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.005)
+            lag = max(lag, time.perf_counter() - start - 0.005)
+
+    ticking = asyncio.create_task(ticker())
+    try:
+        result = await work
+    finally:
+        done.set()
+        await ticking
+    return result, lag
+
+
+async def run(codes: list[str]) -> int:
+    family_id, child_id = seed()
+    checks = asyncio.gather(*(check_provider(code, family_id, child_id, DEVICE) for code in codes))
+    results, lag = await max_loop_lag(checks)
+
+    failed = 0
+    for code, failures in zip(codes, results):
+        print(f"{code:<12} {'ok' if not failures else 'FAILED'}")
+        for failure in failures:
+            print(f"  - {failure}")
+        failed += bool(failures)
+    print(f"\nlongest event loop stall: {lag * 1000:.1f} ms")
+    return 1 if failed else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check all reward providers against the provider contract")
+    parser.add_argument("--provider", action="append", choices=ProviderRegistry.get_all_codes(),
+                        help="Only check this provider (repeatable)")
+    args = parser.parse_args()
+    return asyncio.run(run(args.provider or ProviderRegistry.get_all_codes()))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,12 @@
 #!/usr/bin/env python3
-"""Generate login codes for all children who don't have one yet."""
+"""Generate login codes for all children who don't have one yet.
 
+Usage:
+    python scripts/generate_login_codes.py
+    python scripts/generate_login_codes.py --dry-run
+"""
+
+import argparse
 import sys
 from pathlib import Path
 
@@ -11,22 +17,23 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.models.user import User
-from app.core.login_code import generate_login_code
 from app.core.config import get_settings
+from app.services.login_codes import assign_login_codes, login_code_usage
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Generate missing login codes")
+    parser.add_argument("--dry-run", action="store_true", help="Roll back instead of committing")
+    args = parser.parse_args()
+
     settings = get_settings()
     engine = create_engine(settings.database_url)
     Session = sessionmaker(bind=engine)
     db = Session()
 
     try:
-        # Get all existing codes
-        existing_codes = set(
-            code for (code,) in db.query(User.login_code).filter(User.login_code.isnot(None)).all()
-        )
-        print(f"Found {len(existing_codes)} existing codes")
+        usage = login_code_usage(db)
+        print(f"Found {usage['used']} existing codes ({usage['utilization']:.1%} of {usage['keyspace']})")
 
         # Find children without login codes
         children = db.query(User).filter(
@@ -36,20 +43,20 @@ def main():
 
         print(f"Found {len(children)} children without login codes")
 
+        # One transaction for all children; --dry-run rolls it back
+        assigned = assign_login_codes(db, children)
         for child in children:
-            # Generate unique code
-            for _ in range(100):
-                code = generate_login_code()
-                if code not in existing_codes:
-                    child.login_code = code
-                    existing_codes.add(code)
-                    print(f"  {child.name}: {code}")
-                    break
-            else:
-                print(f"  {child.name}: FAILED to generate unique code!")
+            print(f"  {child.name}: {assigned.get(child.id, 'FAILED to generate unique code!')}")
+
+        if args.dry_run:
+            db.rollback()
+            print("\nDry run, nothing saved.")
+            return
 
         db.commit()
-        print(f"\nDone! Generated codes for {len(children)} children.")
+        usage = login_code_usage(db)
+        print(f"\nDone! Generated codes for {len(assigned)} children.")
+        print(f"Keyspace utilization: {usage['utilization']:.1%}")
 
     finally:
         db.close()
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""Recompute the daily stats rollups and the admin snapshot.
+
+The stats-refresh job only covers today and yesterday; use this script to
+backfill history after the migration or to repair the rollups.
+
+Usage:
+    python scripts/rebuild_stats.py              # last 2 days
+    python scripts/rebuild_stats.py --days 365
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.db.session import SessionLocal
+from app.services.stats import rebuild_daily_stats, refresh_snapshot
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild stats rollups")
+    parser.add_argument("--days", type=int, default=2, help="Number of days to recompute")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        rows = rebuild_daily_stats(db, days=args.days)
+        snapshot = refresh_snapshot(db)
+        db.commit()
+        print(f"Rebuilt {rows} daily rows for the last {args.days} days")
+        print(f"Snapshot: {snapshot.users_total} users, {snapshot.submissions_total} submissions, "
+              f"{snapshot.minutes_earned_total} minutes")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
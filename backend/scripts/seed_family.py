@@ -38,6 +38,7 @@ from app.models.user import User
 from app.models.family import Family, FamilyMember
 from app.models.device_provider import DeviceProvider, RewardProvider
 from app.models.task import Task
+from app.services.tasks import apply_schedule
 
 
 def generate_invite_code() -> str:
@@ -227,6 +228,7 @@ def seed_family(
                     family_id=family.id,
                     is_active=True,
                 )
+                apply_schedule(task)
                 db.add(task)
                 print(f"  - {task_data['title']} ({task_data['tan_reward']} Min)")
 
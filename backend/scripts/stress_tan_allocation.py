@@ -0,0 +1,102 @@
+"""
+Concurrency stress check for TAN allocation.
+
+Seeds a pool of TANs and lets many threads allocate from it at the same
+time. Fails if any TAN is handed out twice or if TANs are lost.
+
+Usage:
+  # Throwaway SQLite database
+  .venv/bin/python backend/scripts/stress_tan_allocation.py
+
+  # Against Postgres (uses a separate family, cleans up afterwards)
+  .venv/bin/python backend/scripts/stress_tan_allocation.py --database-url postgresql://...
+"""
+import argparse
+import sys
+import tempfile
+import threading
+from collections import Counter
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, Family, TanPool
+from app.services.tan_pool import allocate_tans
+
+
+def run(database_url: str, tans: int, threads: int, batch: int) -> int:
+    connect_args = {"check_same_thread": False, "timeout": 30} if database_url.startswith("sqlite") else {}
+    engine = create_engine(database_url, connect_args=connect_args, pool_size=threads, max_overflow=0)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+
+    db = Session()
+    family = Family(name="stress-test")
+    db.add(family)
+    db.flush()
+    family_id = family.id
+    db.add_all(
+        TanPool(tan_code=f"S{family_id}-{i:06d}", minutes=15, target_device="pc", family_id=family_id)
+        for i in range(tans)
+    )
+    db.commit()
+    db.close()
+
+    issued: list[str] = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(threads)
+
+    def worker(worker_id: int) -> None:
+        session = Session()
+        barrier.wait()
+        try:
+            while True:
+                entries = allocate_tans(session, family_id, "pc", child_id=worker_id, count=batch)
+                codes = [e.tan_code for e in entries]
+                session.commit()
+                with lock:
+                    issued.extend(codes)
+                if not entries:
+                    break
+        finally:
+            session.close()
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+    duplicates = [code for code, n in Counter(issued).items() if n > 1]
+
+    db = Session()
+    db.query(TanPool).filter(TanPool.family_id == family_id).delete()
+    db.query(Family).filter(Family.id == family_id).delete()
+    db.commit()
+    db.close()
+
+    print(f"Issued {len(issued)} of {tans} TANs across {threads} threads (batch={batch})")
+    if duplicates:
+        print(f"FAILED: {len(duplicates)} TANs issued more than once, e.g. {duplicates[:5]}")
+        return 1
+    if len(issued) != tans:
+        print(f"FAILED: expected {tans} TANs to be issued")
+        return 1
+    print("OK: no TAN issued twice")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stress-test concurrent TAN allocation")
+    parser.add_argument("--database-url", help="Database URL (default: temporary SQLite file)")
+    parser.add_argument("--tans", type=int, default=2000, help="Number of TANs to seed")
+    parser.add_argument("--threads", type=int, default=16, help="Number of concurrent workers")
+    parser.add_argument("--batch", type=int, default=3, help="TANs per allocation call")
+    args = parser.parse_args()
+
+    url = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/stress.db"
+    sys.exit(run(url, args.tans, args.threads, args.batch))
@@ -210,9 +210,24 @@ class ApiClient {
     return res.data as List<dynamic>;
   }
 
+  /// Loads all pages of a cursor-paginated list by following X-Next-Cursor.
+  Future<List<dynamic>> _fetchAllPages(String path, [Map<String, dynamic>? params]) async {
+    final items = <dynamic>[];
+    String? cursor;
+    do {
+      final res = await _dio.get(path, queryParameters: {
+        ...?params,
+        'limit': 200,
+        if (cursor != null) 'cursor': cursor,
+      });
+      items.addAll(res.data as List<dynamic>);
+      cursor = res.headers.value('x-next-cursor');
+    } while (cursor != null && cursor.isNotEmpty);
+    return items;
+  }
+
   Future<List<dynamic>> fetchSubmissionHistory({int? childId}) async {
-    final res = await _dio.get('/submissions/history', queryParameters: childId != null ? {'child_id': childId} : null);
-    return res.data as List<dynamic>;
+    return _fetchAllPages('/submissions/history', childId != null ? {'child_id': childId} : null);
   }
 
   Future<List<dynamic>> fetchCompletedSubmissions({int? childId, int limit = 50}) async {
@@ -259,8 +274,7 @@ class ApiClient {
   }
 
   Future<List<dynamic>> fetchLedgerEntries(int childId) async {
-    final res = await _dio.get('/ledger/$childId');
-    return res.data as List<dynamic>;
+    return _fetchAllPages('/ledger/$childId');
   }
 
   Future<Map<String, dynamic>> createPayout(Map<String, dynamic> payload) async {
@@ -273,6 +287,43 @@ class ApiClient {
     return res.data as Map<String, dynamic>;
   }
 
+  /// Marks all unpaid entries of a child (optionally one device) up to [until] as paid.
+  /// Retries with the same [idempotencyKey] return the first result.
+  Future<Map<String, dynamic>> markLedgerPaidBulk({
+    required int familyId,
+    required int childId,
+    String? targetDevice,
+    DateTime? until,
+    String? idempotencyKey,
+  }) async {
+    final res = await _dio.post(
+      '/ledger/mark-paid',
+      queryParameters: {'family_id': familyId},
+      data: {
+        'child_id': childId,
+        if (targetDevice != null) 'target_device': targetDevice,
+        if (until != null) 'until': until.toIso8601String(),
+      },
+      options: Options(headers: {if (idempotencyKey != null) 'Idempotency-Key': idempotencyKey}),
+    );
+    return res.data as Map<String, dynamic>;
+  }
+
+  /// Books several payouts in one transaction.
+  Future<Map<String, dynamic>> createPayouts(
+    int familyId,
+    List<Map<String, dynamic>> payouts, {
+    String? idempotencyKey,
+  }) async {
+    final res = await _dio.post(
+      '/ledger/payout/bulk',
+      queryParameters: {'family_id': familyId},
+      data: {'payouts': payouts},
+      options: Options(headers: {if (idempotencyKey != null) 'Idempotency-Key': idempotencyKey}),
+    );
+    return res.data as Map<String, dynamic>;
+  }
+
   Future<List<dynamic>> fetchUsers() async {
     final res = await _dio.get('/users');
     return res.data as List<dynamic>;